@@ -4,9 +4,9 @@ Combines gabagool22 and PBot1 strategies
 """
 
 import pandas as pd
-import pickle
 import requests
 from datetime import datetime
+from model_registry import open_predictor
 
 print("="*70)
 print("ADVANCED HYBRID STRATEGY")
@@ -20,14 +20,14 @@ class HybridStrategy:
     2. Directional: Strong bets when model is >65% confident
     """
     
-    def __init__(self):
-        # Load your 2-min model
-        with open('models/2min_model.pkl', 'rb') as f:
-            model_data = pickle.load(f)
-        
-        self.model = model_data['model']
-        self.scaler = model_data['scaler']
-        self.feature_cols = model_data['feature_columns']
+    def __init__(self, model_version='latest'):
+        # Load your 2-min model from the registry ('latest' or a pinned version)
+        self.predictor, self.model_name = open_predictor(model_version)
+        self.feature_cols = self.predictor.feature_columns
+    
+    def predict(self, data):
+        """Model prediction dict from the current window's first candles"""
+        return self.predictor.predict(data)
     
     def check_market_making_opportunity(self, market_odds):
         """
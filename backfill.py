@@ -0,0 +1,151 @@
+"""
+HISTORICAL BACKFILL
+====================
+Fetch months of 1-minute klines into the candle store.
+
+The date range is split into 1000-candle startTime/endTime pages that
+are fetched concurrently by a bounded worker pool sharing one rate
+limiter. Finished pages are recorded in a checkpoint file, so an
+interrupted run picks up where it stopped.
+
+Usage:
+    python3 backfill.py --start 2026-01-01 --end 2026-02-01
+    python3 backfill.py --start 2026-01-01 --workers 8 --base-url http://127.0.0.1:8000
+"""
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+from binance import (BINANCE_URL, INTERVAL_MS, MAX_KLINES, RateLimiter,
+                     fetch_klines, klines_to_frame)
+from candle_store import CandleStore, STORE_DIR
+from transport import client
+
+
+def make_pages(start_ms, end_ms, interval='1m'):
+    """Split [start_ms, end_ms) into (startTime, endTime) pages of up to 1000 klines"""
+    step = INTERVAL_MS[interval] * MAX_KLINES
+    start_ms -= start_ms % INTERVAL_MS[interval]
+    return [(t, min(t + step, end_ms) - 1) for t in range(start_ms, end_ms, step)]
+
+
+class Checkpoint:
+    """Finished pages (startTime -> endTime), saved atomically as JSON"""
+
+    def __init__(self, path):
+        self.path = path
+        self.done = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.done = {int(k): v for k, v in json.load(f)['done'].items()}
+
+    def covers(self, page):
+        return self.done.get(page[0], -1) >= page[1]
+
+    def mark(self, page):
+        self.done[page[0]] = page[1]
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump({'done': self.done}, f)
+        os.replace(tmp, self.path)
+
+
+class Backfill:
+    """Concurrent paginated kline download into a CandleStore"""
+
+    def __init__(self, symbol='BTCUSDT', interval='1m', workers=4, base_url=BINANCE_URL,
+                 limiter=None, store=None, http=None):
+        self.symbol = symbol
+        self.interval = interval
+        self.workers = workers
+        self.base_url = base_url
+        self.limiter = limiter or RateLimiter()
+        self.store = store or CandleStore(symbol, interval)
+        # Workers share the keep-alive pool (and its timeout / TLS policy)
+        self.http = http or client
+
+    def fetch_page(self, page):
+        start_ms, end_ms = page
+        data = fetch_klines(
+            self.symbol, self.interval, MAX_KLINES, start_ms, end_ms,
+            base_url=self.base_url, session=self.http, limiter=self.limiter
+        )
+        return klines_to_frame(data, closed_before_ms=time.time() * 1000)
+
+    def fetch_pages(self, pages):
+        """Fetch pages concurrently, yielding (page, frame) as each finishes"""
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self.fetch_page, page): page for page in pages}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    def checkpoint_path(self, start_ms):
+        # Pages are aligned to start_ms, so a rerun with a later end reuses it
+        return os.path.join(self.store.path, f".backfill_{start_ms}.json")
+
+    def run(self, start_ms, end_ms, verbose=True):
+        """Fetch [start_ms, end_ms) and return the number of new candles stored"""
+        os.makedirs(self.store.path, exist_ok=True)
+        checkpoint = Checkpoint(self.checkpoint_path(start_ms))
+        pages = [p for p in make_pages(start_ms, end_ms, self.interval)
+                 if not checkpoint.covers(p)]
+
+        if verbose:
+            print(f"{len(pages)} pages to fetch ({len(checkpoint.done)} already done)")
+
+        added = 0
+        finished = 0
+        started = time.time()
+
+        # Fetches run in the pool, store writes stay on this thread
+        for page, frame in self.fetch_pages(pages):
+            added += self.store.write(frame)
+            checkpoint.mark(page)
+            finished += 1
+
+            if verbose and (finished % 10 == 0 or finished == len(pages)):
+                rate = finished / max(time.time() - started, 1e-9)
+                print(f"  {finished}/{len(pages)} pages | {added} new candles | {rate:.1f} pages/s")
+
+        return added
+
+
+def to_ms(value):
+    return int(pd.Timestamp(value).value // 10**6)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill klines into the candle store")
+    parser.add_argument('--start', required=True, help="UTC start date, e.g. 2026-01-01")
+    parser.add_argument('--end', default=None, help="UTC end date (default: now)")
+    parser.add_argument('--symbol', default='BTCUSDT')
+    parser.add_argument('--interval', default='1m')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--weight-per-minute', type=int, default=1200)
+    parser.add_argument('--base-url', default=BINANCE_URL)
+    parser.add_argument('--store-dir', default=STORE_DIR)
+    args = parser.parse_args()
+
+    start_ms = to_ms(args.start)
+    end_ms = to_ms(args.end) if args.end else int(time.time() * 1000)
+
+    print("="*60)
+    print(f"BACKFILL {args.symbol} {args.interval}")
+    print("="*60)
+    print(f"Range: {pd.Timestamp(start_ms, unit='ms')} to {pd.Timestamp(end_ms, unit='ms')}")
+    print(f"Workers: {args.workers} | Budget: {args.weight_per_minute} weight/min\n")
+
+    backfill = Backfill(
+        args.symbol, args.interval, args.workers, args.base_url,
+        limiter=RateLimiter(args.weight_per_minute),
+        store=CandleStore(args.symbol, args.interval, args.store_dir)
+    )
+    added = backfill.run(start_ms, end_ms)
+
+    print(f"\n✅ Stored {added} new candles in {backfill.store.path}")
+    print("Next: python3 train_model.py")
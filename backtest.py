@@ -1,107 +1,51 @@
+import argparse
+import os
 import pandas as pd
 import pickle
-
-print("="*60)
-print("BACKTEST - TESTING PROFITABILITY")
-print("="*60)
+from backtest_engine import confidence_of, heatmap_table, parameter_sweep, run_backtest
+from features import parse_entry_points
+from feature_cache import load_feature_tensor, entry_table
 
 BANKROLL = 20.0
 POSITION_SIZE = 0.10
 MIN_CONFIDENCE = 0.60
 
-print(f"Bankroll: ${BANKROLL}")
-print(f"Position: {POSITION_SIZE*100:.0f}% per trade")
-print(f"Min confidence: {MIN_CONFIDENCE*100:.0f}%\n")
 
-# Load model
-with open('models/model.pkl', 'rb') as f:
-    model_data = pickle.load(f)
+def load_model(entry_point=None):
+    path = 'models/model.pkl' if entry_point is None else f'models/model_ep{entry_point}.pkl'
+    with open(path, 'rb') as f:
+        model_data = pickle.load(f)
+    model_data.setdefault('entry_point', 2)
+    return model_data
 
-model = model_data['model']
-scaler = model_data['scaler']
-feature_cols = model_data['feature_columns']
 
-# Load data
-df_1min = pd.read_csv('data/btc_1min.csv')
-df_1min['window'] = (df_1min.index // 5)
+def test_predictions(model_data, df_test):
+    """(predictions, confidence, outcomes) on the last 20% of windows"""
+    model = model_data['model']
+    scaler = model_data['scaler']
+    feature_cols = model_data['feature_columns']
 
-# Recreate test set
-windows = []
-for window_id in df_1min['window'].unique():
-    window_data = df_1min[df_1min['window'] == window_id].copy()
-    
-    if len(window_data) < 5:
-        continue
-    
-    data_before = window_data.iloc[:2]
-    
-    features = {
-        'start_price': data_before.iloc[0]['open'],
-        'current_price': data_before.iloc[-1]['close'],
-        'high': data_before['high'].max(),
-        'low': data_before['low'].min(),
-        'volume': data_before['volume'].sum(),
-        'price_change': (data_before.iloc[-1]['close'] - data_before.iloc[0]['open']) / data_before.iloc[0]['open'],
-        'green_candles': (data_before['close'] > data_before['open']).sum(),
-        'volatility': data_before['close'].std(),
-        'volume_trend': data_before['volume'].iloc[-1] / data_before['volume'].iloc[0] if data_before['volume'].iloc[0] > 0 else 1,
-        'return_min1': data_before.iloc[0]['close'] / data_before.iloc[0]['open'] - 1,
-        'return_min2': data_before.iloc[1]['close'] / data_before.iloc[1]['open'] - 1,
-    }
-    
-    final_price = window_data.iloc[-1]['close']
-    current_price = data_before.iloc[-1]['close']
-    features['target'] = 1 if final_price > current_price else 0
-    
-    windows.append(features)
+    # Use last 20%
+    split = int(len(df_test) * 0.8)
+    X_test = df_test[feature_cols].iloc[split:]
+    y_test = df_test['target'].iloc[split:]
 
-df_test = pd.DataFrame(windows)
+    X_test_scaled = scaler.transform(X_test)
 
-# Use last 20%
-split = int(len(df_test) * 0.8)
-X_test = df_test[feature_cols][split:]
-y_test = df_test['target'][split:]
+    # Predict
+    predictions = model.predict(X_test_scaled)
+    probabilities = model.predict_proba(X_test_scaled)
+    return predictions, confidence_of(predictions, probabilities), y_test.to_numpy()
 
-X_test_scaled = scaler.transform(X_test)
 
-# Predict
-predictions = model.predict(X_test_scaled)
-probabilities = model.predict_proba(X_test_scaled)
+def backtest(model_data, df_test):
+    result = run_backtest(*test_predictions(model_data, df_test),
+                          BANKROLL, POSITION_SIZE, MIN_CONFIDENCE)
+    trades = pd.DataFrame({k: result[k] for k in ('bet', 'profit', 'bankroll', 'win')})
+    return trades, result['final']
 
-# Backtest
-bankroll = BANKROLL
-trades = []
 
-for i in range(len(X_test)):
-    pred = predictions[i]
-    prob = probabilities[i]
-    confidence = prob[pred]
-    
-    if confidence < MIN_CONFIDENCE or bankroll < 0.5:
-        continue
-    
-    bet = bankroll * POSITION_SIZE
-    market_price = 0.50 + (confidence - 0.5) * 0.5
-    tokens = bet / market_price
-    actual = y_test.iloc[i]
-    
-    # Polymarket mechanics
-    if pred == actual:
-        profit = (tokens * 1.0) - bet  # Win
-    else:
-        profit = -bet  # Loss
-    
-    bankroll += profit
-    
-    trades.append({
-        'bet': bet,
-        'profit': profit,
-        'bankroll': bankroll,
-        'win': pred == actual
-    })
-
-if trades:
-    df_trades = pd.DataFrame(trades)
+def report(df_trades, bankroll, filename):
     wins = df_trades['win'].sum()
     total = len(df_trades)
     
@@ -114,15 +58,87 @@ if trades:
     print(f"Profit: ${bankroll - BANKROLL:+.2f}")
     print(f"Return: {(bankroll/BANKROLL - 1)*100:+.1f}%")
     
-    df_trades.to_csv('data/backtest.csv', index=False)
-    print("\n✅ Saved to data/backtest.csv")
-    
-    if bankroll > BANKROLL * 1.1:
-        print("\n✅ PROFITABLE! Consider paper trading")
-        print("Next: python3 paper_trade.py")
-    elif bankroll > BANKROLL:
-        print("\n⚠️ Slight profit - Be cautious")
+    df_trades.to_csv(filename, index=False)
+    print(f"\n✅ Saved to {filename}")
+
+
+def sweep(model_data, df_test, workers=None, suffix=''):
+    """Every threshold / sizing / pricing combination on one set of predictions"""
+    results = parameter_sweep(*test_predictions(model_data, df_test), bankroll=BANKROLL,
+                              workers=workers)
+    print("\nBEST PER PRICING MODEL (final bankroll)")
+    print(results[results['rank'] == 1].to_string(index=False, float_format=lambda x: f"{x:.2f}"))
+
+    os.makedirs('data', exist_ok=True)
+    results.to_csv(f'data/sweep{suffix}.csv', index=False)
+    heatmap_table(results).to_csv(f'data/sweep_heatmap{suffix}.csv')
+    print(f"\n✅ Saved to data/sweep{suffix}.csv and data/sweep_heatmap{suffix}.csv")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest the trained model")
+    # Entry point(s) in minutes, default: whatever models/model.pkl was trained for
+    # python3 backtest.py 1,2,3,4  uses models/model_ep{1,2,3,4}.pkl from train_model.py 1,2,3,4
+    parser.add_argument('entry_points', nargs='?', default=None)
+    parser.add_argument('--sweep', action='store_true',
+                        help="Grid over MIN_CONFIDENCE, POSITION_SIZE and market pricing")
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args(argv)
+    entry_points = parse_entry_points(args.entry_points) if args.entry_points else None
+
+    print("="*60)
+    print("BACKTEST - TESTING PROFITABILITY")
+    print("="*60)
+
+    # Recreate test set (cached per day of candles, all entry points at once)
+    tensor = load_feature_tensor()
+
+    if args.sweep:
+        for entry_point in entry_points or [None]:
+            model_data = load_model(entry_point)
+            print(f"\nEntry at minute {model_data['entry_point']}")
+            sweep(model_data, entry_table(tensor, model_data['entry_point']), args.workers,
+                  '' if entry_point is None else f'_ep{entry_point}')
+        return
+
+    print(f"Bankroll: ${BANKROLL}")
+    print(f"Position: {POSITION_SIZE*100:.0f}% per trade")
+    print(f"Min confidence: {MIN_CONFIDENCE*100:.0f}%\n")
+
+    if entry_points is None:
+        model_data = load_model()
+        print(f"Entry at minute {model_data['entry_point']}\n")
+        trades, bankroll = backtest(model_data, entry_table(tensor, model_data['entry_point']))
+
+        if len(trades):
+            report(trades, bankroll, 'data/backtest.csv')
+
+            if bankroll > BANKROLL * 1.1:
+                print("\n✅ PROFITABLE! Consider paper trading")
+                print("Next: python3 paper_trade.py")
+            elif bankroll > BANKROLL:
+                print("\n⚠️ Slight profit - Be cautious")
+            else:
+                print("\n❌ LOSING - Collect more data")
+        else:
+            print("No trades (confidence too low)")
     else:
-        print("\n❌ LOSING - Collect more data")
-else:
-    print("No trades (confidence too low)")
+        summary = []
+        for entry_point in entry_points:
+            print(f"\nENTRY AT MINUTE {entry_point}")
+            trades, bankroll = backtest(load_model(entry_point), entry_table(tensor, entry_point))
+            if len(trades):
+                report(trades, bankroll, f'data/backtest_ep{entry_point}.csv')
+            else:
+                print("No trades (confidence too low)")
+            summary.append((entry_point, len(trades), bankroll))
+
+        print("\n" + "="*60)
+        print("ENTRY POINT COMPARISON")
+        print("="*60)
+        for entry_point, n_trades, bankroll in summary:
+            print(f"Minute {entry_point}: {n_trades:4d} trades | ${bankroll:.2f} ({(bankroll/BANKROLL - 1)*100:+.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
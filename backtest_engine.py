@@ -0,0 +1,180 @@
+"""
+BACKTEST ENGINE
+================
+Vectorized compounding backtest over arrays of predictions.
+
+Same rules as the original backtest.py loop:
+- trade when confidence >= min_confidence and bankroll >= min_bankroll
+- bet = bankroll * position_size, bought at
+  market_price = price_base + (confidence - 0.5) * price_slope
+- a win pays bet / market_price, a loss loses the bet
+
+Each trade multiplies the bankroll by (1 + position_size * r), with
+r = 1 / market_price - 1 on a win and -1 on a loss, so the bankroll
+path is one cumulative product. Once it drops below min_bankroll no
+further trades are taken, which is a cut at the first such trade.
+
+Results match the loop trade for trade (same trades, same wins).
+Amounts are not bit-identical: the loop adds profits, this multiplies
+growth factors, so bet/profit/bankroll agree to float rounding (about
+1e-12 relative over a year of trades). Bit-identical amounts would
+need the sequential additive recurrence, i.e. the loop itself.
+A year of 5-minute windows (~105k) takes a few milliseconds.
+
+parameter_sweep runs it for every combination of threshold, sizing and
+pricing model on a process pool; the predictions are sent to each
+worker once.
+"""
+
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+BANKROLL = 20.0
+POSITION_SIZE = 0.10
+MIN_CONFIDENCE = 0.60
+PRICE_BASE = 0.50
+PRICE_SLOPE = 0.50
+MIN_BANKROLL = 0.5
+
+
+def confidence_of(predictions, probabilities):
+    """Probability of the predicted class per row (classes 0/1)"""
+    predictions = np.asarray(predictions)
+    return np.asarray(probabilities)[np.arange(len(predictions)), predictions]
+
+
+def run_backtest(predictions, confidence, outcomes, bankroll=BANKROLL,
+                 position_size=POSITION_SIZE, min_confidence=MIN_CONFIDENCE,
+                 price_base=PRICE_BASE, price_slope=PRICE_SLOPE, min_bankroll=MIN_BANKROLL):
+    """
+    Compounded backtest of one prediction per window.
+
+    Returns a dict of per-trade arrays (index, bet, profit, bankroll, win)
+    and the final bankroll.
+    """
+    predictions = np.asarray(predictions)
+    confidence = np.asarray(confidence, dtype=np.float64)
+    outcomes = np.asarray(outcomes)
+
+    index = np.flatnonzero(confidence >= min_confidence)
+    win = predictions[index] == outcomes[index]
+    market_price = price_base + (confidence[index] - 0.5) * price_slope
+    returns = np.where(win, 1.0 / market_price - 1.0, -1.0)
+
+    path = bankroll * np.cumprod(1.0 + position_size * returns)
+    before = np.empty_like(path)
+    if len(path):
+        before[0] = bankroll
+        before[1:] = path[:-1]
+
+    # Stop at the first trade that would start below min_bankroll
+    broke = np.flatnonzero(before < min_bankroll)
+    n = broke[0] if len(broke) else len(path)
+
+    bet = before[:n] * position_size
+    return {
+        'index': index[:n],
+        'bet': bet,
+        'profit': bet * returns[:n],
+        'bankroll': path[:n],
+        'win': win[:n],
+        'final': float(path[n - 1]) if n else float(bankroll),
+    }
+
+
+# ==========================================
+# PARAMETER SWEEP
+# ==========================================
+
+SWEEP_PARAMS = ['min_confidence', 'position_size', 'price_base', 'price_slope']
+
+
+def default_sweep_grid():
+    """(min_confidence, position_size, price_base, price_slope) combinations"""
+    return list(itertools.product(
+        np.round(np.arange(0.50, 0.801, 0.01), 2),
+        np.round(np.arange(0.01, 0.301, 0.01), 2),
+        [0.45, 0.50, 0.55],
+        [0.0, 0.25, 0.50, 0.75, 1.0],
+    ))
+
+
+def max_drawdown(path, bankroll=BANKROLL):
+    """Largest fall from a running peak, as a fraction of the peak"""
+    if not len(path):
+        return 0.0
+    peaks = np.maximum.accumulate(np.r_[bankroll, path])
+    return float(np.max(1.0 - np.r_[bankroll, path] / peaks))
+
+
+_shared = {}
+
+
+def _init_worker(predictions, confidence, outcomes, bankroll):
+    _shared.update(predictions=predictions, confidence=confidence,
+                   outcomes=outcomes, bankroll=bankroll)
+
+
+def _run_chunk(combos):
+    rows = []
+    bankroll = _shared['bankroll']
+    for min_confidence, position_size, price_base, price_slope in combos:
+        result = run_backtest(
+            _shared['predictions'], _shared['confidence'], _shared['outcomes'], bankroll,
+            position_size, min_confidence, price_base, price_slope
+        )
+        trades = len(result['index'])
+        wins = int(result['win'].sum())
+        rows.append((min_confidence, position_size, price_base, price_slope, trades, wins,
+                     wins / trades if trades else np.nan, result['final'],
+                     (result['final'] / bankroll - 1) * 100,
+                     max_drawdown(result['bankroll'], bankroll) * 100))
+    return rows
+
+
+def parameter_sweep(predictions, confidence, outcomes, grid=None, bankroll=BANKROLL,
+                    workers=None, verbose=True):
+    """
+    Backtest every grid combination in parallel. Returns a DataFrame ranked
+    by final bankroll within each pricing model (price_base, price_slope),
+    `rank` 1 being the best: the pricing model is an assumption about the
+    market, not a setting, and the cheapest one would otherwise always win
+    """
+    grid = grid or default_sweep_grid()
+    workers = workers or os.cpu_count()
+    n_chunks = min(len(grid), workers * 8)
+    chunks = [grid[i::n_chunks] for i in range(n_chunks)]
+
+    if verbose:
+        print(f"Sweep: {len(grid)} combinations x {len(outcomes)} windows on {workers} processes")
+
+    started = time.time()
+    initargs = (np.asarray(predictions), np.asarray(confidence, dtype=np.float64),
+                np.asarray(outcomes), bankroll)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=initargs) as pool:
+        rows = [row for chunk in pool.map(_run_chunk, chunks) for row in chunk]
+
+    if verbose:
+        print(f"  done in {time.time() - started:.1f}s")
+
+    results = pd.DataFrame(rows, columns=SWEEP_PARAMS + [
+        'trades', 'wins', 'win_rate', 'final', 'return_pct', 'max_drawdown_pct'
+    ])
+    results = results.sort_values(['price_base', 'price_slope', 'final', 'max_drawdown_pct'],
+                                  ascending=[True, True, False, True], kind='stable')
+    results['rank'] = results.groupby(['price_base', 'price_slope']).cumcount() + 1
+    return results
+
+
+def heatmap_table(results, value='return_pct'):
+    """min_confidence x position_size grid of `value`, one block per pricing model"""
+    return results.pivot_table(
+        index=['price_base', 'price_slope', 'min_confidence'],
+        columns='position_size', values=value
+    )
@@ -0,0 +1,126 @@
+"""
+BINANCE KLINES
+===============
+Kline fetching and parsing shared by the collectors and backfill.
+"""
+
+import threading
+import time
+import pandas as pd
+import requests
+
+from transport import client
+
+BINANCE_URL = "https://api.binance.com"
+
+KLINE_COLUMNS = [
+    'timestamp', 'open', 'high', 'low', 'close', 'volume',
+    'close_time', 'quote_volume', 'trades', 'taker_buy_base',
+    'taker_buy_quote', 'ignore'
+]
+
+MAX_KLINES = 1000
+
+INTERVAL_MS = {
+    '1m': 60_000, '3m': 180_000, '5m': 300_000, '15m': 900_000,
+    '30m': 1_800_000, '1h': 3_600_000, '4h': 14_400_000, '1d': 86_400_000,
+}
+
+
+def kline_weight(limit):
+    """Request weight Binance charges for /api/v3/klines"""
+    if limit < 100:
+        return 1
+    if limit < 500:
+        return 2
+    if limit <= 1000:
+        return 5
+    return 10
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket over Binance request weight.
+
+    Default budget is 1200 weight/minute, a fifth of the exchange limit,
+    so collectors running side by side stay well clear of a 429.
+    """
+
+    def __init__(self, weight_per_minute=1200):
+        self.rate = weight_per_minute / 60.0
+        self.capacity = float(weight_per_minute)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, weight=1):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= weight:
+                    self.tokens -= weight
+                    return
+                wait = (weight - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def fetch_klines(symbol='BTCUSDT', interval='1m', limit=MAX_KLINES, start_time=None,
+                 end_time=None, base_url=BINANCE_URL, session=None, limiter=None,
+                 timeout=10, retries=5):
+    """
+    Raw klines from /api/v3/klines. start_time/end_time are ms since epoch.
+
+    Retries on 429/418/5xx and connection errors, honoring Retry-After.
+    """
+    params = {"symbol": symbol, "interval": interval, "limit": limit}
+    if start_time is not None:
+        params["startTime"] = int(start_time)
+    if end_time is not None:
+        params["endTime"] = int(end_time)
+
+    http = session or client
+    url = f"{base_url}/api/v3/klines"
+
+    for attempt in range(retries):
+        if limiter:
+            limiter.acquire(kline_weight(limit))
+        try:
+            response = http.get(url, params=params, timeout=timeout)
+        except requests.RequestException:
+            if attempt == retries - 1:
+                raise
+            time.sleep(2 ** attempt)
+            continue
+
+        if response.status_code in (418, 429) or response.status_code >= 500:
+            if attempt == retries - 1:
+                response.raise_for_status()
+            retry_after = response.headers.get('Retry-After')
+            time.sleep(float(retry_after) if retry_after else 2 ** attempt)
+            continue
+
+        response.raise_for_status()
+        return response.json()
+
+    return []
+
+
+def klines_to_frame(data, closed_before_ms=None):
+    """
+    Parse raw klines into the candle layout the store uses.
+
+    closed_before_ms drops candles still open at that time (the last
+    kline of a "latest" request is the minute in progress).
+    """
+    df = pd.DataFrame(data, columns=KLINE_COLUMNS)
+    if closed_before_ms is not None:
+        df = df[df['close_time'] < closed_before_ms]
+
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+    for col in ['open', 'high', 'low', 'close', 'volume']:
+        df[col] = df[col].astype(float)
+    df['trades'] = df['trades'].astype('int64')
+
+    return df[['timestamp', 'open', 'high', 'low', 'close', 'volume', 'trades']]
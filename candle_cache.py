@@ -0,0 +1,124 @@
+"""
+CANDLE CACHE
+=============
+Memory-mapped columnar cache over the candle store.
+
+Every column is saved as its own .npy file:
+    data/cache/BTCUSDT-1m/timestamp.npy   (int64 ns)
+    data/cache/BTCUSDT-1m/open.npy        (float64)
+    ...
+    data/cache/BTCUSDT-1m/manifest.json   (store fingerprint)
+
+Loading memory-maps the files, so it is near-instant and zero-copy.
+slice(start, end) binary-searches the timestamp column. The cache is
+rebuilt automatically when any store partition changes.
+"""
+
+import json
+import os
+import numpy as np
+import pandas as pd
+
+from candle_store import CandleStore, COLUMNS, LEGACY_CSV
+
+CACHE_DIR = 'cache'
+
+
+class CandleCache:
+    """Columnar, memory-mapped view of one CandleStore series"""
+
+    def __init__(self, store=None, root=None):
+        self.store = store or CandleStore()
+        if root is None:
+            # Next to the store: data/candles -> data/cache
+            root = os.path.join(os.path.dirname(os.path.normpath(self.store.root)), CACHE_DIR)
+        self.path = os.path.join(root, os.path.basename(self.store.path))
+        self.manifest_path = os.path.join(self.path, 'manifest.json')
+        self.columns = None
+
+    def fingerprint(self):
+        """(day, size, mtime) of every partition - changes on any write"""
+        parts = []
+        for day in self.store.partitions():
+            st = os.stat(self.store.partition_path(day))
+            parts.append([day, st.st_size, st.st_mtime_ns])
+        return parts
+
+    def is_fresh(self):
+        if not os.path.exists(self.manifest_path):
+            return False
+        with open(self.manifest_path) as f:
+            manifest = json.load(f)
+        return manifest['fingerprint'] == self.fingerprint()
+
+    def build(self):
+        """Rewrite the column files from the store"""
+        os.makedirs(self.path, exist_ok=True)
+        fingerprint = self.fingerprint()
+        records = self.store.read()
+
+        # Manifest goes last: a crash mid-build leaves a stale manifest
+        # and the next load rebuilds
+        if os.path.exists(self.manifest_path):
+            os.remove(self.manifest_path)
+
+        for col in COLUMNS:
+            tmp = os.path.join(self.path, f"{col}.tmp.npy")
+            np.save(tmp, np.ascontiguousarray(records[col]))
+            os.replace(tmp, os.path.join(self.path, f"{col}.npy"))
+
+        tmp = f"{self.manifest_path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump({'rows': len(records), 'fingerprint': fingerprint}, f)
+        os.replace(tmp, self.manifest_path)
+
+    def load(self):
+        """Memory-map the columns, rebuilding first if the store changed"""
+        if not self.is_fresh():
+            self.build()
+        self.columns = {
+            col: np.load(os.path.join(self.path, f"{col}.npy"), mmap_mode='r')
+            for col in COLUMNS
+        }
+        return self
+
+    def __len__(self):
+        return len(self.columns['timestamp'])
+
+    def bounds(self, start=None, end=None):
+        """Row range [lo, hi) with start <= timestamp < end"""
+        ts = self.columns['timestamp']
+        lo = np.searchsorted(ts, pd.Timestamp(start).value) if start is not None else 0
+        hi = np.searchsorted(ts, pd.Timestamp(end).value) if end is not None else len(ts)
+        return lo, hi
+
+    def slice(self, start=None, end=None):
+        """Zero-copy column views for start <= timestamp < end"""
+        if self.columns is None:
+            self.load()
+        lo, hi = self.bounds(start, end)
+        return {col: values[lo:hi] for col, values in self.columns.items()}
+
+    def frame(self, start=None, end=None):
+        """DataFrame in the store layout (timestamp as datetime64)"""
+        columns = self.slice(start, end)
+        df = pd.DataFrame({col: columns[col] for col in COLUMNS[1:]})
+        df.insert(0, 'timestamp', columns['timestamp'].view('datetime64[ns]'))
+        return df
+
+
+def open_store(symbol='BTCUSDT', interval='1m'):
+    """The store for a series; on first use the legacy data/btc_1min.csv is imported"""
+    store = CandleStore(symbol, interval)
+    if not store.partitions() and symbol == 'BTCUSDT' and interval == '1m' \
+            and os.path.exists(LEGACY_CSV):
+        added = store.import_csv(LEGACY_CSV)
+        print(f"Imported {added} candles from {LEGACY_CSV} into {store.path}")
+    return store
+
+
+if __name__ == "__main__":
+    cache = CandleCache()
+    fresh = cache.is_fresh()
+    cache.load()
+    print(f"{'Cache up to date' if fresh else 'Rebuilt cache'}: {len(cache)} candles in {cache.path}")
@@ -0,0 +1,250 @@
+"""
+CANDLE STORE
+=============
+Day-partitioned, append-only candle storage.
+
+Layout:
+    data/candles/BTCUSDT-1m/2026-02-16.bin
+    data/candles/BTCUSDT-1m/2026-02-17.bin
+
+Each partition is a flat file of fixed-width little-endian records
+(CANDLE_DTYPE), sorted by timestamp. The timestamp column is the index:
+range reads use binary search and new candles are appended only if they
+are newer than the partition's last record.
+
+Crash safety:
+- appends write whole records; a torn tail left by a crash is ignored
+  on read and truncated before the next append
+- any write that has to touch existing records (filling a hole) writes
+  a temp file and swaps it in with os.replace
+
+Usage:
+    python3 candle_store.py                  # show partitions
+    python3 candle_store.py --import FILE    # import a legacy CSV
+"""
+
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+from windowing import timestamps_ns
+
+STORE_DIR = 'data/candles'
+LEGACY_CSV = 'data/btc_1min.csv'
+
+DAY_NS = 24 * 60 * 60 * 10**9
+
+CANDLE_DTYPE = np.dtype([
+    ('timestamp', '<i8'),   # open time, ns since epoch (UTC)
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<f8'),
+    ('trades', '<i8'),
+])
+
+COLUMNS = list(CANDLE_DTYPE.names)
+
+
+def to_records(df):
+    """Convert a candle DataFrame (timestamp, open, ..., trades) to sorted unique records"""
+    records = np.empty(len(df), dtype=CANDLE_DTYPE)
+    if len(records) == 0:
+        return records
+
+    records['timestamp'] = timestamps_ns(df)
+    for col in COLUMNS[1:]:
+        records[col] = df[col].to_numpy()
+
+    # Sort and keep the last copy of any repeated timestamp
+    order = np.argsort(records['timestamp'], kind='stable')
+    records = records[order]
+    keep = np.append(records['timestamp'][1:] != records['timestamp'][:-1], True)
+    return records[keep]
+
+
+def to_frame(records):
+    """Convert records back to the DataFrame layout the scripts expect"""
+    df = pd.DataFrame({col: records[col] for col in COLUMNS})
+    df['timestamp'] = records['timestamp'].astype('datetime64[ns]')
+    return df
+
+
+def _fsync_dir(path):
+    if hasattr(os, 'O_DIRECTORY'):
+        fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class CandleStore:
+    """One symbol/interval series stored as daily partitions"""
+
+    def __init__(self, symbol='BTCUSDT', interval='1m', root=STORE_DIR):
+        self.symbol = symbol
+        self.interval = interval
+        self.root = root
+        self.path = os.path.join(root, f"{symbol}-{interval}")
+
+    # ------------------------------------------
+    # Partitions
+    # ------------------------------------------
+
+    def partitions(self):
+        """Sorted list of partition days ('YYYY-MM-DD')"""
+        if not os.path.isdir(self.path):
+            return []
+        return sorted(name[:-4] for name in os.listdir(self.path) if name.endswith('.bin'))
+
+    def partition_path(self, day):
+        return os.path.join(self.path, f"{day}.bin")
+
+    @staticmethod
+    def day_of(ts_ns):
+        return str(np.datetime64(int(ts_ns) // DAY_NS, 'D'))
+
+    def read_partition(self, day):
+        """All complete records of one partition"""
+        path = self.partition_path(day)
+        if not os.path.exists(path):
+            return np.empty(0, dtype=CANDLE_DTYPE)
+        n = os.path.getsize(path) // CANDLE_DTYPE.itemsize
+        return np.fromfile(path, dtype=CANDLE_DTYPE, count=n)
+
+    def last_timestamp(self, day):
+        """Timestamp of the last complete record in a partition, or None"""
+        path = self.partition_path(day)
+        if not os.path.exists(path):
+            return None
+        n = os.path.getsize(path) // CANDLE_DTYPE.itemsize
+        if n == 0:
+            return None
+        with open(path, 'rb') as f:
+            f.seek((n - 1) * CANDLE_DTYPE.itemsize)
+            last = np.frombuffer(f.read(CANDLE_DTYPE.itemsize), dtype=CANDLE_DTYPE)
+        return int(last['timestamp'][0])
+
+    # ------------------------------------------
+    # Writes
+    # ------------------------------------------
+
+    def _append(self, day, records):
+        path = self.partition_path(day)
+        with open(path, 'ab') as f:
+            # Drop a torn record left by an interrupted append
+            size = f.tell()
+            whole = size - size % CANDLE_DTYPE.itemsize
+            if whole != size:
+                f.truncate(whole)
+                f.seek(whole)
+            f.write(records.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _rewrite(self, day, records):
+        path = self.partition_path(day)
+        tmp = f"{path}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(records.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        _fsync_dir(self.path)
+
+    def write(self, df):
+        """
+        Store candles (DataFrame or to_records output), returns the number
+        of new rows.
+
+        Rows newer than a partition's last timestamp are appended. Rows
+        filling a hole inside a partition trigger an atomic rewrite of
+        that partition only. Rows already stored are skipped.
+        """
+        records = df if isinstance(df, np.ndarray) else to_records(df)
+        if len(records) == 0:
+            return 0
+
+        os.makedirs(self.path, exist_ok=True)
+        days = records['timestamp'] // DAY_NS
+        bounds = np.flatnonzero(np.diff(days)) + 1
+
+        added = 0
+        for chunk in np.split(records, bounds):
+            day = self.day_of(chunk['timestamp'][0])
+            last = self.last_timestamp(day)
+
+            if last is None:
+                self._append(day, chunk)
+                added += len(chunk)
+                continue
+
+            newer = chunk[chunk['timestamp'] > last]
+            older = chunk[chunk['timestamp'] <= last]
+
+            if len(older):
+                existing = self.read_partition(day)
+                older = older[~np.isin(older['timestamp'], existing['timestamp'])]
+
+            if len(older):
+                merged = np.concatenate([existing, older, newer])
+                merged = merged[np.argsort(merged['timestamp'], kind='stable')]
+                self._rewrite(day, merged)
+            elif len(newer):
+                self._append(day, newer)
+
+            added += len(older) + len(newer)
+
+        return added
+
+    # ------------------------------------------
+    # Reads
+    # ------------------------------------------
+
+    def read(self, start=None, end=None):
+        """Records with start <= timestamp < end (pandas-parsable bounds or None)"""
+        start_ns = pd.Timestamp(start).value if start is not None else None
+        end_ns = pd.Timestamp(end).value if end is not None else None
+
+        chunks = []
+        for day in self.partitions():
+            day_start = pd.Timestamp(day).value
+            if start_ns is not None and day_start + DAY_NS <= start_ns:
+                continue
+            if end_ns is not None and day_start >= end_ns:
+                break
+
+            records = self.read_partition(day)
+            ts = records['timestamp']
+            lo = np.searchsorted(ts, start_ns) if start_ns is not None else 0
+            hi = np.searchsorted(ts, end_ns) if end_ns is not None else len(ts)
+            chunks.append(records[lo:hi])
+
+        if not chunks:
+            return np.empty(0, dtype=CANDLE_DTYPE)
+        return np.concatenate(chunks)
+
+    def load_frame(self, start=None, end=None):
+        return to_frame(self.read(start, end))
+
+    def import_csv(self, path=LEGACY_CSV):
+        """Load a legacy btc_1min.csv into the store"""
+        return self.write(pd.read_csv(path))
+
+
+if __name__ == "__main__":
+    store = CandleStore()
+
+    if len(sys.argv) == 3 and sys.argv[1] == '--import':
+        added = store.import_csv(sys.argv[2])
+        print(f"✅ Imported {added} new candles into {store.path}")
+
+    days = store.partitions()
+    if not days:
+        print(f"No partitions in {store.path}")
+    for day in days:
+        records = store.read_partition(day)
+        print(f"{day}: {len(records):5d} candles")
@@ -16,12 +16,15 @@ REQUIREMENTS:
 - Fast internet connection (VPS recommended)
 """
 
-import requests
+import argparse
 import time
-from datetime import datetime, timezone
+from datetime import datetime
 import os
 import json
 
+from feeds import add_feed_arguments, format_latency, open_feeds, read_feeds
+from transport import client
+
 # ==========================================
 # CONFIGURATION - CHANGE THESE
 # ==========================================
@@ -32,65 +35,31 @@ ENTRY_WINDOW_START = 240   # Enter at 4:00 into window (60s remaining)
 ENTRY_WINDOW_END = 270     # Stop entering at 4:30 (30s remaining)
 MIN_ORACLE_DELAY = 45      # Only trade if oracle is 45s+ delayed
 MIN_PRICE_GAP = 0.001      # 0.1% minimum price difference
+PREWARM_SECONDS = 15       # Open connections this long before the entry window
+
+MAX_PRICE_AGE = 2.0        # Seconds without a Binance trade before the price counts as stale
 
 # Chainlink
 CHAINLINK_CONTRACT = "0xc907E116054Ad103354f2D350FD2514433D57F6f"
-POLYGON_RPC = "https://polygon-rpc.com"
-
-# ==========================================
-# PRICE FEEDS
-# ==========================================
-
-def get_binance_price():
-    """Real BTC price (50ms updates)"""
-    try:
-        r = requests.get(
-            "https://api.binance.com/api/v3/ticker/price",
-            params={"symbol": "BTCUSDT"},
-            timeout=2
-        )
-        return float(r.json()['price'])
-    except:
-        return None
-
-def get_chainlink_price():
-    """Oracle price (what Polymarket uses to resolve)"""
-    try:
-        payload = {
-            "jsonrpc": "2.0",
-            "method": "eth_call",
-            "params": [{
-                "to": CHAINLINK_CONTRACT,
-                "data": "0xfeaf968c"
-            }, "latest"],
-            "id": 1
-        }
-
-        r = requests.post(POLYGON_RPC, json=payload, timeout=5)
-        result = r.json()
-
-        if 'result' in result and len(result['result']) >= 194:
-            raw = result['result']
-            price = int(raw[66:130], 16) / 1e8
-            updated_at = int(raw[130:194], 16)
-            delay = (datetime.now(timezone.utc) -
-                    datetime.fromtimestamp(updated_at, tz=timezone.utc)).total_seconds()
-            return {'price': price, 'delay': delay}
-        return None
-    except:
-        return None
 
 # ==========================================
 # MARKET TIMING
 # ==========================================
 
-def get_market_timing():
-    """Returns seconds elapsed and remaining in current 5-min window"""
-    now = datetime.now(timezone.utc)
-    elapsed = now.second + (now.minute % 5) * 60
-    remaining = 300 - elapsed
+WINDOW_SECONDS = 300
+
+def get_market_timing(now=None):
+    """Returns seconds elapsed and remaining in the 5-min window at `now` (unix seconds)"""
+    now = time.time() if now is None else now
+    elapsed = int(now) % WINDOW_SECONDS
+    remaining = WINDOW_SECONDS - elapsed
     return elapsed, remaining
 
+def get_window_id(now=None):
+    """Index of the 5-min window containing `now`"""
+    now = time.time() if now is None else now
+    return int(now) // WINDOW_SECONDS
+
 def get_active_markets():
     """Get active BTC 5-min markets from Polymarket"""
     try:
@@ -100,7 +69,7 @@ def get_active_markets():
             "closed": "false",
             "limit": 20
         }
-        r = requests.get(url, params=params, timeout=5)
+        r = client.get(url, params=params, timeout=5)
         markets = r.json()
 
         btc_markets = [
@@ -113,6 +82,31 @@ def get_active_markets():
     except:
         return []
 
+# ==========================================
+# DECISION LOGIC
+# ==========================================
+
+def in_entry_window(elapsed):
+    return ENTRY_WINDOW_START <= elapsed <= ENTRY_WINDOW_END
+
+def trade_signal(binance_price, oracle_price, oracle_delay):
+    """
+    None if the oracle is not delayed enough, otherwise
+    {'price_gap', 'direction', 'confidence'} (direction None if the gap is too small)
+    """
+    if oracle_delay < MIN_ORACLE_DELAY:
+        return None
+
+    price_diff_pct = (binance_price - oracle_price) / oracle_price
+    signal = {'price_gap': price_diff_pct, 'direction': None, 'confidence': None}
+    if price_diff_pct > MIN_PRICE_GAP:
+        signal['direction'] = "UP"
+    elif price_diff_pct < -MIN_PRICE_GAP:
+        signal['direction'] = "DOWN"
+    if signal['direction']:
+        signal['confidence'] = min(0.95, 0.70 + abs(price_diff_pct) * 10)
+    return signal
+
 # ==========================================
 # TRADE EXECUTION
 # ==========================================
@@ -141,7 +135,17 @@ def execute_trade_live(direction, market_id, confidence, price, remaining):
 # ==========================================
 
 class RiskManager:
-    def __init__(self):
+    """
+    Daily loss / losing streak limits and cooldown. `clock` returns unix
+    seconds (time.time live, the event time in chainlink_replay.py).
+    Once a limit is hit the bot stays stopped; with daily_reset=True
+    (multi-day replays) the counters reset at UTC midnight instead.
+    """
+    def __init__(self, clock=time.time, verbose=True, daily_reset=False):
+        self.clock = clock
+        self.verbose = verbose
+        self.daily_reset = daily_reset
+        self.day = int(clock()) // 86400
         self.daily_pnl = 0
         self.trades_today = 0
         self.consecutive_losses = 0
@@ -149,19 +153,28 @@ class RiskManager:
 
     def can_trade(self):
         """Check all risk limits"""
+        now = self.clock()
+        if self.daily_reset and int(now) // 86400 != self.day:
+            self.day = int(now) // 86400
+            self.daily_pnl = 0
+            self.trades_today = 0
+            self.consecutive_losses = 0
+
         # Daily loss limit
         if self.daily_pnl <= -MAX_DAILY_LOSS:
-            print(f"  🛑 Daily loss limit hit: ${self.daily_pnl:.2f}")
+            if self.verbose:
+                print(f"  🛑 Daily loss limit hit: ${self.daily_pnl:.2f}")
             return False
 
         # Consecutive losses
         if self.consecutive_losses >= 5:
-            print(f"  🛑 5 consecutive losses - stopping")
+            if self.verbose:
+                print(f"  🛑 5 consecutive losses - stopping")
             return False
 
         # Cooldown (don't trade same window twice)
-        elapsed, _ = get_market_timing()
-        if elapsed < 10 and time.time() - self.last_trade_time < 30:
+        elapsed, _ = get_market_timing(now)
+        if elapsed < 10 and now - self.last_trade_time < 30:
             return False
 
         return True
@@ -169,20 +182,25 @@ class RiskManager:
     def record_win(self, amount):
         self.daily_pnl += amount
         self.consecutive_losses = 0
-        self.last_trade_time = time.time()
+        self.last_trade_time = self.clock()
 
     def record_loss(self, amount):
         self.daily_pnl -= amount
         self.consecutive_losses += 1
         self.trades_today += 1
-        self.last_trade_time = time.time()
+        self.last_trade_time = self.clock()
 
 # ==========================================
 # MAIN BOT
 # ==========================================
 
-def run_bot():
-    """Main bot loop"""
+def run_bot(binance=None, chainlink=None):
+    """
+    Main bot loop. binance / chainlink are feeds.PriceFeed sources
+    (default: the trade stream and the cached oracle RPC)
+    """
+    if binance is None or chainlink is None:
+        binance, chainlink = open_feeds(contract=CHAINLINK_CONTRACT, max_age=MAX_PRICE_AGE)
 
     print("="*70)
     print("CHAINLINK ARBITRAGE BOT")
@@ -201,18 +219,23 @@ def run_bot():
     print("  This is arbitrage, not prediction!")
     print("="*70 + "\n")
 
+    print(f"Connecting to {binance.name} and {chainlink.name}...")
+    if not binance.start().wait(timeout=15):
+        print("⚠️ No Binance price yet - will skip until the feed is up")
+
     risk = RiskManager()
     trade_log = []
     in_trade = False
     current_window_traded = -1
+    warmed_window = -1
 
     while True:
         try:
             elapsed, remaining = get_market_timing()
-            window_id = datetime.now().minute // 5
+            window_id = get_window_id()
 
             # In the entry window
-            if ENTRY_WINDOW_START <= elapsed <= ENTRY_WINDOW_END:
+            if in_entry_window(elapsed):
 
                 # Don't trade same window twice
                 if window_id == current_window_traded:
@@ -224,24 +247,23 @@ def run_bot():
                     time.sleep(1)
                     continue
 
-                # Get prices
-                binance_price = get_binance_price()
-                oracle_data = get_chainlink_price()
+                # Both at once if both do I/O; a stream price is read last, so it is the freshest
+                oracle_snap, binance_snap = read_feeds(chainlink, binance)
 
-                if not binance_price or not oracle_data:
+                if not binance_snap or not oracle_snap:
                     time.sleep(1)
                     continue
 
-                oracle_price = oracle_data['price']
-                oracle_delay = oracle_data['delay']
+                binance_price = binance_snap.price
+                oracle_price = oracle_snap.price
+                oracle_delay = oracle_snap.age()
 
-                # Check oracle delay
-                if oracle_delay < MIN_ORACLE_DELAY:
+                # Check oracle delay, then the price gap
+                signal = trade_signal(binance_price, oracle_price, oracle_delay)
+                if signal is None:
                     time.sleep(1)
                     continue
-
-                # Calculate direction
-                price_diff_pct = (binance_price - oracle_price) / oracle_price
+                price_diff_pct = signal['price_gap']
 
                 time_str = datetime.now().strftime("%H:%M:%S")
                 print(f"\n[{time_str}] ENTRY WINDOW DETECTED")
@@ -249,19 +271,15 @@ def run_bot():
                 print(f"  Binance: ${binance_price:,.2f}")
                 print(f"  Oracle:  ${oracle_price:,.2f}")
                 print(f"  Delay:   {oracle_delay:.0f}s")
+                print(f"  Fetch:   {format_latency(oracle_snap, binance_snap)}")
                 print(f"  Gap:     {price_diff_pct*100:+.3f}%")
 
                 # Determine trade
-                if price_diff_pct > MIN_PRICE_GAP:
-                    direction = "UP"
-                    confidence = min(0.95, 0.70 + abs(price_diff_pct) * 10)
-                elif price_diff_pct < -MIN_PRICE_GAP:
-                    direction = "DOWN"
-                    confidence = min(0.95, 0.70 + abs(price_diff_pct) * 10)
-                else:
+                if signal['direction'] is None:
                     print(f"  Price gap too small - SKIP")
                     time.sleep(1)
                     continue
+                direction, confidence = signal['direction'], signal['confidence']
 
                 print(f"\n  🎯 SIGNAL: {direction}")
                 print(f"  Confidence: {confidence*100:.1f}%")
@@ -287,21 +305,32 @@ def run_bot():
                         'oracle_price': oracle_price,
                         'oracle_delay': oracle_delay,
                         'price_gap_pct': price_diff_pct * 100,
-                        'remaining': remaining
+                        'remaining': remaining,
+                        'binance_age': time.time() - binance_snap.received_at,
+                        'chainlink_latency': oracle_snap.latency,
                     })
 
+            # Open the RPC connection just before the entry window, so the
+            # first fetch in it skips the TCP+TLS handshake
+            elif (ENTRY_WINDOW_START - PREWARM_SECONDS <= elapsed < ENTRY_WINDOW_START
+                  and window_id != warmed_window):
+                chainlink.prewarm()
+                warmed_window = window_id
+
             # Status every 30 seconds
             elif elapsed % 30 == 0:
                 time_str = datetime.now().strftime("%H:%M:%S")
-                binance_price = get_binance_price()
-                oracle_data = get_chainlink_price()
+                binance_snap, oracle_snap = binance.get(), chainlink.get()
 
-                if binance_price and oracle_data:
+                if binance_snap and oracle_snap:
+                    next_round = (f"Next round: {oracle_snap.next_update - time.time():.0f}s | "
+                                  if oracle_snap.next_update else "")
                     print(f"[{time_str}] "
                           f"Elapsed: {elapsed:3.0f}s | "
                           f"Remaining: {remaining:3.0f}s | "
-                          f"Binance: ${binance_price:,.0f} | "
-                          f"Delay: {oracle_data['delay']:.0f}s | "
+                          f"Binance: ${binance_snap.price:,.0f} | "
+                          f"Delay: {oracle_snap.age():.0f}s | "
+                          f"{next_round}"
                           f"Trades: {len(trade_log)} | "
                           f"P/L: ${risk.daily_pnl:.2f}")
 
@@ -313,6 +342,9 @@ def run_bot():
             print(f"{'='*70}")
             print(f"\nTotal trades: {len(trade_log)}")
             print(f"Daily P/L: ${risk.daily_pnl:.2f}")
+            print(f"\n{binance.summary()}\n{chainlink.summary()}")
+            binance.stop()
+            chainlink.stop()
 
             if trade_log:
                 import pandas as pd
@@ -328,4 +360,6 @@ def run_bot():
             time.sleep(2)
 
 if __name__ == "__main__":
-    run_bot()
+    parser = argparse.ArgumentParser(description="Chainlink delay arbitrage bot")
+    args = add_feed_arguments(parser).parse_args()
+    run_bot(*open_feeds(args, contract=CHAINLINK_CONTRACT, max_age=MAX_PRICE_AGE))
@@ -6,113 +6,66 @@ Strategy: Compare real Binance price vs Chainlink price
 In final 60 seconds of market, resolution is KNOWN
 """
 
-import requests
+import argparse
 import time
-from datetime import datetime, timezone
+from datetime import datetime
 import json
 
+from feeds import add_feed_arguments, format_latency, open_feeds, read_feeds
+
 # Chainlink BTC/USD on Polygon
 # Contract: 0xc907E116054Ad103354f2D350FD2514433D57F6f
+# Polymarket RESOLVES markets with this feed; it lags the real price by ~1 minute
 CHAINLINK_CONTRACT = "0xc907E116054Ad103354f2D350FD2514433D57F6f"
-POLYGON_RPC = "https://polygon-rpc.com"
-
-def get_binance_price():
-    """Get REAL current BTC price from Binance"""
-    try:
-        url = "https://api.binance.com/api/v3/ticker/price"
-        params = {"symbol": "BTCUSDT"}
-        response = requests.get(url, params=params, timeout=3)
-        data = response.json()
-        return float(data['price'])
-    except Exception as e:
-        print(f"Binance error: {e}")
-        return None
 
-def get_chainlink_price():
-    """
-    Get Chainlink BTC/USD price from Polygon
-    This is what Polymarket uses to RESOLVE markets
-    Has ~1 minute delay vs real price
-    """
-    try:
-        # Using Polygon RPC to call Chainlink contract
-        # latestRoundData() function signature
-        payload = {
-            "jsonrpc": "2.0",
-            "method": "eth_call",
-            "params": [
-                {
-                    "to": CHAINLINK_CONTRACT,
-                    "data": "0xfeaf968c"  # latestRoundData() selector
-                },
-                "latest"
-            ],
-            "id": 1
-        }
-
-        response = requests.post(POLYGON_RPC, json=payload, timeout=5)
-        result = response.json()
-
-        if 'result' in result and result['result'] != '0x':
-            raw = result['result']
-
-            # Decode: roundId, answer, startedAt, updatedAt, answeredInRound
-            # Each field is 32 bytes (64 hex chars)
-            if len(raw) >= 194:
-                answer_hex = raw[66:130]  # Second field = price
-                updated_hex = raw[130:194]  # Fourth field = timestamp
-
-                # Convert price (8 decimal places for BTC/USD)
-                price = int(answer_hex, 16) / 1e8
-
-                # Convert timestamp
-                updated_at = int(updated_hex, 16)
-                updated_time = datetime.fromtimestamp(updated_at, tz=timezone.utc)
-
-                return {
-                    'price': price,
-                    'updated_at': updated_time,
-                    'timestamp': updated_at
-                }
+OPPORTUNITY_GAP_PCT = 0.3   # % gap that counts as an opportunity
 
-        return None
+def opportunity_direction(binance_price, chainlink_price):
+    """'UP' / 'DOWN' if Binance is more than OPPORTUNITY_GAP_PCT away from the oracle, else None"""
+    price_diff_pct = (binance_price - chainlink_price) / chainlink_price * 100
+    if abs(price_diff_pct) > OPPORTUNITY_GAP_PCT:
+        return "UP" if price_diff_pct > 0 else "DOWN"
+    return None
 
-    except Exception as e:
-        print(f"Chainlink error: {e}")
-        return None
-
-def calculate_delay(chainlink_data):
+def calculate_delay(chainlink_snap):
     """Calculate how delayed Chainlink is vs current time"""
-    if not chainlink_data:
+    if not chainlink_snap:
         return None
 
-    now = datetime.now(timezone.utc)
-    delay_seconds = (now - chainlink_data['updated_at']).total_seconds()
-    return delay_seconds
+    return chainlink_snap.age()
 
-def monitor_prices():
+def monitor_prices(binance=None, chainlink=None):
     """
     Main monitoring loop
     Compares Binance (real) vs Chainlink (delayed)
     Detects arbitrage opportunities
+    binance / chainlink: feeds.PriceFeed sources (default: stream + oracle RPC)
     """
+    if binance is None or chainlink is None:
+        binance, chainlink = open_feeds(contract=CHAINLINK_CONTRACT)
     print("="*70)
     print("CHAINLINK DELAY ARBITRAGE MONITOR")
     print("="*70)
     print("\nMonitoring price gap between Binance and Chainlink...")
     print("Press Ctrl+C to stop\n")
 
+    binance.start().wait(timeout=15)
+
     prev_chainlink_price = None
 
     while True:
         try:
-            # Get both prices
-            binance_price = get_binance_price()
-            chainlink_data = get_chainlink_price()
-
-            if binance_price and chainlink_data:
-                chainlink_price = chainlink_data['price']
-                delay = calculate_delay(chainlink_data)
+            # Both at once if both do I/O; a stream price is read last, so it is the freshest
+            chainlink_snap, binance_snap = read_feeds(chainlink, binance)
+            if not binance_snap:
+                print(f"Binance error: {binance.stats['last_error']}")
+            if not chainlink_snap:
+                print(f"Chainlink error: {chainlink.stats['last_error']}")
+
+            if binance_snap and chainlink_snap:
+                binance_price = binance_snap.price
+                chainlink_price = chainlink_snap.price
+                delay = calculate_delay(chainlink_snap)
 
                 # Price difference
                 price_diff = binance_price - chainlink_price
@@ -125,10 +78,11 @@ def monitor_prices():
                 print(f"  Chainlink (ORACLE): ${chainlink_price:,.2f}")
                 print(f"  Difference:        ${price_diff:+.2f} ({price_diff_pct:+.3f}%)")
                 print(f"  Oracle delay:      {delay:.0f} seconds")
+                print(f"  Fetch:             {format_latency(chainlink_snap, binance_snap)}")
 
                 # Detect significant gap
-                if abs(price_diff_pct) > 0.3:
-                    direction = "UP" if price_diff > 0 else "DOWN"
+                direction = opportunity_direction(binance_price, chainlink_price)
+                if direction:
                     print(f"\n  🚨 OPPORTUNITY DETECTED!")
                     print(f"  Real BTC moved {price_diff_pct:+.3f}%")
                     print(f"  Chainlink hasn't updated yet")
@@ -150,10 +104,15 @@ def monitor_prices():
 
         except KeyboardInterrupt:
             print("\n\nStopped")
+            print(f"{binance.summary()}\n{chainlink.summary()}")
+            binance.stop()
+            chainlink.stop()
             break
         except Exception as e:
             print(f"Error: {e}")
             time.sleep(5)
 
 if __name__ == "__main__":
-    monitor_prices()
+    parser = argparse.ArgumentParser(description="Monitor the Binance vs Chainlink price gap")
+    args = add_feed_arguments(parser).parse_args()
+    monitor_prices(*open_feeds(args, contract=CHAINLINK_CONTRACT))
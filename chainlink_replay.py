@@ -0,0 +1,334 @@
+"""
+CHAINLINK REPLAY
+=================
+Event-driven backtest of the Chainlink delay strategies on recorded data.
+
+Binance ticks and Chainlink round updates are merged in timestamp order
+and replayed through the decision functions the live scripts use:
+    arb        chainlink_arb_bot: entry window, MIN_ORACLE_DELAY,
+               MIN_PRICE_GAP, one trade per window, RiskManager (its
+               clock is the event time; limits reset each UTC day, as
+               if the bot were restarted daily), polled every second
+    predictor  resolution_predictor: the first call in the golden window
+               with the oracle delayed decides it - UP/DOWN is a bet,
+               "too close to call" skips the window - polled every second
+    monitor    chainlink_monitor: first >0.3% gap opportunity in a
+               window, polled every 5 seconds
+
+At each poll a strategy sees the last Binance tick and the last oracle
+round, as the live price calls would. A bet is on the 5-minute window
+it was placed in and resolves on the oracle itself: UP if the oracle
+price at the window close is at or above the price at its open. Bets
+are settled in event order, so RiskManager sees wins and losses when
+they happen.
+
+The live scripts don't see Polymarket odds, so every bet buys tokens at
+one assumed entry price (--entry-price).
+
+Input:
+    ticks    CSV with time (unix seconds) and price columns,
+             or a stream_collector.py --record JSONL file
+    rounds   CSV with updated_at (unix seconds) and price columns
+
+Usage:
+    python3 chainlink_replay.py --ticks data/ticks.csv --rounds data/rounds.csv
+    python3 chainlink_replay.py --synthetic --days 30
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from chainlink_arb_bot import (
+    POSITION_SIZE, WINDOW_SECONDS, RiskManager, get_market_timing, get_window_id,
+    in_entry_window, trade_signal,
+)
+from chainlink_monitor import opportunity_direction
+from resolution_predictor import get_market_window, in_golden_window, resolution_call
+
+ENTRY_PRICE = 0.70
+
+
+# ==========================================
+# DATA
+# ==========================================
+
+def load_ticks(path):
+    """(times, prices) of Binance ticks, sorted by time"""
+    if path.endswith('.jsonl'):
+        times, prices = [], []
+        with open(path) as f:
+            for line in f:
+                if line.strip():
+                    event = json.loads(line)
+                    event = event.get('data', event)
+                    times.append(event['E'] / 1000)
+                    prices.append(float(event['k']['c']))
+        times, prices = np.array(times), np.array(prices)
+    else:
+        df = pd.read_csv(path)
+        times, prices = df['time'].to_numpy(np.float64), df['price'].to_numpy(np.float64)
+    order = np.argsort(times, kind='stable')
+    return times[order], prices[order]
+
+
+def load_rounds(path):
+    """(updated_at, prices) of oracle rounds, sorted by time"""
+    df = pd.read_csv(path).sort_values('updated_at', kind='stable')
+    return df['updated_at'].to_numpy(np.float64), df['price'].to_numpy(np.float64)
+
+
+def synthetic_session(days=1, start=None, price=68000.0, volatility=0.0001, clustering=0.25,
+                      deviation=0.005, heartbeat=60, latency=1.0, seed=42):
+    """
+    1-second random-walk ticks and oracle rounds posted `latency` seconds
+    after the price moves `deviation` from the last answer or `heartbeat`
+    seconds pass since the last round was posted (its updatedAt).
+
+    `volatility` is the average per-second volatility; `clustering` scales
+    it per minute by a slow log-AR(1), so calm stretches alternate with
+    fast moves that open gaps and trigger deviation rounds (0: constant).
+    """
+    rng = np.random.default_rng(seed)
+    if start is None:
+        start = int(time.time()) // 86400 * 86400 - days * 86400
+    n = days * 86400
+    level = np.empty(n // 60 + 1)
+    x = 0.0
+    for i, shock in enumerate(rng.normal(0, clustering, len(level)).tolist()):
+        x = 0.97 * x + shock
+        level[i] = x
+    # exp(level - var) keeps the average variance at volatility**2
+    scale = np.exp(level - level.var())[np.arange(n) // 60]
+    tick_times = start + np.arange(n, dtype=np.float64)
+    tick_prices = np.round(price * np.exp(np.cumsum(rng.normal(0, volatility, n) * scale)), 2)
+
+    round_times, round_prices = [start + latency], [tick_prices[0]]
+    last_price, last_time = tick_prices[0], start + latency
+    for t, p in zip(tick_times.tolist(), tick_prices.tolist()):
+        if abs(p / last_price - 1) >= deviation or t - last_time >= heartbeat:
+            round_times.append(t + latency)
+            round_prices.append(p)
+            last_price, last_time = p, t + latency
+    return (tick_times, tick_prices), (np.array(round_times), np.array(round_prices))
+
+
+def merge_events(ticks, rounds):
+    """(times, is_tick, row) of all events in timestamp order; rounds first on ties"""
+    times = np.concatenate([rounds[0], ticks[0]])
+    is_tick = np.r_[np.zeros(len(rounds[0]), bool), np.ones(len(ticks[0]), bool)]
+    rows = np.r_[np.arange(len(rounds[0])), np.arange(len(ticks[0]))]
+    order = np.argsort(times, kind='stable')
+    return times[order], is_tick[order], rows[order]
+
+
+# ==========================================
+# STRATEGIES
+# ==========================================
+
+class ReplayStrategy:
+    """Decision logic of one live script; decide() returns (direction, confidence) or None"""
+    name = None
+    poll = 1
+
+    def __init__(self):
+        self.traded_window = -1
+
+    def decide(self, now, binance_price, oracle_price, oracle_delay):
+        raise NotImplementedError
+
+    def settle(self, now, won, profit, size):
+        pass
+
+
+class ArbBot(ReplayStrategy):
+    """chainlink_arb_bot.run_bot"""
+    name = 'arb'
+
+    def __init__(self):
+        super().__init__()
+        self.now = 0.0
+        self.risk = RiskManager(clock=lambda: self.now, verbose=False, daily_reset=True)
+
+    def decide(self, now, binance_price, oracle_price, oracle_delay):
+        self.now = now
+        elapsed, _ = get_market_timing(now)
+        if not in_entry_window(elapsed):
+            return None
+        window_id = get_window_id(now)
+        if window_id == self.traded_window or not self.risk.can_trade():
+            return None
+        signal = trade_signal(binance_price, oracle_price, oracle_delay)
+        if signal is None or signal['direction'] is None:
+            return None
+        self.traded_window = window_id
+        return signal['direction'], signal['confidence']
+
+    def settle(self, now, won, profit, size):
+        self.now = now
+        if won:
+            self.risk.record_win(profit)
+        else:
+            self.risk.record_loss(size)
+
+
+class Predictor(ReplayStrategy):
+    """resolution_predictor.run_predictor"""
+    name = 'predictor'
+
+    def decide(self, now, binance_price, oracle_price, oracle_delay):
+        elapsed, _ = get_market_window(now)
+        window_id = int(now) // WINDOW_SECONDS
+        if not in_golden_window(elapsed) or window_id == self.traded_window:
+            return None
+        call = resolution_call(binance_price, oracle_price, oracle_delay)
+        if call is None:
+            return None
+        # Unlike the arb bot, which polls until the gap opens, the first
+        # call decides the window: "too close to call" skips the market
+        self.traded_window = window_id
+        if call == "NEUTRAL":
+            return None
+        return call, None
+
+
+class Monitor(ReplayStrategy):
+    """chainlink_monitor.monitor_prices"""
+    name = 'monitor'
+    poll = 5
+
+    def decide(self, now, binance_price, oracle_price, oracle_delay):
+        window_id = int(now) // WINDOW_SECONDS
+        if window_id == self.traded_window:
+            return None
+        direction = opportunity_direction(binance_price, oracle_price)
+        if direction is None:
+            return None
+        self.traded_window = window_id
+        return direction, None
+
+
+STRATEGIES = {'arb': ArbBot, 'predictor': Predictor, 'monitor': Monitor}
+
+
+# ==========================================
+# REPLAY
+# ==========================================
+
+def replay(ticks, rounds, strategies=None, size=POSITION_SIZE, entry_price=ENTRY_PRICE):
+    """Run the strategies over the merged event stream; returns a DataFrame of settled bets"""
+    strategies = strategies or [cls() for cls in STRATEGIES.values()]
+    times, is_tick, rows = merge_events(ticks, rounds)
+    tick_prices = ticks[1].tolist()
+    round_times, round_prices = rounds
+    round_times_list, round_prices_list = round_times.tolist(), round_prices.tolist()
+    last_round_time = round_times[-1] if len(round_times) else -np.inf
+
+    next_poll = [-np.inf] * len(strategies)
+    oracle_price = oracle_time = None
+    pending = []   # (close, strategy index, bet) in placement order
+    settled = []
+
+    def settle_until(now):
+        while pending and pending[0][0] <= now:
+            close, i, bet = pending.pop(0)
+            won = bet['direction'] == bet['outcome']
+            profit = size / entry_price - size if won else -size
+            strategies[i].settle(close, won, profit, size)
+            settled.append(dict(bet, win=won, profit=profit))
+
+    for t, tick, row in zip(times.tolist(), is_tick.tolist(), rows.tolist()):
+        if pending and pending[0][0] <= t:
+            settle_until(t)
+        if not tick:
+            oracle_price, oracle_time = round_prices_list[row], round_times_list[row]
+            continue
+        if oracle_price is None:
+            continue
+
+        binance_price = tick_prices[row]
+        for i, strategy in enumerate(strategies):
+            if t < next_poll[i]:
+                continue
+            next_poll[i] = t + strategy.poll
+            decision = strategy.decide(t, binance_price, oracle_price, t - oracle_time)
+            if decision is None:
+                continue
+
+            # Resolution: oracle answer at window close vs window open
+            open_time = (int(t) // WINDOW_SECONDS) * WINDOW_SECONDS
+            close = open_time + WINDOW_SECONDS
+            if close > last_round_time:
+                continue   # not resolvable from the recorded rounds
+            at_open, at_close = np.searchsorted(round_times, [open_time, close], side='right') - 1
+            if at_open < 0:
+                continue
+            open_price, close_price = round_prices_list[at_open], round_prices_list[at_close]
+            pending.append((close, i, {
+                'strategy': strategy.name,
+                'time': t,
+                'window_start': open_time,
+                'direction': decision[0],
+                'confidence': decision[1],
+                'binance_price': binance_price,
+                'oracle_price': oracle_price,
+                'oracle_delay': t - oracle_time,
+                'open_price': open_price,
+                'close_price': close_price,
+                'outcome': "UP" if close_price >= open_price else "DOWN",
+            }))
+    settle_until(np.inf)
+
+    return pd.DataFrame(settled, columns=[
+        'strategy', 'time', 'window_start', 'direction', 'confidence', 'binance_price',
+        'oracle_price', 'oracle_delay', 'open_price', 'close_price', 'outcome', 'win', 'profit',
+    ])
+
+
+def summarize(trades):
+    """Trades, wins, win rate and P/L per strategy"""
+    return trades.groupby('strategy').agg(
+        trades=('win', 'size'), wins=('win', 'sum'), win_rate=('win', 'mean'), pnl=('profit', 'sum')
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay Binance ticks and Chainlink rounds through the live strategies")
+    parser.add_argument('--ticks', help="CSV (time, price) or stream_collector JSONL")
+    parser.add_argument('--rounds', help="CSV (updated_at, price)")
+    parser.add_argument('--synthetic', action='store_true', help="Random-walk ticks and oracle")
+    parser.add_argument('--days', type=int, default=1, help="Synthetic days")
+    parser.add_argument('--strategies', default=','.join(STRATEGIES))
+    parser.add_argument('--entry-price', type=float, default=ENTRY_PRICE)
+    parser.add_argument('--out', default='data/replay_trades.csv')
+    args = parser.parse_args()
+
+    if args.synthetic:
+        ticks, rounds = synthetic_session(args.days)
+    elif args.ticks and args.rounds:
+        ticks, rounds = load_ticks(args.ticks), load_rounds(args.rounds)
+    else:
+        parser.error("--ticks and --rounds, or --synthetic")
+
+    print("="*60)
+    print("CHAINLINK REPLAY")
+    print("="*60)
+    span = (ticks[0][-1] - ticks[0][0]) / 86400 if len(ticks[0]) else 0
+    print(f"{len(ticks[0])} ticks, {len(rounds[0])} oracle rounds ({span:.1f} days)")
+
+    started = time.time()
+    trades = replay(ticks, rounds, [STRATEGIES[name]() for name in args.strategies.split(',')],
+                    entry_price=args.entry_price)
+    print(f"Replayed in {time.time() - started:.1f}s\n")
+
+    if len(trades):
+        print(summarize(trades).to_string(float_format=lambda x: f"{x:.3f}"))
+        os.makedirs(os.path.dirname(args.out) or '.', exist_ok=True)
+        trades.to_csv(args.out, index=False)
+        print(f"\n✅ Saved to {args.out}")
+    else:
+        print("No trades")
@@ -0,0 +1,179 @@
+"""
+COLLECTION ENGINE
+==================
+One collector for any list of (symbol, interval) series.
+
+- Only 1m klines are fetched; 5m/15m/1h/... series are resampled
+  locally from the stored 1m candles
+- Every symbol is fetched concurrently under one shared rate budget
+- A series that fell behind catches up with paged startTime requests
+- Each series lives in its own store partition directory
+  (data/candles/ETHUSDT-1m, data/candles/ETHUSDT-5m, ...)
+
+Usage:
+    python3 collection_engine.py BTCUSDT:1m ETHUSDT:1m SOLUSDT:1m ETHUSDT:5m
+"""
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import numpy as np
+import requests
+
+from backfill import make_pages
+from binance import BINANCE_URL, INTERVAL_MS, MAX_KLINES, RateLimiter, fetch_klines, klines_to_frame
+from candle_store import CANDLE_DTYPE, CandleStore, STORE_DIR, to_records
+from transport import client
+
+BASE_INTERVAL = '1m'
+
+
+def parse_series(specs):
+    """['BTCUSDT:1m', 'ETHUSDT:5m'] -> [('BTCUSDT', '1m'), ('ETHUSDT', '5m')]"""
+    series = []
+    for spec in specs:
+        symbol, _, interval = spec.partition(':')
+        interval = interval or BASE_INTERVAL
+        if interval not in INTERVAL_MS:
+            raise ValueError(f"Unknown interval: {interval}")
+        series.append((symbol.upper(), interval))
+    return series
+
+
+def resample(records, interval):
+    """
+    Aggregate sorted 1m records into `interval` candles.
+    Only buckets with every minute present are returned.
+    """
+    step = INTERVAL_MS[interval] * 10**6
+    per_bucket = INTERVAL_MS[interval] // INTERVAL_MS[BASE_INTERVAL]
+    if len(records) == 0:
+        return np.empty(0, dtype=CANDLE_DTYPE)
+
+    buckets = records['timestamp'] // step
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(records)]
+    complete = (ends - starts) == per_bucket
+
+    out = np.empty(len(starts), dtype=CANDLE_DTYPE)
+    out['timestamp'] = buckets[starts] * step
+    out['open'] = records['open'][starts]
+    out['close'] = records['close'][ends - 1]
+    out['high'] = np.maximum.reduceat(records['high'], starts)
+    out['low'] = np.minimum.reduceat(records['low'], starts)
+    out['volume'] = np.add.reduceat(records['volume'], starts)
+    out['trades'] = np.add.reduceat(records['trades'], starts)
+    return out[complete]
+
+
+class CollectionEngine:
+    """Fetch 1m candles for many symbols and keep derived intervals in sync"""
+
+    def __init__(self, series, base_url=BINANCE_URL, limiter=None, workers=4, root=STORE_DIR,
+                 http=None):
+        self.series = series
+        self.base_url = base_url
+        self.limiter = limiter or RateLimiter()
+        self.workers = workers
+        self.root = root
+        self.http = http or client
+
+        self.symbols = sorted({symbol for symbol, _ in series})
+        self.base_stores = {s: CandleStore(s, BASE_INTERVAL, root) for s in self.symbols}
+        self.derived = [(s, i) for s, i in series if i != BASE_INTERVAL]
+        self.derived_stores = {(s, i): CandleStore(s, i, root) for s, i in self.derived}
+
+    def _last_ms(self, store):
+        days = store.partitions()
+        if not days:
+            return None
+        last = store.last_timestamp(days[-1])
+        return None if last is None else last // 10**6
+
+    def _jobs(self, now_ms):
+        """(symbol, page) requests bringing every 1m series up to now"""
+        jobs = []
+        for symbol, store in self.base_stores.items():
+            last = self._last_ms(store)
+            if last is None:
+                jobs.append((symbol, (None, None)))
+            else:
+                start = last + INTERVAL_MS[BASE_INTERVAL]
+                jobs.extend((symbol, page) for page in make_pages(start, now_ms))
+        return jobs
+
+    def _fetch(self, symbol, page):
+        start_ms, end_ms = page
+        data = fetch_klines(
+            symbol, BASE_INTERVAL, MAX_KLINES, start_ms, end_ms,
+            base_url=self.base_url, session=self.http, limiter=self.limiter
+        )
+        return klines_to_frame(data, closed_before_ms=time.time() * 1000)
+
+    def _update_derived(self, symbol, since_ns):
+        """Resample derived intervals from the earliest bucket touched by new 1m data"""
+        added = {}
+        for (s, interval), store in self.derived_stores.items():
+            if s != symbol:
+                continue
+            step = INTERVAL_MS[interval] * 10**6
+            start = since_ns - since_ns % step
+            last = self._last_ms(store)
+            if last is None:
+                start = None
+            else:
+                start = min(start, last * 10**6 + step)
+
+            records = resample(self.base_stores[symbol].read(start=start), interval)
+            added[(s, interval)] = store.write(records)
+        return added
+
+    def collect_once(self):
+        """One pass over every series, returns {(symbol, interval): new candles}"""
+        now_ms = int(time.time() * 1000)
+        jobs = self._jobs(now_ms)
+        added = {(s, BASE_INTERVAL): 0 for s in self.symbols}
+        earliest = {}
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self._fetch, symbol, page): symbol for symbol, page in jobs}
+            for future in as_completed(futures):
+                symbol = futures[future]
+                records = to_records(future.result())
+                if len(records) == 0:
+                    continue
+                added[(symbol, BASE_INTERVAL)] += self.base_stores[symbol].write(records)
+                first = int(records['timestamp'][0])
+                earliest[symbol] = min(earliest.get(symbol, first), first)
+
+        for symbol, since_ns in earliest.items():
+            added.update(self._update_derived(symbol, since_ns))
+        return added
+
+    def run(self, every=1800):
+        """Collect every `every` seconds until interrupted"""
+        while True:
+            try:
+                added = self.collect_once()
+                summary = " | ".join(f"{s} {i}: +{n}" for (s, i), n in sorted(added.items()))
+                print(f"[{datetime.now().strftime('%H:%M:%S')}] {summary}")
+            except requests.RequestException as e:
+                print(f"[{datetime.now().strftime('%H:%M:%S')}] Fetch failed: {e}")
+            time.sleep(every)
+
+
+if __name__ == "__main__":
+    series = parse_series(sys.argv[1:] or ['BTCUSDT:1m'])
+
+    print("="*60)
+    print("COLLECTION ENGINE")
+    print("="*60)
+    print("Series: " + ", ".join(f"{s} {i}" for s, i in series))
+    print("Press Ctrl+C to stop\n")
+
+    try:
+        CollectionEngine(series).run(every=60)
+    except KeyboardInterrupt:
+        print("\n\nStopped")
@@ -0,0 +1,158 @@
+"""
+FEATURE CACHE
+==============
+On-disk cache of the window feature table.
+
+5-minute windows never cross UTC midnight, so each day partition of the
+candle store can be featurized on its own. The cache keeps the feature
+tensor for all entry points (features.build_feature_tensor) per
+partition, keyed by:
+- a SHA-256 of the partition bytes
+- FEATURE_VERSION (features.py)
+
+Layout:
+    data/features/BTCUSDT-1m/v2/index.json
+    data/features/BTCUSDT-1m/v2/2026-02-16-<hash>.npz
+
+Only partitions whose hash changed are recomputed. The concatenated
+table is saved as well, so a warm cache makes a rerun nearly free.
+"""
+
+import hashlib
+import json
+import os
+import numpy as np
+
+from candle_cache import open_store
+from candle_store import to_frame
+from features import ENTRY_POINT, FEATURE_VERSION, build_feature_tensor, feature_table
+
+FEATURES_DIR = 'features'
+ARRAYS = ['X', 'y', 'window_start']
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class FeatureCache:
+    """Per-partition feature tensors for one store series"""
+
+    def __init__(self, store=None, root=None):
+        self.store = store or open_store()
+        if root is None:
+            # Next to the store: data/candles -> data/features
+            root = os.path.join(os.path.dirname(os.path.normpath(self.store.root)), FEATURES_DIR)
+        self.path = os.path.join(
+            root, os.path.basename(self.store.path), f"v{FEATURE_VERSION}"
+        )
+        self.index_path = os.path.join(self.path, 'index.json')
+        self.rebuilt = 0
+
+    def _load_index(self):
+        if not os.path.exists(self.index_path):
+            return {}
+        with open(self.index_path) as f:
+            return json.load(f)
+
+    def _save_index(self, index):
+        tmp = f"{self.index_path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(index, f, indent=1)
+        os.replace(tmp, self.index_path)
+
+    def _partition_key(self, day, entry):
+        """Content hash, re-read only when size/mtime moved"""
+        st = os.stat(self.store.partition_path(day))
+        if entry and entry['size'] == st.st_size and entry['mtime'] == st.st_mtime_ns:
+            return entry['hash'], st
+        return file_hash(self.store.partition_path(day))[:16], st
+
+    def _save(self, path, X, y, window_start):
+        tmp = f"{path}.tmp.npz"
+        np.savez(tmp, X=X, y=y, window_start=window_start.astype('datetime64[ns]').view(np.int64))
+        os.replace(tmp, path)
+
+    def _build_partition(self, day, key):
+        X, y, window_start = build_feature_tensor(to_frame(self.store.read_partition(day)))
+        path = os.path.join(self.path, f"{day}-{key}.npz")
+        self._save(path, X, y, window_start)
+        return os.path.basename(path)
+
+    def load(self):
+        """(X, y, window_start) equal to build_feature_tensor over the whole store"""
+        if not self.store.partitions():
+            raise FileNotFoundError(f"No candles in {self.store.path} - run collect_data.py first")
+        os.makedirs(self.path, exist_ok=True)
+        index = self._load_index()
+        fresh = {}
+        self.rebuilt = 0
+
+        for day in self.store.partitions():
+            entry = index.get(day)
+            key, st = self._partition_key(day, entry)
+            if entry and entry['hash'] == key and os.path.exists(os.path.join(self.path, entry['file'])):
+                filename = entry['file']
+            else:
+                filename = self._build_partition(day, key)
+                self.rebuilt += 1
+            fresh[day] = {'hash': key, 'size': st.st_size, 'mtime': st.st_mtime_ns, 'file': filename}
+
+        # Drop entries for rewritten or deleted partitions
+        live = {entry['file'] for entry in fresh.values()}
+        for entry in index.values():
+            if entry['file'] not in live:
+                stale = os.path.join(self.path, entry['file'])
+                if os.path.exists(stale):
+                    os.remove(stale)
+        if fresh != index:
+            self._save_index(fresh)
+
+        # The concatenated table is cached too, keyed by every partition hash
+        combined = hashlib.sha256(
+            json.dumps([[day, fresh[day]['hash']] for day in sorted(fresh)]).encode()
+        ).hexdigest()[:16]
+        table_path = os.path.join(self.path, f"table-{combined}.npz")
+
+        if os.path.exists(table_path):
+            data = np.load(table_path)
+            X, y, window_start = (data[name] for name in ARRAYS)
+        else:
+            parts = [np.load(os.path.join(self.path, fresh[day]['file'])) for day in sorted(fresh)]
+            X, y, window_start = (np.concatenate([p[name] for p in parts]) for name in ARRAYS)
+            for name in os.listdir(self.path):
+                if name.startswith('table-'):
+                    os.remove(os.path.join(self.path, name))
+            self._save(table_path, X, y, window_start.view('datetime64[ns]'))
+
+        return X, y, window_start.view('datetime64[ns]')
+
+
+def load_feature_tensor(symbol='BTCUSDT', interval='1m', verbose=True):
+    """(X, y, window_start) for all entry points through the on-disk cache"""
+    cache = FeatureCache(open_store(symbol, interval))
+    tensor = cache.load()
+    if verbose:
+        total = len(cache.store.partitions())
+        print(f"Features: {total - cache.rebuilt}/{total} partitions from cache, {cache.rebuilt} rebuilt")
+    return tensor
+
+
+def entry_table(tensor, entry_point=ENTRY_POINT):
+    """Feature table (FEATURE_COLUMNS + target) for one entry point of a tensor"""
+    X, y, window_start = tensor
+    return feature_table(X[:, entry_point - 1], y[:, entry_point - 1], window_start)
+
+
+def load_features(symbol='BTCUSDT', interval='1m', entry_point=ENTRY_POINT, verbose=True):
+    """Window feature table for one entry point through the on-disk cache"""
+    return entry_table(load_feature_tensor(symbol, interval, verbose), entry_point)
+
+
+if __name__ == "__main__":
+    X, y, window_start = load_feature_tensor()
+    print(f"{X.shape[0]} windows x {X.shape[1]} entry points x {X.shape[2]} features")
@@ -0,0 +1,140 @@
+"""
+WINDOW FEATURES
+================
+Vectorized feature builder for 5-minute windows.
+
+Shared by train_model.py, backtest.py and paper_trade.py so the model
+always sees features computed by the same code.
+
+Candles are bucketed into wall-clock windows by windowing.WindowIndex,
+gathered into (n_windows, 5) arrays and every feature is computed with
+NumPy in one pass - no per-window DataFrame filtering.
+"""
+
+import numpy as np
+import pandas as pd
+
+from windowing import WindowIndex
+
+ENTRY_POINT = 2
+
+# Minutes into the window a trade can be entered at
+ENTRY_POINTS = (1, 2, 3, 4)
+
+# Bump whenever a feature definition changes - invalidates feature_cache.py
+FEATURE_VERSION = 2
+
+FEATURE_COLUMNS = [
+    'start_price', 'current_price', 'high', 'low', 'volume',
+    'price_change', 'green_candles', 'volatility', 'volume_trend',
+    'return_min1', 'return_min2',
+]
+
+
+def parse_entry_points(text):
+    """'2' -> [2], '1,2,3,4' -> [1, 2, 3, 4]"""
+    points = [int(part) for part in str(text).split(',') if part.strip()]
+    for point in points:
+        if point not in ENTRY_POINTS:
+            raise ValueError(f"Entry point must be one of {ENTRY_POINTS}, got {point}")
+    return points
+
+
+def compute_feature_tensor(o, h, l, c, v):
+    """
+    Features for every entry point in one pass.
+
+    Takes (n, m) arrays of the first m candles of each window and returns
+    an (n, min(m, 4), n_features) array: [:, k-1, :] holds the features
+    seen after k candles. Running values come from cumulative sums and
+    maxima along the window.
+
+    With a single candle there is no minute-2 return and no spread, so
+    return_min2 and volatility are 0 at entry point 1.
+    """
+    k = min(o.shape[1], len(ENTRY_POINTS))
+    o, h, l, c, v = (a[:, :k] for a in (o, h, l, c, v))
+    shape = (len(o), k)
+
+    start_price = np.broadcast_to(o[:, :1], shape)
+    current_price = c
+    first_volume = v[:, :1]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        volume_trend = np.where(first_volume > 0, v / first_volume, 1.0)
+
+    # Prices are ~1e4-1e5 with tiny spreads, so running sum-of-squares
+    # would cancel badly - take the std of each prefix directly
+    volatility = np.zeros(shape)
+    for j in range(2, k + 1):
+        volatility[:, j - 1] = c[:, :j].std(axis=1, ddof=1)
+
+    return_min2 = np.zeros(shape)
+    if k > 1:
+        return_min2[:, 1:] = (c[:, 1] / o[:, 1] - 1)[:, None]
+
+    columns = {
+        'start_price': start_price,
+        'current_price': current_price,
+        'high': np.maximum.accumulate(h, axis=1),
+        'low': np.minimum.accumulate(l, axis=1),
+        'volume': np.cumsum(v, axis=1),
+        'price_change': (current_price - start_price) / start_price,
+        'green_candles': np.cumsum(c > o, axis=1),
+        'volatility': volatility,
+        'volume_trend': volume_trend,
+        'return_min1': np.broadcast_to((c[:, 0] / o[:, 0] - 1)[:, None], shape),
+        'return_min2': return_min2,
+    }
+    return np.stack([columns[col] for col in FEATURE_COLUMNS], axis=2).astype(np.float64)
+
+
+def build_feature_tensor(df_1min):
+    """
+    Features and targets for all entry points from 1-minute candles.
+
+    Returns (X, y, window_start): X is (n_windows, 4, n_features), y is
+    (n_windows, 4) with 1 where the window closes above the entry price.
+    Only complete :00/:05 aligned windows are kept.
+    """
+    index = WindowIndex.from_frame(df_1min)
+    arrays = index.window_arrays(df_1min)
+
+    X = compute_feature_tensor(
+        arrays['open'], arrays['high'], arrays['low'], arrays['close'], arrays['volume']
+    )
+    final_price = arrays['close'][:, -1:]
+    y = (final_price > arrays['close'][:, :len(ENTRY_POINTS)]).astype(np.int64)
+
+    return X, y, index.starts[index.complete]
+
+
+def feature_table(X, y=None, window_start=None):
+    """(n, n_features) matrix -> DataFrame with FEATURE_COLUMNS (+ target)"""
+    df = pd.DataFrame(X, columns=FEATURE_COLUMNS)
+    df['green_candles'] = df['green_candles'].astype(np.int64)
+    if y is not None:
+        df['target'] = y
+    if window_start is not None:
+        df.index = pd.DatetimeIndex(window_start, name='window_start')
+    return df
+
+
+def build_window_features(df_1min, entry_point=ENTRY_POINT):
+    """
+    Build the training/backtest table for one entry point.
+
+    Features use the first `entry_point` candles, target is 1 if the
+    window closes above the entry price. The result is indexed by window
+    open time.
+    """
+    X, y, window_start = build_feature_tensor(df_1min)
+    k = entry_point - 1
+    return feature_table(X[:, k], y[:, k], window_start)
+
+
+def build_live_features(data):
+    """Features for a single live window from a DataFrame of its first candles"""
+    row = [data[col].to_numpy(dtype=np.float64).reshape(1, -1)
+           for col in ['open', 'high', 'low', 'close', 'volume']]
+    return feature_table(compute_feature_tensor(*row)[:, -1])
@@ -0,0 +1,28 @@
+"""
+FEEDS
+======
+Price sources for the Chainlink scripts behind one interface.
+
+    feed.get()      PriceSnapshot (price, timestamp, received_at, latency,
+                    round_id, next_update) or None; errors are counted in
+                    feed.stats, never raised
+    feed.summary()  reads, errors, average / max latency
+
+Sources:
+    BinanceRest     ticker over HTTP, one request per read
+    BinanceStream   last trade from the WebSocket stream
+    ChainlinkRpc    cached latestRoundData (oracle_tracker.py)
+    ReplayFeed      a file recorded with feed.record(path)
+
+Usage:
+    binance, chainlink = open_feeds(args)   # --binance/--chainlink/--rpc/--record
+    oracle_snap, binance_snap = read_feeds(chainlink, binance)   # concurrent if both do I/O
+    format_latency(oracle_snap, binance_snap)
+"""
+
+from .base import FeedError, PriceFeed, PriceSnapshot, format_latency
+from .config import add_feed_arguments, open_feeds
+from .exchange import BinanceRest, BinanceStream
+from .oracle import ChainlinkRpc
+from .replay import ReplayFeed, aligned_shift, load_recording
+from .snapshot import read_feeds
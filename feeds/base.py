@@ -0,0 +1,147 @@
+"""
+FEED BASE
+==========
+PriceSnapshot and the PriceFeed interface every source implements.
+
+A source only implements read(), which returns a PriceSnapshot or raises
+FeedError (or a requests / decoding error). get() wraps it: it times the
+call, counts reads and errors, keeps the last snapshot and appends it to
+the recording if there is one. Callers get a snapshot or None, never an
+exception.
+"""
+
+import json
+import time
+
+import requests
+
+
+class FeedError(Exception):
+    """No usable price from a source (stale, nothing yet, end of a recording)"""
+
+
+class PriceSnapshot:
+    """
+    One price reading:
+        source        feed name
+        price         float
+        timestamp     unix seconds the source produced it (trade time, oracle updatedAt)
+        received_at   unix seconds it arrived here
+        latency       seconds the read took
+        round_id      oracle round (None for exchange prices)
+        next_update   predicted unix time of the next oracle round (or None)
+    """
+    __slots__ = ('source', 'price', 'timestamp', 'received_at', 'latency', 'round_id', 'next_update')
+
+    def __init__(self, source, price, timestamp, received_at=None, latency=0.0,
+                 round_id=None, next_update=None):
+        self.source = source
+        self.price = price
+        self.timestamp = timestamp
+        self.received_at = time.time() if received_at is None else received_at
+        self.latency = latency
+        self.round_id = round_id
+        self.next_update = next_update
+
+    def age(self, now=None):
+        """Seconds since the source produced the price (the oracle delay for Chainlink)"""
+        return (time.time() if now is None else now) - self.timestamp
+
+    def shifted(self, seconds):
+        """Copy with every time moved by `seconds`"""
+        return PriceSnapshot(self.source, self.price, self.timestamp + seconds,
+                             self.received_at + seconds, self.latency, self.round_id,
+                             None if self.next_update is None else self.next_update + seconds)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{name: data.get(name) for name in cls.__slots__})
+
+    def __repr__(self):
+        return (f"PriceSnapshot({self.source} ${self.price:,.2f}, age {self.age():.1f}s, "
+                f"latency {self.latency*1000:.1f}ms)")
+
+
+class PriceFeed:
+    """Common interface: get() -> PriceSnapshot or None, with latency/error counters"""
+    name = None
+    blocking = False   # True if read() does I/O (read_feeds runs those concurrently)
+
+    def __init__(self):
+        self.last = None
+        self.recording = None
+        self.stats = {'reads': 0, 'errors': 0, 'latency_total': 0.0, 'latency_max': 0.0,
+                      'last_error': None}
+
+    def read(self):
+        raise NotImplementedError
+
+    def get(self):
+        started = time.perf_counter()
+        try:
+            snapshot = self.read()
+        except (FeedError, requests.RequestException, ValueError, KeyError) as e:
+            self.stats['errors'] += 1
+            self.stats['last_error'] = f"{type(e).__name__}: {e}"
+            return None
+        latency = time.perf_counter() - started
+
+        snapshot.latency = latency
+        self.stats['reads'] += 1
+        self.stats['latency_total'] += latency
+        self.stats['latency_max'] = max(self.stats['latency_max'], latency)
+        self.last = snapshot
+        if self.recording is not None:
+            # Every read, not just changes: the replay ends where the session did
+            self.recording.write(json.dumps(snapshot.to_dict()) + "\n")
+            self.recording.flush()
+        return snapshot
+
+    def last_price(self, max_age=None):
+        """Price of the last snapshot get() returned, without a read; None if older than max_age"""
+        last = self.last
+        if last is None or (max_age is not None and time.time() - last.received_at > max_age):
+            return None
+        return last.price
+
+    # ---- lifecycle (no-ops unless the source has a connection) ----
+
+    def start(self):
+        return self
+
+    def wait(self, timeout=10):
+        """Block until the source has a price; returns whether it does"""
+        return True
+
+    def prewarm(self):
+        pass
+
+    def stop(self):
+        if self.recording is not None:
+            self.recording.close()
+            self.recording = None
+
+    # ---- recording ----
+
+    def record(self, path):
+        """Append every snapshot get() returns to a JSONL file (replay it with ReplayFeed); returns self"""
+        self.recording = open(path, 'a')
+        return self
+
+    def summary(self):
+        """'binance-stream: 300 reads, 1 errors, latency avg 0.02ms max 0.31ms'"""
+        reads = self.stats['reads']
+        avg = self.stats['latency_total'] / reads if reads else 0.0
+        line = (f"{self.name}: {reads} reads, {self.stats['errors']} errors, "
+                f"latency avg {avg*1000:.2f}ms max {self.stats['latency_max']*1000:.2f}ms")
+        if self.stats['last_error']:
+            line += f" (last error: {self.stats['last_error']})"
+        return line
+
+
+def format_latency(*snapshots):
+    """'chainlink-rpc 312ms, binance-stream 0ms' for the snapshots of one reading"""
+    return ", ".join(f"{s.source} {s.latency*1000:.0f}ms" for s in snapshots)
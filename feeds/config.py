@@ -0,0 +1,61 @@
+"""
+FEED SETUP
+===========
+Command-line selection of the Binance and Chainlink sources, shared by
+the Chainlink scripts:
+    --binance stream | rest | FILE.jsonl
+    --ws-url URL        stream endpoint (e.g. stream_replay.py)
+    --chainlink rpc | FILE.jsonl
+    --record DIR        record both feeds as they are read
+A FILE is replayed (see replay.py); two files share one aligned shift.
+"""
+
+import os
+from datetime import datetime
+
+from oracle_tracker import CHAINLINK_CONTRACT, POLYGON_RPC
+from stream_collector import BINANCE_WS
+
+from .exchange import MAX_PRICE_AGE, BinanceRest, BinanceStream
+from .oracle import ChainlinkRpc
+from .replay import ReplayFeed, aligned_shift
+
+
+def add_feed_arguments(parser):
+    parser.add_argument('--binance', default='stream', help="stream, rest or a recorded .jsonl")
+    parser.add_argument('--ws-url', default=BINANCE_WS, help="Binance WebSocket endpoint")
+    parser.add_argument('--chainlink', default='rpc', help="rpc or a recorded .jsonl")
+    parser.add_argument('--rpc', default=POLYGON_RPC, help="Polygon JSON-RPC endpoint")
+    parser.add_argument('--record', default=None, help="Directory to record both feeds into")
+    return parser
+
+
+def open_feeds(args=None, symbol='BTCUSDT', contract=CHAINLINK_CONTRACT, max_age=MAX_PRICE_AGE):
+    """(binance, chainlink) feeds for parsed add_feed_arguments() args (None: live defaults)"""
+    binance_source = getattr(args, 'binance', 'stream')
+    chainlink_source = getattr(args, 'chainlink', 'rpc')
+    rpc_url = getattr(args, 'rpc', POLYGON_RPC)
+    ws_url = getattr(args, 'ws_url', BINANCE_WS)
+
+    files = [s for s in (binance_source, chainlink_source) if s not in ('stream', 'rest', 'rpc')]
+    shift = aligned_shift(*files) if files else 0.0
+
+    if binance_source == 'stream':
+        binance = BinanceStream(symbol, ws_url=ws_url, max_age=max_age)
+    elif binance_source == 'rest':
+        binance = BinanceRest(symbol)
+    else:
+        binance = ReplayFeed(binance_source, shift)
+
+    if chainlink_source == 'rpc':
+        chainlink = ChainlinkRpc(rpc_url, contract, reference=binance)
+    else:
+        chainlink = ReplayFeed(chainlink_source, shift)
+
+    record_dir = getattr(args, 'record', None)
+    if record_dir:
+        os.makedirs(record_dir, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        binance.record(os.path.join(record_dir, f"binance_{stamp}.jsonl"))
+        chainlink.record(os.path.join(record_dir, f"chainlink_{stamp}.jsonl"))
+    return binance, chainlink
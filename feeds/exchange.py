@@ -0,0 +1,68 @@
+"""
+BINANCE FEEDS
+==============
+BinanceRest    /api/v3/ticker/price over the shared keep-alive client,
+               one request per read
+BinanceStream  last trade from price_stream.PriceStream, no I/O per read;
+               FeedError once the last trade is older than max_age
+"""
+
+import time
+
+from binance import BINANCE_URL
+from price_stream import PriceStream
+from stream_collector import BINANCE_WS
+from transport import client
+
+from .base import FeedError, PriceFeed, PriceSnapshot
+
+MAX_PRICE_AGE = 2.0
+
+
+class BinanceRest(PriceFeed):
+    name = 'binance-rest'
+    blocking = True
+
+    def __init__(self, symbol='BTCUSDT', base_url=BINANCE_URL, timeout=3):
+        super().__init__()
+        self.symbol = symbol
+        self.url = f"{base_url}/api/v3/ticker/price"
+        self.timeout = timeout
+
+    def read(self):
+        data = client.get(self.url, params={"symbol": self.symbol}, timeout=self.timeout).json()
+        now = time.time()
+        # The ticker has no time of its own
+        return PriceSnapshot(self.name, float(data['price']), now, now)
+
+    def prewarm(self):
+        client.prewarm(self.url)
+
+
+class BinanceStream(PriceFeed):
+    name = 'binance-stream'
+
+    def __init__(self, symbol='BTCUSDT', stream='trade', ws_url=BINANCE_WS, max_age=MAX_PRICE_AGE):
+        super().__init__()
+        self.stream = PriceStream(symbol, stream, ws_url)
+        self.max_age = max_age
+
+    def read(self):
+        tick = self.stream.latest()
+        if tick is None:
+            raise FeedError("no trade yet")
+        if time.time() - tick.received_at > self.max_age:
+            raise FeedError(f"no trade in the last {self.max_age:g}s")
+        timestamp = tick.exchange_ms / 1000 if tick.exchange_ms else tick.received_at
+        return PriceSnapshot(self.name, tick.price, timestamp, tick.received_at)
+
+    def start(self):
+        self.stream.start()
+        return self
+
+    def wait(self, timeout=10):
+        return self.stream.wait(timeout)
+
+    def stop(self):
+        self.stream.stop()
+        super().stop()
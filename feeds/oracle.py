@@ -0,0 +1,44 @@
+"""
+CHAINLINK FEED
+===============
+ChainlinkRpc reads the BTC/USD feed through oracle_tracker.OracleTracker:
+the latest round is cached and latestRoundData is only called when an
+update is due. `reference` is the Binance feed whose last price tells
+the tracker when the deviation threshold is close.
+"""
+
+from oracle_tracker import CHAINLINK_CONTRACT, POLYGON_RPC, OracleTracker
+from transport import client
+
+from .base import FeedError, PriceFeed, PriceSnapshot
+
+REFERENCE_MAX_AGE = 10.0
+
+
+class ChainlinkRpc(PriceFeed):
+    name = 'chainlink-rpc'
+    blocking = True   # latestRoundData when an update is due
+
+    def __init__(self, rpc_url=POLYGON_RPC, contract=CHAINLINK_CONTRACT, reference=None):
+        super().__init__()
+        self.rpc_url = rpc_url
+        self.reference = reference
+        self.tracker = OracleTracker(rpc_url, contract, reference=self._reference_price)
+
+    def _reference_price(self):
+        return self.reference.last_price(REFERENCE_MAX_AGE) if self.reference else None
+
+    def read(self):
+        errors = self.tracker.stats['errors']
+        data = self.tracker.get()
+        if data is None:
+            raise FeedError(f"no round yet ({self.tracker.stats['errors']} failed calls)")
+        if self.tracker.stats['errors'] > errors:
+            # The poll failed: still serving the cached round, but count it
+            self.stats['errors'] += 1
+            self.stats['last_error'] = "latestRoundData failed, using the cached round"
+        return PriceSnapshot(self.name, data['price'], data['updated_at'],
+                             round_id=data['round_id'], next_update=data['next_update'])
+
+    def prewarm(self):
+        client.prewarm(self.rpc_url)
@@ -0,0 +1,65 @@
+"""
+REPLAY FEED
+============
+Plays back a file written by PriceFeed.record() in place of a live source.
+
+read() returns the last snapshot recorded at or before the session time,
+clock() - shift. Snapshots come back shifted by the same amount, so ages
+and oracle delays are the recorded ones. aligned_shift() picks a shift in
+whole 5-minute windows, so the replayed prices land at the same point of
+the market window they were recorded at; the replay then starts within
+5 minutes. Feeds replayed together should share one shift.
+"""
+
+import json
+import math
+import time
+
+import numpy as np
+
+from .base import FeedError, PriceFeed, PriceSnapshot
+
+ALIGN_SECONDS = 300   # Market window length
+END_GRACE = 5.0       # Seconds the last snapshot is still served (the slowest script polls every 5s)
+
+
+def load_recording(path):
+    """Snapshots of a recording, sorted by received_at"""
+    with open(path) as f:
+        snapshots = [PriceSnapshot.from_dict(json.loads(line)) for line in f if line.strip()]
+    snapshots.sort(key=lambda s: s.received_at)
+    return snapshots
+
+
+def aligned_shift(*paths, now=None, align=ALIGN_SECONDS):
+    """
+    Smallest shift (a multiple of `align`) that puts the start of the
+    recordings at or after `now`, so nothing is skipped
+    """
+    now = time.time() if now is None else now
+    first = min(load_recording(path)[0].received_at for path in paths)
+    return math.ceil((now - first) / align) * align
+
+
+class ReplayFeed(PriceFeed):
+    name = 'replay'
+
+    def __init__(self, path, shift=0.0, clock=time.time):
+        super().__init__()
+        self.path = path
+        self.shift = shift
+        self.clock = clock
+        self.snapshots = load_recording(path)
+        if not self.snapshots:
+            raise ValueError(f"{path} has no snapshots")
+        self.received = np.array([s.received_at for s in self.snapshots])
+        self.source = self.snapshots[0].source
+
+    def read(self):
+        now = self.clock() - self.shift
+        if now > self.received[-1] + END_GRACE:
+            raise FeedError(f"{self.path} finished")
+        i = int(np.searchsorted(self.received, now, side='right')) - 1
+        if i < 0:
+            raise FeedError(f"{self.path} starts in {self.received[0] - now:.0f}s")
+        return self.snapshots[i].shifted(self.shift)
@@ -0,0 +1,44 @@
+"""
+FEED SNAPSHOTS
+===============
+Concurrent reads of several feeds.
+
+read_feeds(*feeds) returns one get() result per feed, in order. Feeds
+that do I/O on every read (feed.blocking: the REST ticker, the oracle
+RPC) are read at the same time on a persistent thread pool, so a poll
+waits for the slowest call instead of the sum of them. In-memory feeds
+(the trade stream, replays) are read inline once those are back, so
+their price is the freshest; with no blocking feed nothing is submitted
+and the call returns at once.
+
+    oracle_snap, binance_snap = read_feeds(chainlink, binance)
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+_pool = None
+
+
+def _executor():
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='feeds')
+    return _pool
+
+
+def read_feeds(*feeds):
+    """[feed.get() for feed in feeds], with the blocking feeds read concurrently"""
+    results = [None] * len(feeds)
+    blocking = [i for i, feed in enumerate(feeds) if feed.blocking]
+    if len(blocking) > 1:
+        futures = {i: _executor().submit(feeds[i].get) for i in blocking}
+        for i, future in futures.items():
+            results[i] = future.result()
+    elif blocking:
+        results[blocking[0]] = feeds[blocking[0]].get()
+
+    # In-memory feeds last, so their price is the freshest
+    for i, feed in enumerate(feeds):
+        if not feed.blocking:
+            results[i] = feed.get()
+    return results
@@ -0,0 +1,199 @@
+"""
+GAP SCANNER
+============
+Find missing minutes in the candle store and refetch them.
+
+1. One vectorized diff over the cached timestamp column finds every gap
+2. Gaps are packed into as few 1000-candle kline requests as possible
+3. Requests run concurrently (same pool/limiter as backfill.py) and the
+   candles are spliced into their partitions
+
+Minutes Binance itself has no candles for (exchange outages) are
+remembered in the store directory, so re-scanning a repaired store is a
+no-op.
+
+Usage:
+    python3 gaps.py             # report gaps per day
+    python3 gaps.py --repair    # report, then refetch missing minutes
+"""
+
+import argparse
+import json
+import os
+import numpy as np
+import pandas as pd
+
+from backfill import Backfill
+from binance import BINANCE_URL, INTERVAL_MS, MAX_KLINES, RateLimiter
+from candle_cache import CandleCache
+from candle_store import CandleStore, DAY_NS, STORE_DIR
+
+UNFILLABLE_FILE = '.gaps_unfillable.json'
+
+
+def find_gaps(ts_ns, step_ns):
+    """
+    Missing ranges between consecutive timestamps.
+    Returns (starts, ends) in ns: minutes start, start+step, ..., end are missing.
+    """
+    ts_ns = np.asarray(ts_ns, dtype=np.int64)
+    if len(ts_ns) < 2:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    holes = np.flatnonzero(np.diff(ts_ns) > step_ns)
+    return ts_ns[holes] + step_ns, ts_ns[holes + 1] - step_ns
+
+
+def batch_ranges(starts, ends, step_ns, max_candles=MAX_KLINES):
+    """
+    Pack gaps into request ranges [first, last] of at most max_candles
+    candles each. Neighbouring gaps share a request; already stored
+    candles inside a range are skipped by the store on write.
+    """
+    span = step_ns * max_candles
+    batches = []
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        if batches and end - batches[-1][0] < span:
+            batches[-1][1] = end
+            continue
+        # Long outages need several pages
+        while end - start >= span:
+            batches.append([start, start + span - step_ns])
+            start += span
+        batches.append([start, end])
+    return [(a, b) for a, b in batches]
+
+
+def gaps_within(starts, ends, outer_starts, outer_ends):
+    """(starts, ends) of the gaps that lie entirely inside one of the outer (non-overlapping) gaps"""
+    order = np.argsort(outer_starts)
+    outer_starts, outer_ends = np.asarray(outer_starts)[order], np.asarray(outer_ends)[order]
+    at = np.searchsorted(outer_starts, starts, side='right') - 1
+    inside = (at >= 0) & (ends <= outer_ends[np.maximum(at, 0)])
+    return starts[inside], ends[inside]
+
+
+def gap_stats(ts_ns, starts, ends, step_ns):
+    """Per-day candles, missing minutes, gap count and longest gap"""
+    days, counts = np.unique(ts_ns // DAY_NS, return_counts=True)
+    candles = pd.Series(counts, index=days)
+
+    # Gaps can span midnight - count missing minutes on each day they touch
+    missing = {}
+    gaps = {}
+    longest = {}
+    for start, end in zip(starts.tolist(), ends.tolist()):
+        gap_len = (end - start) // step_ns + 1
+        for day in range(start // DAY_NS, end // DAY_NS + 1):
+            lo = max(start, day * DAY_NS)
+            hi = min(end, (day + 1) * DAY_NS - step_ns)
+            missing[day] = missing.get(day, 0) + (hi - lo) // step_ns + 1
+            gaps[day] = gaps.get(day, 0) + 1
+            longest[day] = max(longest.get(day, 0), gap_len)
+
+    index = sorted(set(candles.index) | set(missing))
+    stats = pd.DataFrame({
+        'candles': candles.reindex(index, fill_value=0),
+        'missing': pd.Series(missing).reindex(index, fill_value=0),
+        'gaps': pd.Series(gaps).reindex(index, fill_value=0),
+        'longest': pd.Series(longest).reindex(index, fill_value=0),
+    })
+    stats.index = [str(np.datetime64(int(d), 'D')) for d in index]
+    stats.index.name = 'day'
+    return stats
+
+
+class GapScanner:
+    """Scan one store series for gaps and repair them"""
+
+    def __init__(self, store=None, base_url=BINANCE_URL, workers=4, limiter=None):
+        self.store = store or CandleStore()
+        self.step_ns = INTERVAL_MS[self.store.interval] * 10**6
+        self.backfill = Backfill(
+            self.store.symbol, self.store.interval, workers, base_url,
+            limiter=limiter or RateLimiter(), store=self.store
+        )
+        self.unfillable_path = os.path.join(self.store.path, UNFILLABLE_FILE)
+
+    def load_unfillable(self):
+        if not os.path.exists(self.unfillable_path):
+            return set()
+        with open(self.unfillable_path) as f:
+            return {tuple(gap) for gap in json.load(f)}
+
+    def save_unfillable(self, gaps):
+        tmp = f"{self.unfillable_path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump(sorted(gaps), f)
+        os.replace(tmp, self.unfillable_path)
+
+    def scan(self, include_known=False):
+        """Timestamps plus (starts, ends) of gaps not known to be unfillable"""
+        ts = np.asarray(CandleCache(self.store).load().columns['timestamp'])
+        starts, ends = find_gaps(ts, self.step_ns)
+
+        if not include_known and len(starts):
+            known = self.load_unfillable()
+            if known:
+                keep = np.array([(s, e) not in known
+                                 for s, e in zip(starts.tolist(), ends.tolist())])
+                starts, ends = starts[keep], ends[keep]
+        return ts, starts, ends
+
+    def repair(self, starts, ends):
+        """Refetch the given gaps, return (new candles, gaps still missing)"""
+        if len(starts) == 0:
+            return 0, 0
+
+        step_ms = self.step_ns // 10**6
+        pages = [(a // 10**6, b // 10**6 + step_ms - 1)
+                 for a, b in batch_ranges(starts, ends, self.step_ns)]
+        print(f"Refetching {len(starts)} gaps in {len(pages)} requests...")
+
+        added = 0
+        for page, frame in self.backfill.fetch_pages(pages):
+            added += self.store.write(frame)
+
+        # Whatever is still missing, Binance does not have. A partly filled
+        # gap leaves smaller gaps with new bounds, so keep every remaining
+        # gap that lies inside a requested one
+        _, after_starts, after_ends = self.scan(include_known=True)
+        still_starts, still_ends = gaps_within(after_starts, after_ends, starts, ends)
+        still = set(zip(still_starts.tolist(), still_ends.tolist()))
+        if still:
+            self.save_unfillable(self.load_unfillable() | still)
+        return added, len(still)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find and repair gaps in the candle store")
+    parser.add_argument('--repair', action='store_true')
+    parser.add_argument('--symbol', default='BTCUSDT')
+    parser.add_argument('--interval', default='1m')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--base-url', default=BINANCE_URL)
+    parser.add_argument('--store-dir', default=STORE_DIR)
+    args = parser.parse_args()
+
+    scanner = GapScanner(
+        CandleStore(args.symbol, args.interval, args.store_dir),
+        base_url=args.base_url, workers=args.workers
+    )
+    ts, starts, ends = scanner.scan()
+
+    print("="*60)
+    print(f"GAP SCAN {args.symbol} {args.interval}")
+    print("="*60)
+
+    if len(ts) == 0:
+        print("No candles in store")
+    else:
+        stats = gap_stats(ts, starts, ends, scanner.step_ns)
+        print(stats[stats['missing'] > 0].to_string() if len(starts) else "No gaps")
+        print(f"\nTotal: {len(ts)} candles, {len(starts)} gaps, "
+              f"{int(stats['missing'].sum())} missing")
+
+        if args.repair and len(starts):
+            added, unfillable = scanner.repair(starts, ends)
+            print(f"\n✅ Spliced in {added} candles")
+            if unfillable:
+                print(f"⚠️ {unfillable} gaps not available from Binance (won't be retried)")
@@ -0,0 +1,210 @@
+"""
+INFERENCE
+==========
+Low-latency single-window prediction from a saved model.
+
+Predictor does per call what paper_trade.predict used to do through
+pandas and sklearn:
+- features computed with plain floats straight into a preallocated row
+- the scaler applied in place on that row ((x - mean) / scale)
+- one predict_proba; direction and confidence both come from it
+- forests / boosting walked through flat arrays (tree_ensemble.py)
+  instead of one sklearn call per tree
+
+Results are identical to the pandas path. Strategies get their
+Predictor from model_registry.py, which memory-maps the flat trees.
+
+Usage:
+    python3 inference.py --bench
+    python3 inference.py --bench --version latest
+    python3 inference.py --bench --model models/model_ep3.pkl --calls 20000
+"""
+
+import argparse
+import math
+import pickle
+import time
+
+import numpy as np
+
+from features import ENTRY_POINTS, FEATURE_COLUMNS
+from tree_ensemble import TreeEnsemble, scaler_arrays, supports
+
+MODEL_PATH = 'models/model.pkl'
+
+
+def window_features(o, h, l, c, v):
+    """
+    FEATURE_COLUMNS values of one window from its first candles, as floats.
+    Same values as features.compute_feature_tensor.
+    """
+    k = min(len(c), len(ENTRY_POINTS))
+    start, current = o[0], c[k - 1]
+
+    volatility = 0.0
+    if k > 1:
+        mean = sum(c[:k]) / k
+        volatility = math.sqrt(sum((x - mean) * (x - mean) for x in c[:k]) / (k - 1))
+
+    volume = 0.0
+    for x in v[:k]:
+        volume += x
+
+    return (
+        start,
+        current,
+        max(h[:k]),
+        min(l[:k]),
+        volume,
+        (current - start) / start,
+        float(sum(1 for i in range(k) if c[i] > o[i])),
+        volatility,
+        v[k - 1] / v[0] if v[0] > 0 else 1.0,
+        c[0] / o[0] - 1,
+        c[1] / o[1] - 1 if k > 1 else 0.0,
+    )
+
+
+class Predictor:
+    """Direction and confidence for one live window"""
+
+    def __init__(self, proba, classes, feature_columns, mean, scale, entry_point=2):
+        self.proba = proba
+        self.classes = np.asarray(classes)
+        self.entry_point = entry_point
+        self.feature_columns = list(feature_columns)
+
+        # Model column j <- FEATURE_COLUMNS[source[j]], missing columns stay 0
+        self.source = [FEATURE_COLUMNS.index(col) if col in FEATURE_COLUMNS else -1
+                       for col in self.feature_columns]
+
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.row = np.zeros((1, len(self.feature_columns)))
+
+    @classmethod
+    def from_model_data(cls, model_data):
+        """From a train_model.py model dict"""
+        model = model_data['model']
+        if supports(model):
+            proba = TreeEnsemble.from_model(model).predict_proba
+        else:
+            proba = model.predict_proba
+        columns = model_data['feature_columns']
+        mean, scale = scaler_arrays(model_data['scaler'], len(columns))
+        return cls(proba, model.classes_, columns, mean, scale, model_data.get('entry_point', 2))
+
+    @classmethod
+    def load(cls, path=MODEL_PATH):
+        with open(path, 'rb') as f:
+            return cls.from_model_data(pickle.load(f))
+
+    def predict_arrays(self, o, h, l, c, v):
+        """
+        (direction 1/0, confidence) from sequences of the window's first
+        candles; only the last entry_point of them are used
+        """
+        k = self.entry_point
+        values = window_features(o[-k:], h[-k:], l[-k:], c[-k:], v[-k:])
+        row = self.row[0]
+        for j, i in enumerate(self.source):
+            row[j] = values[i] if i >= 0 else 0.0
+        np.subtract(self.row, self.mean, out=self.row)
+        np.divide(self.row, self.scale, out=self.row)
+
+        prob = self.proba(self.row)[0]
+        best = int(prob.argmax())
+        return int(self.classes[best]), float(prob[best])
+
+    def predict(self, data):
+        """paper_trade result dict from a DataFrame of the window's first candles"""
+        columns = [data[col].tolist() for col in ('open', 'high', 'low', 'close', 'volume')]
+        direction, confidence = self.predict_arrays(*columns)
+        return {
+            'prediction': 'UP' if direction == 1 else 'DOWN',
+            'confidence': confidence,
+            'btc_price': columns[3][-1],
+        }
+
+
+def _percentiles(fn, args, calls):
+    timings = np.empty(calls)
+    for i in range(calls):
+        started = time.perf_counter()
+        fn(*args)
+        timings[i] = time.perf_counter() - started
+    return np.percentile(timings, [50, 99]) * 1e6
+
+
+def benchmark(path=MODEL_PATH, calls=5000, seed=42, registry_version=None):
+    """
+    p50/p99 latency of the old pandas path vs Predictor, on random windows.
+    With registry_version (the same model registered), times loading it too.
+    """
+    import pandas as pd
+    from features import build_live_features
+
+    started = time.perf_counter()
+    with open(path, 'rb') as f:
+        model_data = pickle.load(f)
+    predictor = Predictor.from_model_data(model_data)
+    startup = {'pickle': time.perf_counter() - started}
+    model, scaler = model_data['model'], model_data['scaler']
+    if hasattr(model, 'n_jobs'):
+        model.set_params(n_jobs=1)
+
+    rng = np.random.default_rng(seed)
+    k = predictor.entry_point
+    c = 68000 * np.cumprod(1 + rng.normal(0, 0.0005, k))
+    o = np.r_[68000, c[:-1]]
+    data = pd.DataFrame({
+        'open': o, 'high': np.maximum(o, c) + 5, 'low': np.minimum(o, c) - 5,
+        'close': c, 'volume': rng.uniform(1, 50, k),
+    })
+
+    def pandas_path(data):
+        X = build_live_features(data)
+        for col in predictor.feature_columns:
+            if col not in X.columns:
+                X[col] = 0
+        X_scaled = scaler.transform(X[predictor.feature_columns])
+        pred = model.predict(X_scaled)[0]
+        prob = model.predict_proba(X_scaled)[0]
+        return pred, prob[pred]
+
+    expected = pandas_path(data)
+    got = predictor.predict_arrays(*(data[col].tolist() for col in data.columns))
+    assert got == (expected[0], expected[1]), f"Mismatch: {got} != {expected}"
+
+    columns = [data[col].tolist() for col in data.columns]
+    if registry_version:
+        from model_registry import ModelRegistry
+
+        started = time.perf_counter()
+        registered = ModelRegistry().load_predictor(registry_version)
+        startup[f"registry {registry_version}"] = time.perf_counter() - started
+        assert registered.predict_arrays(*columns) == got, "Registry model disagrees"
+        predictor = registered
+
+    slow = _percentiles(pandas_path, (data,), max(calls // 20, 50))
+    fast = _percentiles(predictor.predict_arrays, columns, calls)
+    return type(model).__name__, slow, fast, startup
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Single-window inference micro-benchmark")
+    parser.add_argument('--bench', action='store_true')
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--calls', type=int, default=5000)
+    parser.add_argument('--version', default=None, help="Registry version of the same model, e.g. latest")
+    args = parser.parse_args()
+
+    if args.bench:
+        name, slow, fast, startup = benchmark(args.model, args.calls, registry_version=args.version)
+        print(f"{name} ({args.model})")
+        print(f"  pandas + sklearn:  p50 {slow[0]:9.1f} us   p99 {slow[1]:9.1f} us")
+        print(f"  Predictor:         p50 {fast[0]:9.1f} us   p99 {fast[1]:9.1f} us")
+        for source, seconds in startup.items():
+            print(f"  Load ({source}): {seconds*1000:8.1f} ms")
+    else:
+        parser.print_help()
@@ -0,0 +1,271 @@
+"""
+MODEL REGISTRY
+===============
+Versioned model artifacts with a manifest and a checksummed payload.
+
+Layout:
+    models/registry/LATEST                  -> "0003"
+    models/registry/0003/manifest.json
+    models/registry/0003/trees/*.npy        flat tree arrays (tree_ensemble.py)
+    models/registry/0003/estimator.pkl      sklearn model + scaler
+
+manifest.json records:
+- feature spec: columns, FEATURE_VERSION, entry point, scaler mean/scale
+- data range: symbol, interval, first and last training window
+- metrics, model type and parameters, parent version
+- sha256 of every payload file, and a content hash over all of them
+
+Opening a version reads only the manifest. The payload is checksummed
+and loaded on first use: predictors memory-map trees/ and never import
+sklearn; estimator.pkl is only unpickled for retraining (or for models
+that can't be flattened). Versions are built in a temp directory and
+renamed into place, then LATEST is swapped.
+
+Usage:
+    python3 model_registry.py                          # list versions
+    python3 model_registry.py --verify 0003
+    python3 model_registry.py --import models/model.pkl
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import shutil
+from datetime import datetime, timezone
+
+import numpy as np
+
+from features import FEATURE_VERSION
+from feature_cache import file_hash
+from inference import MODEL_PATH, Predictor
+from tree_ensemble import TreeEnsemble, compile_model, scaler_arrays, supports
+
+REGISTRY_DIR = 'models/registry'
+LATEST = 'latest'
+
+
+class ChecksumError(Exception):
+    pass
+
+
+def _json_safe(value):
+    if isinstance(value, (np.integer, np.floating)):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(v) for v in value]
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+class RegisteredModel:
+    """One registry version; payload files are verified and loaded on first use"""
+
+    def __init__(self, path):
+        self.path = path
+        self.version = os.path.basename(os.path.normpath(path))
+        with open(os.path.join(path, 'manifest.json')) as f:
+            self.manifest = json.load(f)
+        self._verified = set()
+        self._predictor = None
+        self._model_data = None
+
+    def verify(self, files=None):
+        """Check sha256 of payload files (default: all of them)"""
+        expected = self.manifest['payload']
+        for name in files or expected:
+            if name in self._verified:
+                continue
+            if file_hash(os.path.join(self.path, name)) != expected[name]:
+                raise ChecksumError(f"{self.version}/{name} does not match its manifest checksum")
+            self._verified.add(name)
+
+    @property
+    def feature_spec(self):
+        return self.manifest['features']
+
+    def predictor(self):
+        """inference.Predictor from the flat trees (or the estimator if there are none)"""
+        if self._predictor is None:
+            spec = self.feature_spec
+            if spec['feature_version'] != FEATURE_VERSION:
+                raise ValueError(f"Model {self.version} was built for feature version "
+                                 f"{spec['feature_version']}, features.py is at {FEATURE_VERSION}")
+            trees = [name for name in self.manifest['payload'] if name.startswith('trees/')]
+            if trees:
+                self.verify(trees)
+                ensemble = TreeEnsemble.load(os.path.join(self.path, 'trees'))
+                self._predictor = Predictor(
+                    ensemble.predict_proba, ensemble.classes, spec['columns'],
+                    spec['scaler_mean'], spec['scaler_scale'], spec['entry_point']
+                )
+            else:
+                self._predictor = Predictor.from_model_data(self.model_data())
+        return self._predictor
+
+    def model_data(self):
+        """train_model.py-style dict with the sklearn estimator"""
+        if self._model_data is None:
+            self.verify(['estimator.pkl'])
+            with open(os.path.join(self.path, 'estimator.pkl'), 'rb') as f:
+                self._model_data = pickle.load(f)
+        return self._model_data
+
+
+class ModelRegistry:
+    """Publish and resolve model versions under models/registry"""
+
+    def __init__(self, root=REGISTRY_DIR):
+        self.root = root
+        self.latest_path = os.path.join(root, 'LATEST')
+
+    def versions(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root) if name.isdigit())
+
+    def latest(self):
+        if not os.path.exists(self.latest_path):
+            return None
+        with open(self.latest_path) as f:
+            return f.read().strip() or None
+
+    def resolve(self, version=LATEST):
+        """'latest' / None -> LATEST, '3' -> '0003'"""
+        if version in (None, LATEST):
+            version = self.latest()
+            if version is None:
+                raise FileNotFoundError(f"No models in {self.root} - run train_model.py first")
+            return version
+        version = f"{int(version):04d}"
+        if version not in self.versions():
+            raise FileNotFoundError(f"No model version {version} in {self.root}")
+        return version
+
+    def open(self, version=LATEST):
+        return RegisteredModel(os.path.join(self.root, self.resolve(version)))
+
+    def load_predictor(self, version=LATEST):
+        return self.open(version).predictor()
+
+    def publish(self, model_data, X_check=None, metrics=None, data_range=None, parent=None):
+        """
+        Register a train_model.py model dict as a new version and make it LATEST.
+
+        Tree models are also stored as flat arrays; X_check (raw feature
+        rows) is required for those, to prove exact agreement with sklearn.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        version = f"{int(max(self.versions(), default='0')) + 1:04d}"
+        tmp = os.path.join(self.root, f".{version}.tmp")
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+
+        model = model_data['model']
+        files = []
+        if supports(model):
+            if X_check is None:
+                raise ValueError("X_check is required to register a tree model")
+            ensemble = compile_model(model_data, X_check)
+            files += [f"trees/{name}" for name in ensemble.save(os.path.join(tmp, 'trees'))]
+
+        with open(os.path.join(tmp, 'estimator.pkl'), 'wb') as f:
+            pickle.dump(model_data, f)
+        files.append('estimator.pkl')
+
+        payload = {name: file_hash(os.path.join(tmp, name)) for name in files}
+        columns = list(model_data['feature_columns'])
+        mean, scale = scaler_arrays(model_data['scaler'], len(columns))
+        manifest = {
+            'version': version,
+            'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'parent': parent,
+            'model': {
+                'type': type(model).__name__,
+                'params': {k: _json_safe(v) for k, v in model.get_params().items()},
+            },
+            'features': {
+                'columns': columns,
+                'feature_version': FEATURE_VERSION,
+                'entry_point': model_data.get('entry_point', 2),
+                'scaler_mean': mean.tolist(),
+                'scaler_scale': scale.tolist(),
+            },
+            'data': {k: _json_safe(v) for k, v in (data_range or {}).items()},
+            'metrics': {k: _json_safe(v) for k, v in (metrics or {}).items()},
+            'payload': payload,
+            'content_hash': hashlib.sha256(
+                json.dumps(sorted(payload.items())).encode()
+            ).hexdigest(),
+        }
+        with open(os.path.join(tmp, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp, os.path.join(self.root, version))
+
+        with open(f"{self.latest_path}.tmp", 'w') as f:
+            f.write(version)
+        os.replace(f"{self.latest_path}.tmp", self.latest_path)
+        return version
+
+
+def open_predictor(version=LATEST, registry=None, pickle_path=MODEL_PATH):
+    """
+    (predictor, description) for a registry version. Only registered,
+    checksummed models are loaded: a bare pickle (e.g. from an older
+    train_model.py) has to be imported first, it is never unpickled here.
+    """
+    registry = registry or ModelRegistry()
+    try:
+        model = registry.open(version)
+    except FileNotFoundError as e:
+        if version in (None, LATEST) and os.path.exists(pickle_path):
+            raise FileNotFoundError(f"{e}. {pickle_path} is not in the registry - check and "
+                                    f"register it with: python3 model_registry.py --import "
+                                    f"{pickle_path}") from None
+        raise
+    return model.predictor(), f"{model.version} ({model.manifest['model']['type']})"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Model registry")
+    parser.add_argument('--verify', metavar='VERSION', help="Check payload checksums")
+    parser.add_argument('--import', dest='import_path', metavar='PICKLE',
+                        help="Register a train_model.py pickle")
+    args = parser.parse_args()
+    registry = ModelRegistry()
+
+    if args.import_path:
+        import pandas as pd
+        from feature_cache import load_feature_tensor
+
+        with open(args.import_path, 'rb') as f:
+            model_data = pickle.load(f)
+
+        # Check on the same last 20% of windows train_model.py tests on
+        X, _, window_start = load_feature_tensor()
+        X = X[:, model_data.get('entry_point', 2) - 1]
+        X_check = pd.DataFrame(X[int(len(X) * 0.8):], columns=model_data['feature_columns'])
+        version = registry.publish(
+            model_data, X_check,
+            metrics={'accuracy': model_data.get('accuracy')},
+            data_range={'trained_through': model_data.get('trained_through')},
+        )
+        print(f"✅ Registered {args.import_path} as {version}")
+
+    elif args.verify:
+        model = registry.open(args.verify)
+        model.verify()
+        print(f"✅ {model.version}: {len(model.manifest['payload'])} files match")
+
+    else:
+        latest = registry.latest()
+        for version in registry.versions():
+            manifest = RegisteredModel(os.path.join(registry.root, version)).manifest
+            accuracy = manifest['metrics'].get('accuracy')
+            print(f"{'*' if version == latest else ' '} {version}  {manifest['created']}  "
+                  f"{manifest['model']['type']:<28} "
+                  f"entry {manifest['features']['entry_point']}  "
+                  f"acc {accuracy*100 if accuracy is not None else float('nan'):.2f}%  "
+                  f"through {manifest['data'].get('trained_through', '-')}")
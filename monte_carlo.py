@@ -0,0 +1,132 @@
+"""
+MONTE CARLO
+============
+Block bootstrap of backtest trade sequences.
+
+One backtest is one ordering of one sample of trades. This resamples
+the per-trade returns (profit / bet) in blocks of consecutive trades,
+which keeps short streaks, and compounds each resampled sequence
+with backtest_engine's rules:
+- bankroll *= 1 + position_size * r
+- once the bankroll is below min_bankroll the path stops trading (ruin)
+
+Paths are built as 2-D arrays (paths x trades) chunk by chunk, so memory
+stays bounded whatever the number of paths.
+
+Usage:
+    python3 backtest.py && python3 monte_carlo.py
+    python3 monte_carlo.py --paths 100000 --block 10 --position 0.05
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from backtest_engine import BANKROLL, MIN_BANKROLL, POSITION_SIZE
+
+QUANTILES = [0.01, 0.05, 0.25, 0.50, 0.75, 0.95, 0.99]
+CHUNK_BYTES = 256 << 20
+
+
+def trade_returns(trades):
+    """Return per unit bet of each trade, from data/backtest.csv or run_backtest output"""
+    return np.asarray(trades['profit'], dtype=np.float64) / np.asarray(trades['bet'], dtype=np.float64)
+
+
+def block_indices(rng, n_paths, n_trades, block):
+    """(n_paths, n_trades) trade indices of circular moving blocks"""
+    n_blocks = -(-n_trades // block)
+    starts = rng.integers(0, n_trades, (n_paths, n_blocks, 1))
+    return ((starts + np.arange(block)) % n_trades).reshape(n_paths, -1)[:, :n_trades]
+
+
+def simulate_chunk(returns, idx, bankroll, position_size, min_bankroll):
+    """(final bankroll, max drawdown, ruined) per path for one chunk of index rows"""
+    path = np.take(1.0 + position_size * returns, idx)
+    np.cumprod(path, axis=1, out=path)
+    path *= bankroll
+
+    # Freeze each path at its first value below min_bankroll
+    below = path < min_bankroll
+    ruined = below.any(axis=1)
+    if ruined.any():
+        first = below.argmax(axis=1)
+        stopped = np.logical_or.accumulate(below, axis=1)
+        frozen = path[np.arange(len(path)), first][:, None]
+        np.copyto(path, np.broadcast_to(frozen, path.shape), where=stopped)
+
+    peak = np.maximum.accumulate(path, axis=1)
+    np.maximum(peak, bankroll, out=peak)
+    drawdown = np.max(1.0 - path / peak, axis=1)
+    return path[:, -1].copy(), drawdown, ruined
+
+
+def bootstrap(returns, n_paths=10000, block=5, bankroll=BANKROLL, position_size=POSITION_SIZE,
+              min_bankroll=MIN_BANKROLL, seed=42, chunk_bytes=CHUNK_BYTES):
+    """Final bankroll, max drawdown and ruin flag of n_paths resampled sequences"""
+    returns = np.asarray(returns, dtype=np.float64)
+    n = len(returns)
+    if n == 0:
+        raise ValueError("No trades to resample")
+    block = max(1, min(block, n))
+
+    rng = np.random.default_rng(seed)
+    final = np.empty(n_paths)
+    drawdown = np.empty(n_paths)
+    ruined = np.empty(n_paths, dtype=bool)
+
+    # index + path + mask arrays per row, roughly
+    chunk = max(1, chunk_bytes // (n * 24))
+    for start in range(0, n_paths, chunk):
+        stop = min(start + chunk, n_paths)
+        idx = block_indices(rng, stop - start, n, block)
+        final[start:stop], drawdown[start:stop], ruined[start:stop] = simulate_chunk(
+            returns, idx, bankroll, position_size, min_bankroll
+        )
+    return {'final': final, 'max_drawdown': drawdown, 'ruined': ruined}
+
+
+def summarize(result, bankroll=BANKROLL):
+    """Quantile table of final bankroll and max drawdown, plus ruin / loss probabilities"""
+    table = pd.DataFrame({
+        'final_bankroll': np.quantile(result['final'], QUANTILES),
+        'max_drawdown_pct': np.quantile(result['max_drawdown'], QUANTILES) * 100,
+    }, index=[f"p{q*100:g}" for q in QUANTILES])
+    probabilities = {
+        'ruin': float(result['ruined'].mean()),
+        'loss': float((result['final'] < bankroll).mean()),
+        'halved': float((result['final'] < bankroll / 2).mean()),
+    }
+    return table, probabilities
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Block bootstrap of backtest trades")
+    parser.add_argument('--trades', default='data/backtest.csv')
+    parser.add_argument('--paths', type=int, default=10000)
+    parser.add_argument('--block', type=int, default=5, help="Consecutive trades per block")
+    parser.add_argument('--position', type=float, default=POSITION_SIZE)
+    parser.add_argument('--bankroll', type=float, default=BANKROLL)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    returns = trade_returns(pd.read_csv(args.trades))
+
+    print("="*60)
+    print("MONTE CARLO - BLOCK BOOTSTRAP")
+    print("="*60)
+    print(f"{len(returns)} trades from {args.trades} | {args.paths} paths | "
+          f"blocks of {args.block} | {args.position*100:.0f}% per trade\n")
+
+    started = time.time()
+    result = bootstrap(returns, args.paths, args.block, args.bankroll, args.position,
+                       seed=args.seed)
+    table, probabilities = summarize(result, args.bankroll)
+
+    print(table.to_string(float_format=lambda x: f"{x:10.2f}"))
+    print(f"\nRuin (bankroll < ${MIN_BANKROLL:.2f}): {probabilities['ruin']*100:.2f}%")
+    print(f"Ending below ${args.bankroll:.2f}: {probabilities['loss']*100:.2f}%")
+    print(f"Ending below half: {probabilities['halved']*100:.2f}%")
+    print(f"\n({time.time() - started:.1f}s)")
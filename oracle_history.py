@@ -0,0 +1,222 @@
+"""
+ORACLE HISTORY
+===============
+Past Chainlink rounds in a local, indexed table.
+
+Walks getRoundData backwards from latestRoundData. Calls are sent as
+JSON-RPC batches (hundreds of eth_calls per HTTP round trip) and the
+returned ABI words are decoded for the whole batch at once with numpy
+instead of slicing hex strings per call.
+
+Round ids on the proxy are (phaseId << 64) | aggregatorRoundId. Only the
+current phase is walked; its rounds are numbered 1..latest with no gaps.
+
+The table is one .npy file per column, sorted by round:
+    data/oracle/<contract>/phase.npy        (int64)
+    data/oracle/<contract>/round.npy        (int64, aggregator round id)
+    data/oracle/<contract>/answer.npy       (float64, price)
+    data/oracle/<contract>/started_at.npy   (int64, unix seconds)
+    data/oracle/<contract>/updated_at.npy   (int64, unix seconds)
+    data/oracle/<contract>/manifest.json
+Reruns only fetch rounds that are not in the table yet.
+
+Usage:
+    python3 oracle_history.py --rounds 20000
+    python3 oracle_history.py --rpc http://127.0.0.1:8545 --rounds 5000 --csv data/rounds.csv
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from oracle_tracker import CHAINLINK_CONTRACT, DECIMALS, POLYGON_RPC, latest_round
+from transport import client
+
+GET_ROUND_DATA = "0x9a6fc8f5"
+BATCH_SIZE = 500
+ORACLE_DIR = 'data/oracle'
+COLUMNS = ['phase', 'round', 'answer', 'started_at', 'updated_at']
+PHASE_SHIFT = 64
+
+
+def split_round_id(round_id):
+    """(phaseId, aggregatorRoundId)"""
+    return round_id >> PHASE_SHIFT, round_id & ((1 << PHASE_SHIFT) - 1)
+
+
+def decode_rounds(results, decimals=DECIMALS):
+    """
+    getRoundData / latestRoundData return data (hex strings) -> dict of
+    column arrays. All five words are decoded for every row in one pass;
+    rows whose answer does not fit in int64 are dropped
+    """
+    if not results:
+        return {col: np.array([], np.float64 if col == 'answer' else np.int64) for col in COLUMNS}
+    words = np.frombuffer(bytes.fromhex(''.join(raw[2:2 + 320] for raw in results)), np.uint8)
+    words = words.reshape(len(results), 5, 32)
+
+    low = words[:, :, 24:].copy().view('>u8')[:, :, 0]    # low 64 bits of each word
+    high = words[:, 1, :24]
+    # answer is int256: the high bytes must be the sign extension of the low 64 bits
+    negative = words[:, 1, 24] >= 0x80
+    valid = np.where(negative, (high == 0xff).all(axis=1), (high == 0).all(axis=1))
+
+    answer = low[:, 1].astype(np.int64)   # two's complement reinterpretation
+    phase = words[:, 0, 16:24].copy().view('>u8')[:, 0]
+    return {
+        'phase': phase[valid].astype(np.int64),
+        'round': low[valid, 0].astype(np.int64),
+        'answer': answer[valid] / 10**decimals,
+        'started_at': low[valid, 2].astype(np.int64),
+        'updated_at': low[valid, 3].astype(np.int64),
+    }
+
+
+def fetch_rounds(round_ids, rpc_url=POLYGON_RPC, contract=CHAINLINK_CONTRACT,
+                 batch_size=BATCH_SIZE, timeout=30, verbose=True):
+    """getRoundData for every round id, BATCH_SIZE calls per request; missing rounds are skipped"""
+    results = []
+    failed = 0
+    for start in range(0, len(round_ids), batch_size):
+        batch = round_ids[start:start + batch_size]
+        payload = [{
+            "jsonrpc": "2.0",
+            "method": "eth_call",
+            "params": [{"to": contract, "data": f"{GET_ROUND_DATA}{round_id:064x}"}, "latest"],
+            "id": i
+        } for i, round_id in enumerate(batch)]
+
+        response = client.post(rpc_url, json=payload, timeout=timeout).json()
+        if isinstance(response, dict):
+            # Whole batch rejected (e.g. over the provider's batch limit)
+            raise RuntimeError(f"RPC error: {response.get('error', response)}")
+        for item in sorted(response, key=lambda r: r.get('id', 0)):
+            raw = item.get('result')
+            if raw and len(raw) >= 2 + 64 * 5:
+                results.append(raw)
+            else:
+                failed += 1   # reverted: no data for this round
+
+        if verbose:
+            print(f"  {min(start + batch_size, len(round_ids))}/{len(round_ids)} rounds "
+                  f"({failed} missing)")
+    return decode_rounds(results)
+
+
+class RoundTable:
+    """Columnar table of one feed's rounds, sorted by (phase, round)"""
+
+    def __init__(self, contract=CHAINLINK_CONTRACT, root=ORACLE_DIR):
+        self.path = os.path.join(root, contract.lower())
+        self.manifest_path = os.path.join(self.path, 'manifest.json')
+        self.columns = {col: np.array([], np.float64 if col == 'answer' else np.int64)
+                        for col in COLUMNS}
+        if os.path.exists(self.manifest_path):
+            self.columns = {col: np.load(os.path.join(self.path, f"{col}.npy")) for col in COLUMNS}
+
+    def __len__(self):
+        return len(self.columns['round'])
+
+    def rounds(self, phase):
+        """Aggregator round ids already stored for a phase"""
+        return self.columns['round'][self.columns['phase'] == phase]
+
+    def add(self, rows):
+        """Merge new rows in; the newest copy of a round wins. Returns rows added"""
+        before = len(self)
+        merged = {col: np.concatenate([self.columns[col], rows[col]]) for col in COLUMNS}
+        order = np.lexsort((np.arange(len(merged['round'])), merged['round'], merged['phase']))
+        phase, rnd = merged['phase'][order], merged['round'][order]
+        # Last row of every (phase, round) run
+        last = np.r_[(phase[1:] != phase[:-1]) | (rnd[1:] != rnd[:-1]), True]
+        self.columns = {col: values[order[last]] for col, values in merged.items()}
+        return len(self) - before
+
+    def save(self):
+        """Write the column files, manifest last (a crash mid-save leaves the old manifest)"""
+        os.makedirs(self.path, exist_ok=True)
+        if os.path.exists(self.manifest_path):
+            os.remove(self.manifest_path)
+        for col in COLUMNS:
+            tmp = os.path.join(self.path, f"{col}.tmp.npy")
+            np.save(tmp, np.ascontiguousarray(self.columns[col]))
+            os.replace(tmp, os.path.join(self.path, f"{col}.npy"))
+        tmp = f"{self.manifest_path}.tmp"
+        with open(tmp, 'w') as f:
+            json.dump({'rows': len(self)}, f)
+        os.replace(tmp, self.manifest_path)
+
+    def frame(self):
+        """DataFrame with the round columns; updated_at/price also fit chainlink_replay.load_rounds"""
+        df = pd.DataFrame(self.columns)
+        df['price'] = df['answer']
+        return df
+
+
+def sync(table, n_rounds, rpc_url=POLYGON_RPC, contract=CHAINLINK_CONTRACT,
+         batch_size=BATCH_SIZE, verbose=True):
+    """Fetch the missing rounds among the latest n_rounds of the current phase; returns rows added"""
+    latest = latest_round(rpc_url, contract)
+    if latest is None:
+        raise RuntimeError(f"latestRoundData failed on {rpc_url}")
+    phase, last = split_round_id(latest['round_id'])
+
+    wanted = np.arange(max(1, last - n_rounds + 1), last + 1, dtype=np.int64)
+    missing = np.setdiff1d(wanted, table.rounds(phase))[::-1]   # newest first
+    if verbose:
+        print(f"Phase {phase}, latest round {last}: {len(wanted) - len(missing)} of "
+              f"{len(wanted)} rounds stored, fetching {len(missing)}")
+    if not len(missing):
+        return 0
+
+    round_ids = ((phase << PHASE_SHIFT) | missing.astype(object)).tolist()
+    return table.add(fetch_rounds(round_ids, rpc_url, contract, batch_size, verbose=verbose))
+
+
+def staleness(updated_at, thresholds=(30, 45, 60)):
+    """
+    Update gaps (seconds) and, for each threshold, the share of time the
+    oracle answer was older than it (the age grows 0 -> gap between updates)
+    """
+    gaps = np.diff(np.sort(updated_at)).astype(np.float64)
+    total = gaps.sum()
+    over = {t: float(np.maximum(gaps - t, 0).sum() / total) if total else 0.0 for t in thresholds}
+    return gaps, over
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load past Chainlink rounds into the local round table")
+    parser.add_argument('--rpc', default=POLYGON_RPC)
+    parser.add_argument('--contract', default=CHAINLINK_CONTRACT)
+    parser.add_argument('--rounds', type=int, default=10000, help="Latest rounds to keep in the table")
+    parser.add_argument('--batch', type=int, default=BATCH_SIZE, help="eth_calls per HTTP request")
+    parser.add_argument('--root', default=ORACLE_DIR)
+    parser.add_argument('--csv', default=None, help="Also export updated_at,price for chainlink_replay.py")
+    args = parser.parse_args()
+
+    print("="*60)
+    print("ORACLE HISTORY")
+    print("="*60)
+
+    table = RoundTable(args.contract, args.root)
+    started = time.time()
+    added = sync(table, args.rounds, args.rpc, args.contract, args.batch)
+    if added:
+        table.save()
+    print(f"\n✅ {added} new rounds in {time.time() - started:.1f}s, {len(table)} in {table.path}")
+
+    if len(table) > 1:
+        gaps, over = staleness(table.columns['updated_at'])
+        p50, p90, p99 = np.percentile(gaps, [50, 90, 99])
+        print(f"\nUpdate gap: median {p50:.0f}s | p90 {p90:.0f}s | p99 {p99:.0f}s | max {gaps.max():.0f}s")
+        for threshold, share in over.items():
+            print(f"  Oracle older than {threshold}s: {share*100:5.1f}% of the time")
+
+    if args.csv:
+        os.makedirs(os.path.dirname(args.csv) or '.', exist_ok=True)
+        table.frame()[['updated_at', 'price']].to_csv(args.csv, index=False)
+        print(f"\n✅ Saved to {args.csv}")
@@ -0,0 +1,195 @@
+"""
+ORACLE TRACKER
+===============
+Cached Chainlink round that is only re-read when an update is likely.
+
+A Chainlink feed writes a new round when the price moves past its
+deviation threshold or when the heartbeat runs out. The tracker learns
+both from the rounds it sees:
+- heartbeat: longest gap between consecutive round ids
+- deviation: smallest price change among rounds that came before the
+  heartbeat (so were deviation-triggered); until there is one, the
+  largest change seen between heartbeat rounds
+
+latestRoundData is then polled densely (every second) only when:
+- the next heartbeat update is due within `lead` seconds, or overdue
+- the reference (Binance) price is, or was within the last `lead`
+  seconds, more than 60% of the deviation threshold away from the
+  cached answer (a round can post after the price has already moved back)
+Otherwise it is polled every `idle_every` seconds as a safety net.
+Readers get the cached round with its delay (now - updatedAt) and the
+predicted time of the next update, without an RPC call.
+
+Usage:
+    tracker = OracleTracker(reference=lambda: stream.price(2.0))
+    tracker.get()     # {'price', 'round_id', 'updated_at', 'delay', 'next_update'} or None
+    python3 oracle_tracker.py            # watch the live feed, print polls / updates
+"""
+
+import argparse
+import time
+from collections import deque
+from datetime import datetime
+
+import requests
+
+from transport import client
+
+CHAINLINK_CONTRACT = "0xc907E116054Ad103354f2D350FD2514433D57F6f"
+POLYGON_RPC = "https://polygon-rpc.com"
+LATEST_ROUND_DATA = "0xfeaf968c"
+DECIMALS = 8
+
+HEARTBEAT = 60.0     # Until learned
+DEVIATION = 0.001
+DENSE_EVERY = 1.0
+IDLE_EVERY = 30.0
+LEAD = 3.0
+DEVIATION_MARGIN = 0.6
+
+
+def decode_round(raw, decimals=DECIMALS):
+    """(roundId, answer, startedAt, updatedAt, answeredInRound) return data -> dict"""
+    words = [int(raw[2 + 64 * i:66 + 64 * i], 16) for i in range(5)]
+    answer = words[1] - (1 << 256) if words[1] >= 1 << 255 else words[1]
+    return {
+        'round_id': words[0],
+        'price': answer / 10**decimals,
+        'started_at': words[2],
+        'updated_at': words[3],
+        'answered_in_round': words[4],
+    }
+
+
+def latest_round(rpc_url=POLYGON_RPC, contract=CHAINLINK_CONTRACT, timeout=5):
+    """One eth_call of latestRoundData; None on failure"""
+    payload = {
+        "jsonrpc": "2.0",
+        "method": "eth_call",
+        "params": [{"to": contract, "data": LATEST_ROUND_DATA}, "latest"],
+        "id": 1
+    }
+    try:
+        raw = client.post(rpc_url, json=payload, timeout=timeout).json().get('result')
+        if not raw or len(raw) < 2 + 64 * 5:
+            return None
+        return decode_round(raw)
+    except (requests.RequestException, ValueError):
+        # Network/HTTP errors, a non-JSON body, or return data that isn't hex
+        return None
+
+
+class OracleTracker:
+    """Latest Chainlink round, polled on a learned update schedule"""
+
+    def __init__(self, rpc_url=POLYGON_RPC, contract=CHAINLINK_CONTRACT, reference=None,
+                 clock=time.time, heartbeat=HEARTBEAT, deviation=DEVIATION,
+                 dense_every=DENSE_EVERY, idle_every=IDLE_EVERY, lead=LEAD, history=50):
+        self.rpc_url = rpc_url
+        self.contract = contract
+        self.reference = reference
+        self.clock = clock
+        self.default_heartbeat = heartbeat
+        self.default_deviation = deviation
+        self.dense_every = dense_every
+        self.idle_every = idle_every
+        self.lead = lead
+
+        self.round = None
+        self.rounds = deque(maxlen=history)       # distinct rounds seen, oldest first
+        self.detection_lags = deque(maxlen=history)
+        self.last_poll = float('-inf')
+        self.last_excursion = float('-inf')
+        self.stats = {'polls': 0, 'updates': 0, 'errors': 0}
+
+    # ---- learned schedule ----
+
+    def _consecutive(self):
+        """(seconds, relative price change) between rounds with consecutive ids"""
+        pairs = []
+        rounds = list(self.rounds)
+        for prev, cur in zip(rounds, rounds[1:]):
+            if cur['round_id'] - prev['round_id'] == 1:
+                pairs.append((cur['updated_at'] - prev['updated_at'],
+                              abs(cur['price'] / prev['price'] - 1)))
+        return pairs
+
+    @property
+    def heartbeat(self):
+        pairs = self._consecutive()
+        return max(gap for gap, _ in pairs) if pairs else self.default_heartbeat
+
+    @property
+    def deviation(self):
+        heartbeat = self.heartbeat
+        pairs = self._consecutive()
+        early = [move for gap, move in pairs if gap < 0.9 * heartbeat]
+        if early:
+            return min(early)
+        # Heartbeat rounds moved less than the threshold, so it is at least that
+        return max([self.default_deviation] + [move for _, move in pairs])
+
+    def next_update(self):
+        """Predicted updatedAt of the next round (heartbeat), or None"""
+        return None if self.round is None else self.round['updated_at'] + self.heartbeat
+
+    def poll_interval(self, now):
+        if self.round is None or now >= self.next_update() - self.lead:
+            return self.dense_every
+        price = self.reference() if self.reference else None
+        if price and abs(price / self.round['price'] - 1) >= self.deviation * DEVIATION_MARGIN:
+            self.last_excursion = now
+        if now - self.last_excursion <= self.lead:
+            return self.dense_every
+        return self.idle_every
+
+    # ---- polling ----
+
+    def poll(self):
+        """Read latestRoundData now; returns the round or None"""
+        now = self.clock()
+        self.last_poll = now
+        self.stats['polls'] += 1
+        result = latest_round(self.rpc_url, self.contract)
+        if result is None:
+            self.stats['errors'] += 1
+            return None
+        if self.round is None or result['round_id'] != self.round['round_id']:
+            if self.round is not None:
+                self.stats['updates'] += 1
+                self.detection_lags.append(now - result['updated_at'])
+            self.round = result
+            self.rounds.append(result)
+        return result
+
+    def get(self):
+        """Cached latest round with delay and next_update; polls first if one is due"""
+        now = self.clock()
+        if now - self.last_poll >= self.poll_interval(now):
+            self.poll()
+        if self.round is None:
+            return None
+        return dict(self.round, delay=now - self.round['updated_at'], next_update=self.next_update())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Watch the Chainlink feed with the predictive tracker")
+    parser.add_argument('--rpc', default=POLYGON_RPC)
+    parser.add_argument('--contract', default=CHAINLINK_CONTRACT)
+    args = parser.parse_args()
+
+    tracker = OracleTracker(args.rpc, args.contract)
+    print(f"Tracking {args.contract} on {args.rpc}... Press Ctrl+C to stop\n")
+    seen = None
+    try:
+        while True:
+            data = tracker.get()
+            if data and data['round_id'] != seen:
+                seen = data['round_id']
+                print(f"[{datetime.now().strftime('%H:%M:%S')}] round {data['round_id']} "
+                      f"${data['price']:,.2f} | delay {data['delay']:.0f}s | "
+                      f"heartbeat {tracker.heartbeat:.0f}s | deviation {tracker.deviation*100:.3f}% | "
+                      f"polls {tracker.stats['polls']}")
+            time.sleep(DENSE_EVERY)
+    except KeyboardInterrupt:
+        print(f"\n\nStopped | {tracker.stats}")
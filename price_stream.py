@@ -0,0 +1,174 @@
+"""
+PRICE STREAM
+=============
+Latest Binance price from the WebSocket stream, readable with no I/O.
+
+- A background thread runs an asyncio client subscribed to
+  <symbol>@trade (or @bookTicker, using the mid price)
+- Every message replaces one immutable PriceTick(price, exchange_ms,
+  received_at) in a single slot. Readers take the whole tuple with one
+  attribute read, so there is no lock and no torn read (rebinding an
+  attribute is atomic in CPython)
+- Reconnects with backoff like stream_collector.py. While disconnected
+  the slot keeps its last tick, so readers check its age
+
+Also understands kline messages, so the local stand-in in
+stream_replay.py works as a source.
+
+Usage:
+    stream = PriceStream().start()
+    stream.wait()                  # first tick
+    stream.price(max_age=2.0)      # None if stale or nothing yet
+
+    python3 price_stream.py
+    python3 price_stream.py --ws-url ws://127.0.0.1:8765 --stream kline_1m
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime
+
+import websockets
+from websockets.asyncio.client import connect
+
+from stream_collector import BINANCE_WS
+
+PriceTick = namedtuple('PriceTick', ['price', 'exchange_ms', 'received_at'])
+
+
+def parse_price(message):
+    """(price, exchange_ms) from a trade, aggTrade, bookTicker or kline message, else None"""
+    event = json.loads(message) if isinstance(message, (str, bytes)) else message
+    event = event.get('data', event)
+    kind = event.get('e')
+    if kind in ('trade', 'aggTrade'):
+        return float(event['p']), event.get('T', event.get('E'))
+    if kind == 'kline':
+        return float(event['k']['c']), event.get('E')
+    if 'b' in event and 'a' in event:
+        # bookTicker (spot messages have no event type or time)
+        return (float(event['b']) + float(event['a'])) / 2, event.get('E')
+    return None
+
+
+class PriceStream:
+    """Background WebSocket subscription holding the latest price"""
+
+    def __init__(self, symbol='BTCUSDT', stream='trade', ws_url=BINANCE_WS):
+        self.symbol = symbol
+        self.stream = stream
+        self.ws_url = ws_url
+        self.tick = None
+        self.stats = {'messages': 0, 'bad_messages': 0, 'reconnects': 0}
+        self._first = threading.Event()
+        self._thread = None
+        self._loop = None
+        self._task = None
+
+    @property
+    def stream_url(self):
+        return f"{self.ws_url}/ws/{self.symbol.lower()}@{self.stream}"
+
+    # ---- readers (any thread, no I/O) ----
+
+    def latest(self):
+        """Last PriceTick or None"""
+        return self.tick
+
+    def price(self, max_age=None):
+        """Last price, or None if there is none or it is older than max_age seconds"""
+        tick = self.tick
+        if tick is None or (max_age is not None and time.time() - tick.received_at > max_age):
+            return None
+        return tick.price
+
+    def wait(self, timeout=10):
+        """Block until the first tick; returns whether one arrived"""
+        return self._first.wait(timeout)
+
+    # ---- background client ----
+
+    async def _consume(self, ws):
+        async for message in ws:
+            received_at = time.time()
+            self.stats['messages'] += 1
+            try:
+                parsed = parse_price(message)
+            except (ValueError, KeyError, TypeError, AttributeError) as e:
+                # One bad message is skipped, not the connection
+                self.stats['bad_messages'] += 1
+                print(f"[{datetime.now().strftime('%H:%M:%S')}] Price stream: skipped "
+                      f"unparseable message ({type(e).__name__}: {e})")
+                continue
+            if parsed is None:
+                continue
+            self.tick = PriceTick(parsed[0], parsed[1], received_at)
+            self._first.set()
+
+    async def run(self, max_backoff=30):
+        """Stream until cancelled, reconnecting on any connection or handshake error"""
+        backoff = 1
+        while True:
+            try:
+                async with connect(self.stream_url, ping_interval=20) as ws:
+                    backoff = 1
+                    await self._consume(ws)
+            except (OSError, websockets.WebSocketException, asyncio.TimeoutError) as e:
+                # WebSocketException covers ConnectionClosed and rejected
+                # handshakes (InvalidStatus, InvalidMessage, ...)
+                print(f"[{datetime.now().strftime('%H:%M:%S')}] Price stream lost "
+                      f"({type(e).__name__}: {e}), reconnecting in {backoff}s")
+
+            self.stats['reconnects'] += 1
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, max_backoff)
+
+    def _thread_main(self):
+        self._loop = asyncio.new_event_loop()
+        self._task = self._loop.create_task(self.run())
+        try:
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._loop.close()
+
+    def start(self):
+        """Start the background thread (once); returns self"""
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._thread_main, name='price-stream', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print the streamed Binance price")
+    parser.add_argument('--symbol', default='BTCUSDT')
+    parser.add_argument('--stream', default='trade', help="trade, aggTrade, bookTicker or kline_1m")
+    parser.add_argument('--ws-url', default=BINANCE_WS)
+    args = parser.parse_args()
+
+    stream = PriceStream(args.symbol, args.stream, args.ws_url).start()
+    print(f"Streaming {stream.stream_url}... Press Ctrl+C to stop\n")
+    try:
+        while True:
+            time.sleep(1)
+            tick = stream.latest()
+            if tick is None:
+                continue
+            lag = f"{tick.received_at * 1000 - tick.exchange_ms:.0f}ms" if tick.exchange_ms else "-"
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] ${tick.price:,.2f} | "
+                  f"exchange -> received {lag} | messages {stream.stats['messages']}")
+    except KeyboardInterrupt:
+        stream.stop()
+        print("\n\nStopped")
@@ -13,66 +13,44 @@ How it works:
 - BUY in final 60 seconds with high certainty
 """
 
-import requests
+import argparse
 import time
-from datetime import datetime, timezone
+from datetime import datetime
 import os
 
+from feeds import add_feed_arguments, format_latency, open_feeds, read_feeds
+
 # Chainlink Contract
 CHAINLINK_CONTRACT = "0xc907E116054Ad103354f2D350FD2514433D57F6f"
-POLYGON_RPC = "https://polygon-rpc.com"
-
-def get_binance_price():
-    """Real-time BTC price"""
-    try:
-        r = requests.get(
-            "https://api.binance.com/api/v3/ticker/price",
-            params={"symbol": "BTCUSDT"},
-            timeout=3
-        )
-        return float(r.json()['price'])
-    except:
-        return None
-
-def get_chainlink_price():
-    """Chainlink oracle price (what Polymarket uses)"""
-    try:
-        payload = {
-            "jsonrpc": "2.0",
-            "method": "eth_call",
-            "params": [{
-                "to": CHAINLINK_CONTRACT,
-                "data": "0xfeaf968c"
-            }, "latest"],
-            "id": 1
-        }
-
-        r = requests.post(POLYGON_RPC, json=payload, timeout=5)
-        result = r.json()
-
-        if 'result' in result and len(result['result']) >= 194:
-            raw = result['result']
-            price = int(raw[66:130], 16) / 1e8
-            updated_at = int(raw[130:194], 16)
-            return {
-                'price': price,
-                'updated_at': datetime.fromtimestamp(updated_at, tz=timezone.utc)
-            }
-        return None
-    except:
-        return None
 
-def get_market_window():
+def get_market_window(now=None):
     """
-    Calculate current 5-minute market window
-    Returns: seconds remaining in current window
+    Calculate the 5-minute market window at `now` (unix seconds, default: now)
+    Returns: seconds elapsed and remaining in that window
     """
-    now = datetime.now(timezone.utc)
-    seconds_in_window = now.second + (now.minute % 5) * 60
+    now = time.time() if now is None else now
+    seconds_in_window = int(now) % 300
     remaining = 300 - seconds_in_window  # 300 = 5 minutes
     elapsed = seconds_in_window
     return elapsed, remaining
 
+def in_golden_window(elapsed):
+    """60-30 seconds before market close"""
+    return 240 <= elapsed <= 270  # 4:00 to 4:30 into window
+
+def resolution_call(binance_price, chainlink_price, oracle_delay):
+    """
+    'UP' / 'DOWN' / 'NEUTRAL' (gap within 0.1%), or None if the oracle
+    delay is too small to call
+    """
+    if oracle_delay <= 45:
+        return None
+    if binance_price > chainlink_price * 1.001:
+        return "UP"
+    if binance_price < chainlink_price * 0.999:
+        return "DOWN"
+    return "NEUTRAL"
+
 def predict_resolution(market_strike_price, current_real_price, direction):
     """
     Predict if market will resolve UP or DOWN
@@ -90,10 +68,13 @@ def predict_resolution(market_strike_price, current_real_price, direction):
         confidence = abs(current_real_price - market_strike_price) / market_strike_price
         return 'YES' if will_resolve_down else 'NO', confidence
 
-def run_predictor():
+def run_predictor(binance=None, chainlink=None):
     """
     Main loop: Monitor market windows and predict resolutions
+    binance / chainlink: feeds.PriceFeed sources (default: stream + oracle RPC)
     """
+    if binance is None or chainlink is None:
+        binance, chainlink = open_feeds(contract=CHAINLINK_CONTRACT)
     print("="*70)
     print("MARKET RESOLUTION PREDICTOR")
     print("Using Chainlink Delay for Near-Certain Predictions")
@@ -105,28 +86,29 @@ def run_predictor():
     print("  - Buy with HIGH confidence in final 60 seconds")
     print("\nPress Ctrl+C to stop\n")
 
+    binance.start().wait(timeout=15)
+
     opportunities_found = 0
     best_windows = []
 
     while True:
         try:
             elapsed, remaining = get_market_window()
-            binance_price = get_binance_price()
-            chainlink_data = get_chainlink_price()
+            chainlink_snap, binance_snap = read_feeds(chainlink, binance)
 
-            if not binance_price or not chainlink_data:
+            if not binance_snap or not chainlink_snap:
                 time.sleep(1)
                 continue
 
-            chainlink_price = chainlink_data['price']
-            now = datetime.now(timezone.utc)
-            oracle_delay = (now - chainlink_data['updated_at']).total_seconds()
+            binance_price = binance_snap.price
+            chainlink_price = chainlink_snap.price
+            oracle_delay = chainlink_snap.age()
 
             time_str = datetime.now().strftime("%H:%M:%S")
 
             # THE GOLDEN WINDOW: 60-30 seconds before market close
             # This is when you know the outcome with high certainty
-            if 240 <= elapsed <= 270:  # 4:00 to 4:30 into window
+            if in_golden_window(elapsed):
                 price_diff_pct = ((binance_price - chainlink_price) / chainlink_price) * 100
 
                 print(f"\n{'='*70}")
@@ -136,25 +118,20 @@ def run_predictor():
                 print(f"  Real BTC (Binance):  ${binance_price:,.2f}")
                 print(f"  Oracle (Chainlink):  ${chainlink_price:,.2f}")
                 print(f"  Oracle Delay:        {oracle_delay:.0f} seconds")
+                print(f"  Fetch:               {format_latency(chainlink_snap, binance_snap)}")
                 print(f"  Price Gap:           {price_diff_pct:+.3f}%")
 
-                if oracle_delay > 45:
+                prediction = resolution_call(binance_price, chainlink_price, oracle_delay)
+                if prediction is not None:
                     print(f"\n  🎯 HIGH CONFIDENCE OPPORTUNITY!")
                     print(f"  Oracle is {oracle_delay:.0f}s delayed")
                     print(f"  Real price will be used for resolution")
 
-                    if binance_price > chainlink_price * 1.001:
-                        prediction = "UP"
-                        print(f"\n  Prediction: ✅ BTC is UP")
-                        print(f"  Action: BUY 'UP' on Polymarket NOW")
-                        print(f"  Time remaining: {remaining} seconds")
-                    elif binance_price < chainlink_price * 0.999:
-                        prediction = "DOWN"
-                        print(f"\n  Prediction: ✅ BTC is DOWN")
-                        print(f"  Action: BUY 'DOWN' on Polymarket NOW")
+                    if prediction != "NEUTRAL":
+                        print(f"\n  Prediction: ✅ BTC is {prediction}")
+                        print(f"  Action: BUY '{prediction}' on Polymarket NOW")
                         print(f"  Time remaining: {remaining} seconds")
                     else:
-                        prediction = "NEUTRAL"
                         print(f"\n  Too close to call - SKIP this market")
 
                     opportunities_found += 1
@@ -176,10 +153,15 @@ def run_predictor():
         except KeyboardInterrupt:
             print(f"\n\nStopped")
             print(f"Opportunities detected: {opportunities_found}")
+            print(f"{binance.summary()}\n{chainlink.summary()}")
+            binance.stop()
+            chainlink.stop()
             break
         except Exception as e:
             print(f"Error: {e}")
             time.sleep(1)
 
 if __name__ == "__main__":
-    run_predictor()
+    parser = argparse.ArgumentParser(description="Predict 5-minute market resolutions from the oracle delay")
+    args = add_feed_arguments(parser).parse_args()
+    run_predictor(*open_feeds(args, contract=CHAINLINK_CONTRACT))
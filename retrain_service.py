@@ -0,0 +1,230 @@
+"""
+RETRAIN SERVICE
+================
+Long-running incremental retraining from newly closed windows.
+
+- Polls the candle store and featurizes only candles after the last
+  window the current model was trained on ('trained_through')
+- Updates a copy of the model with the new windows only:
+    Random Forest      warm start, new trees grown on the new windows
+                       (oldest trees dropped past --max-trees)
+    Gradient Boosting  warm start, new stages fit to the new windows
+    SGD                partial_fit
+    Logistic Reg.      no incremental update: refit on every stored
+                       window up to the new ones
+- The most recent windows are held out; the candidate replaces the
+  current model only if its log-loss there is no worse
+- Accepted models are published as the next version in the model
+  registry (model_registry.py) and atomically swapped into
+  models/model.pkl
+
+The scaler is kept frozen, since the existing trees/weights were fit on
+its scaling. Retrain cost scales with the new windows, not the history.
+
+Usage:
+    python3 retrain_service.py                 # check every 5 minutes
+    python3 retrain_service.py --once
+    python3 retrain_service.py --every 60 --new-trees 10 --holdout 144
+"""
+
+import argparse
+import copy
+import os
+import pickle
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.metrics import accuracy_score, log_loss
+
+from candle_cache import open_store
+from candle_store import to_frame
+from features import build_feature_tensor
+from model_registry import ChecksumError, ModelRegistry
+from windowing import WINDOW_NS
+
+MODELS_DIR = 'models'
+
+
+def incremental(model):
+    """Whether update_model() can extend `model` from new windows alone"""
+    return hasattr(model, 'partial_fit') or isinstance(
+        model, (RandomForestClassifier, GradientBoostingClassifier))
+
+
+def refit_model(model, X, y):
+    """Unfitted copy of `model` (same parameters) fit on (X, y)"""
+    return clone(model).fit(X, y)
+
+
+def update_model(model, X, y, new_trees=20, max_trees=None):
+    """Copy of `model` updated with (X, y) only"""
+    model = copy.deepcopy(model)
+
+    if hasattr(model, 'partial_fit'):
+        model.partial_fit(X, y, classes=np.array([0, 1]))
+    elif isinstance(model, RandomForestClassifier):
+        model.set_params(warm_start=True, n_estimators=len(model.estimators_) + new_trees)
+        model.fit(X, y)
+        if max_trees and len(model.estimators_) > max_trees:
+            model.estimators_ = model.estimators_[-max_trees:]
+            model.set_params(n_estimators=max_trees)
+    elif isinstance(model, GradientBoostingClassifier):
+        model.set_params(warm_start=True, n_estimators=model.n_estimators_ + new_trees)
+        model.fit(X, y)
+    else:
+        raise TypeError(f"{type(model).__name__} can't be updated incrementally, use refit_model()")
+
+    return model
+
+
+def write_pickle(path, obj):
+    tmp = f"{path}.tmp"
+    with open(tmp, 'wb') as f:
+        pickle.dump(obj, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class RetrainService:
+    """Incrementally update the current model as new windows close"""
+
+    def __init__(self, store=None, models_dir=MODELS_DIR, min_windows=48, holdout=96,
+                 new_trees=20, max_trees=1000, tolerance=0.0):
+        self.store = store or open_store()
+        self.models_dir = models_dir
+        self.registry = ModelRegistry(os.path.join(models_dir, 'registry'))
+        self.min_windows = min_windows
+        self.holdout = holdout
+        self.new_trees = new_trees
+        self.max_trees = max_trees
+        self.tolerance = tolerance
+        # Windows already tried by a rejected update are not retried
+        self.rejected_through = None
+
+    def new_windows(self, trained_through):
+        """(X, y, window_start) of complete windows after trained_through"""
+        start = None if trained_through is None else pd.Timestamp(trained_through).value + WINDOW_NS
+        X, y, window_start = build_feature_tensor(to_frame(self.store.read(start=start)))
+        return X, y, window_start
+
+    def score(self, model_data, X, y):
+        proba = model_data['model'].predict_proba(model_data['scaler'].transform(X))
+        return {
+            'log_loss': log_loss(y, proba, labels=[0, 1]),
+            'accuracy': accuracy_score(y, proba.argmax(axis=1)),
+        }
+
+    def check(self):
+        """One pass; returns (status, details)"""
+        if self.registry.latest() is None:
+            return 'waiting', {'reason': f"no model in {self.registry.root} "
+                                         f"(run train_model.py or model_registry.py --import)"}
+        registered = self.registry.open()
+        current = registered.model_data()
+        entry = current.get('entry_point', 2)
+        since = [t for t in (current.get('trained_through'), self.rejected_through) if t is not None]
+        X, y, window_start = self.new_windows(max(since) if since else None)
+        X, y = X[:, entry - 1], y[:, entry - 1]
+
+        if len(X) < self.min_windows + self.holdout:
+            return 'waiting', {'new_windows': len(X)}
+
+        # Train on everything but the most recent `holdout` windows, which
+        # stay untrained so the next pass picks them up
+        split = len(X) - self.holdout
+        X_train, y_train = X[:split], y[:split]
+        X_val, y_val = X[split:], y[split:]
+        if len(np.unique(y_train)) < 2:
+            return 'waiting', {'new_windows': len(X), 'reason': 'one class only'}
+
+        trained_through = pd.Timestamp(window_start[split - 1])
+        started = time.perf_counter()
+        candidate = dict(current)
+        if incremental(current['model']):
+            mode = 'update'
+            frame = pd.DataFrame(X_train, columns=current['feature_columns'])
+            candidate['model'] = update_model(
+                current['model'], current['scaler'].transform(frame), y_train,
+                self.new_trees, self.max_trees
+            )
+        else:
+            # Every stored window up to the new ones, not just the new ones
+            mode = 'refit'
+            X_all, y_all, starts = self.new_windows(None)
+            keep = starts <= window_start[split - 1]
+            frame = pd.DataFrame(X_all[keep, entry - 1], columns=current['feature_columns'])
+            candidate['model'] = refit_model(
+                current['model'], current['scaler'].transform(frame), y_all[keep, entry - 1]
+            )
+        fit_seconds = time.perf_counter() - started
+
+        val = pd.DataFrame(X_val, columns=current['feature_columns'])
+        before = self.score(current, val, y_val)
+        after = self.score(candidate, val, y_val)
+        details = {
+            'new_windows': split,
+            'mode': mode,
+            'fit_seconds': round(fit_seconds, 3),
+            'holdout_log_loss': [round(before['log_loss'], 4), round(after['log_loss'], 4)],
+            'holdout_accuracy': [round(before['accuracy'], 4), round(after['accuracy'], 4)],
+        }
+        if after['log_loss'] > before['log_loss'] + self.tolerance:
+            self.rejected_through = trained_through
+            return 'rejected', details
+
+        candidate['accuracy'] = after['accuracy']
+        candidate['trained_through'] = trained_through
+        details['trained_through'] = candidate['trained_through']
+        data_range = dict(registered.manifest['data'], trained_through=trained_through)
+        details['version'] = self.registry.publish(
+            candidate, val, metrics=dict(details, accuracy=after['accuracy']),
+            data_range=data_range, parent=registered.version
+        )
+        write_pickle(os.path.join(self.models_dir, 'model.pkl'), candidate)
+        return 'published', details
+
+    def run(self, every=300):
+        """Check every `every` seconds until interrupted; a failed pass is logged and retried"""
+        while True:
+            try:
+                status, details = self.check()
+            except (OSError, ValueError, TypeError, KeyError, pickle.UnpicklingError, ChecksumError) as e:
+                status, details = 'failed', {'error': f"{type(e).__name__}: {e}"}
+            summary = " | ".join(f"{k}: {v}" for k, v in details.items())
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] {status} | {summary}")
+            time.sleep(every)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Incrementally retrain the model from new windows")
+    parser.add_argument('--every', type=int, default=300, help="Seconds between checks")
+    parser.add_argument('--once', action='store_true')
+    parser.add_argument('--min-windows', type=int, default=48, help="New windows needed to update")
+    parser.add_argument('--holdout', type=int, default=96, help="Most recent windows used to validate")
+    parser.add_argument('--new-trees', type=int, default=20, help="Trees/stages added per update")
+    parser.add_argument('--max-trees', type=int, default=1000, help="Forest size cap")
+    parser.add_argument('--models-dir', default=MODELS_DIR)
+    args = parser.parse_args()
+
+    service = RetrainService(
+        models_dir=args.models_dir, min_windows=args.min_windows, holdout=args.holdout,
+        new_trees=args.new_trees, max_trees=args.max_trees
+    )
+
+    print("="*60)
+    print("RETRAIN SERVICE")
+    print("="*60)
+
+    try:
+        if args.once:
+            status, details = service.check()
+            print(f"{status}: {details}")
+        else:
+            service.run(args.every)
+    except KeyboardInterrupt:
+        print("\n\nStopped")
@@ -0,0 +1,154 @@
+"""
+RPC REPLAY SERVER
+==================
+Local stand-in for the Polygon JSON-RPC endpoint, serving a Chainlink feed.
+
+Answers eth_call for latestRoundData and getRoundData, single or batched,
+from recorded rounds (CSV with updated_at, price - e.g. oracle_history.py
+--csv) or synthetic ones (chainlink_replay.synthetic_session). Rounds are
+phase 1, numbered from 1. getRoundData for a round that does not exist
+(yet) reverts like the real contract.
+
+With --speed the feed plays out: a round is only visible once
+(now - start) * speed has passed its updated_at offset.
+
+Usage:
+    python3 rpc_replay.py --synthetic --days 7
+    python3 rpc_replay.py --rounds data/rounds.csv --port 8545 --max-batch 1000
+    python3 rpc_replay.py --synthetic --speed 20
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+from chainlink_replay import load_rounds, synthetic_session
+from oracle_history import GET_ROUND_DATA, PHASE_SHIFT
+from oracle_tracker import DECIMALS, LATEST_ROUND_DATA
+
+PHASE = 1
+
+
+def encode_round(round_id, price, started_at, updated_at, decimals=DECIMALS):
+    """ABI-encoded (roundId, answer, startedAt, updatedAt, answeredInRound)"""
+    answer = int(round(price * 10**decimals)) % (1 << 256)
+    words = [round_id, answer, int(started_at), int(updated_at), round_id]
+    return '0x' + ''.join(f"{w:064x}" for w in words)
+
+
+class RoundFeed:
+    """
+    Rounds served by the stand-in; visible() is how many exist right now.
+    `clock` is what "now" is for --speed (a simulated clock in tests).
+    """
+
+    def __init__(self, updated_at, prices, speed=None, clock=time.time):
+        self.updated_at = np.asarray(updated_at, np.float64)
+        self.prices = np.asarray(prices, np.float64)
+        self.speed = speed
+        self.clock = clock
+        self.started = clock()
+        self.calls = 0
+
+    def visible(self):
+        if not self.speed:
+            return len(self.updated_at)
+        elapsed = (self.clock() - self.started) * self.speed
+        return max(1, int(np.searchsorted(self.updated_at - self.updated_at[0], elapsed, side='right')))
+
+    def round_data(self, number):
+        """Encoded round `number` (1-based), or None if it does not exist yet"""
+        if not 1 <= number <= self.visible():
+            return None
+        t = self.updated_at[number - 1]
+        return encode_round((PHASE << PHASE_SHIFT) | number, self.prices[number - 1], t, t)
+
+    def eth_call(self, data):
+        if data.startswith(LATEST_ROUND_DATA):
+            return self.round_data(self.visible())
+        if data.startswith(GET_ROUND_DATA):
+            phase, number = divmod(int(data[len(GET_ROUND_DATA):], 16), 1 << PHASE_SHIFT)
+            return self.round_data(number) if phase == PHASE else None
+        return None
+
+    def answer(self, request):
+        self.calls += 1
+        reply = {"jsonrpc": "2.0", "id": request.get('id')}
+        result = None
+        if request.get('method') == 'eth_call':
+            result = self.eth_call(request['params'][0].get('data', ''))
+        if result is None:
+            reply['error'] = {"code": 3, "message": "execution reverted: No data present"}
+        else:
+            reply['result'] = result
+        return reply
+
+
+def serve(feed, host='127.0.0.1', port=8545, max_batch=None):
+    """Start the server on a background thread; returns it (port 0 picks a free port)"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+            if not isinstance(request, list):
+                reply = feed.answer(request)
+            elif max_batch and len(request) > max_batch:
+                reply = {"jsonrpc": "2.0", "id": None,
+                         "error": {"code": -32600, "message": f"batch limit {max_batch} exceeded"}}
+            else:
+                reply = [feed.answer(r) for r in request]
+            self.reply(json.dumps(reply).encode())
+
+        def do_HEAD(self):
+            self.reply(b'')
+
+        def reply(self, body):
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the Chainlink feed on Polygon JSON-RPC")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--rounds', help="CSV (updated_at, price)")
+    source.add_argument('--synthetic', action='store_true')
+    parser.add_argument('--days', type=int, default=1, help="Synthetic days")
+    parser.add_argument('--speed', type=float, default=None, help="Play the rounds out at this speed")
+    parser.add_argument('--max-batch', type=int, default=None, help="Reject larger batches")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8545)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        _, rounds = synthetic_session(args.days)
+    else:
+        rounds = load_rounds(args.rounds)
+
+    feed = RoundFeed(*rounds, speed=args.speed)
+    server = serve(feed, args.host, args.port, args.max_batch)
+    print(f"Serving {len(feed.updated_at)} rounds on http://{args.host}:{args.port}"
+          + (f" at {args.speed:g}x" if args.speed else ""))
+    try:
+        while True:
+            time.sleep(10)
+            print(f"[{time.strftime('%H:%M:%S')}] {feed.visible()} rounds visible | {feed.calls} calls")
+    except KeyboardInterrupt:
+        server.shutdown()
+        print("\n\nStopped")
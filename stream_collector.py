@@ -0,0 +1,254 @@
+"""
+STREAM COLLECTOR
+=================
+Asyncio kline collector over the Binance WebSocket stream.
+
+- Subscribes to <symbol>@kline_<interval> and keeps only closed candles
+- Closed candles go through a bounded queue to a writer task that
+  appends them to the candle store in batches
+- In-process subscribers get each closed candle through their own
+  bounded queue (oldest candle dropped if a subscriber falls behind)
+- Reconnects with backoff; minutes missed while disconnected are
+  backfilled over REST before streaming resumes
+
+Works against any server speaking the Binance kline message format,
+e.g. the local stand-in in stream_replay.py.
+
+Usage:
+    python3 stream_collector.py
+    python3 stream_collector.py --ws-url ws://127.0.0.1:8765 --no-backfill
+    python3 stream_collector.py --record data/klines.jsonl
+"""
+
+import argparse
+import asyncio
+import json
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import websockets
+from websockets.asyncio.client import connect
+
+from binance import BINANCE_URL, INTERVAL_MS, MAX_KLINES, fetch_klines
+from candle_store import CANDLE_DTYPE, CandleStore, STORE_DIR
+
+BINANCE_WS = "wss://stream.binance.com:9443"
+
+
+def parse_kline(message):
+    """
+    Kline event -> (is_closed, open_time_ms, record tuple) or None.
+    Accepts raw (/ws) and combined (/stream) message formats.
+    """
+    event = json.loads(message) if isinstance(message, (str, bytes)) else message
+    event = event.get('data', event)
+    if event.get('e') != 'kline':
+        return None
+
+    k = event['k']
+    record = (
+        int(k['t']) * 10**6, float(k['o']), float(k['h']), float(k['l']),
+        float(k['c']), float(k['v']), int(k['n'])
+    )
+    return bool(k['x']), int(k['t']), record
+
+
+def record_to_candle(record):
+    """Store record tuple -> dict handed to subscribers"""
+    candle = dict(zip(CANDLE_DTYPE.names, record))
+    candle['timestamp'] = pd.Timestamp(record[0])
+    return candle
+
+
+class StreamCollector:
+    """Streams closed candles of one symbol/interval into the store and subscribers"""
+
+    def __init__(self, symbol='BTCUSDT', interval='1m', ws_url=BINANCE_WS,
+                 rest_url=BINANCE_URL, store=None, queue_size=1000, record_file=None):
+        self.symbol = symbol
+        self.interval = interval
+        self.interval_ms = INTERVAL_MS[interval]
+        self.ws_url = ws_url
+        self.rest_url = rest_url
+        self.store = store if store is not None else CandleStore(symbol, interval)
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.subscribers = []
+        self.record_file = record_file
+
+        self.last_open_ms = self._stored_last_open_ms()
+        self.stats = {'messages': 0, 'closed': 0, 'backfilled': 0, 'reconnects': 0, 'dropped': 0}
+
+    def _stored_last_open_ms(self):
+        days = self.store.partitions() if self.store else []
+        if not days:
+            return None
+        return self.store.last_timestamp(days[-1]) // 10**6
+
+    @property
+    def stream_url(self):
+        return f"{self.ws_url}/ws/{self.symbol.lower()}@kline_{self.interval}"
+
+    def subscribe(self, maxsize=100):
+        """Bounded queue that receives every closed candle as a dict"""
+        queue = asyncio.Queue(maxsize=maxsize)
+        self.subscribers.append(queue)
+        return queue
+
+    def _publish(self, record):
+        candle = record_to_candle(record)
+        for queue in self.subscribers:
+            if queue.full():
+                queue.get_nowait()
+                self.stats['dropped'] += 1
+            queue.put_nowait(candle)
+
+    async def _emit(self, record):
+        open_ms = record[0] // 10**6
+        if self.last_open_ms is not None and open_ms <= self.last_open_ms:
+            return
+        self.last_open_ms = open_ms
+        self.stats['closed'] += 1
+        await self.queue.put(record)
+        self._publish(record)
+
+    async def _backfill(self, until_ms):
+        """REST-fetch closed candles from the last one we have up to until_ms"""
+        if self.rest_url is None or self.last_open_ms is None:
+            return
+        start = self.last_open_ms + self.interval_ms
+        while start < until_ms:
+            data = await asyncio.to_thread(
+                fetch_klines, self.symbol, self.interval, MAX_KLINES,
+                start, until_ms - 1, base_url=self.rest_url
+            )
+            closed = [k for k in data if int(k[6]) < until_ms]
+            if not closed:
+                break
+            for k in closed:
+                record = (int(k[0]) * 10**6, float(k[1]), float(k[2]), float(k[3]),
+                          float(k[4]), float(k[5]), int(k[8]))
+                await self._emit(record)
+                self.stats['backfilled'] += 1
+            start = int(closed[-1][0]) + self.interval_ms
+
+    async def _writer(self):
+        """Drain the queue and append whole batches to the store"""
+        while True:
+            batch = [await self.queue.get()]
+            while not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+
+            if self.store is not None:
+                records = np.array(batch, dtype=CANDLE_DTYPE)
+                records = records[np.argsort(records['timestamp'], kind='stable')]
+                await asyncio.to_thread(self.store.write, records)
+
+            for _ in batch:
+                self.queue.task_done()
+
+    async def _consume(self, ws, recorder):
+        first = True
+        async for message in ws:
+            self.stats['messages'] += 1
+            if recorder:
+                recorder.write(message if isinstance(message, str) else message.decode())
+                recorder.write('\n')
+
+            parsed = parse_kline(message)
+            if parsed is None:
+                continue
+            is_closed, open_ms, record = parsed
+
+            # Anything before the current kline that we don't have was missed
+            if first:
+                first = False
+                await self._backfill(open_ms)
+
+            if is_closed:
+                await self._emit(record)
+
+    async def _stream(self, recorder, max_backoff):
+        """Socket loop, reconnecting on any connection or handshake error"""
+        backoff = 1
+        while True:
+            try:
+                async with connect(self.stream_url, ping_interval=20) as ws:
+                    backoff = 1
+                    await self._consume(ws, recorder)
+            except (OSError, websockets.WebSocketException, asyncio.TimeoutError) as e:
+                # WebSocketException covers ConnectionClosed and rejected
+                # handshakes (InvalidStatus, InvalidMessage, ...)
+                print(f"[{datetime.now().strftime('%H:%M:%S')}] Stream lost "
+                      f"({type(e).__name__}: {e}), reconnecting in {backoff}s")
+
+            self.stats['reconnects'] += 1
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, max_backoff)
+
+    async def run(self, max_backoff=30):
+        """
+        Collect until cancelled. If the writer fails (e.g. a store write
+        raises) streaming stops and the error is raised here, instead of
+        the queue filling up and the collector hanging
+        """
+        writer = asyncio.create_task(self._writer())
+        recorder = open(self.record_file, 'a') if self.record_file else None
+        stream = asyncio.create_task(self._stream(recorder, max_backoff))
+
+        try:
+            done, _ = await asyncio.wait({writer, stream}, return_when=asyncio.FIRST_COMPLETED)
+            if writer in done and writer.exception() is not None:
+                print(f"[{datetime.now().strftime('%H:%M:%S')}] Store writer failed: "
+                      f"{type(writer.exception()).__name__}: {writer.exception()}")
+            for task in done:
+                task.result()
+        finally:
+            stream.cancel()
+            await asyncio.gather(stream, return_exceptions=True)
+            if not writer.done():
+                await asyncio.wait_for(self.queue.join(), timeout=10)
+                writer.cancel()
+            if recorder:
+                recorder.close()
+
+
+async def _print_candles(collector):
+    candles = collector.subscribe()
+    while True:
+        candle = await candles.get()
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] "
+              f"{candle['timestamp']} close ${candle['close']:,.2f} | "
+              f"stored {collector.stats['closed']} | backfilled {collector.stats['backfilled']}")
+
+
+async def main(args):
+    collector = StreamCollector(
+        args.symbol, args.interval, args.ws_url,
+        rest_url=None if args.no_backfill else args.rest_url,
+        store=CandleStore(args.symbol, args.interval, args.store_dir),
+        record_file=args.record
+    )
+    printer = asyncio.create_task(_print_candles(collector))
+    try:
+        await collector.run()
+    finally:
+        printer.cancel()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream closed klines into the candle store")
+    parser.add_argument('--symbol', default='BTCUSDT')
+    parser.add_argument('--interval', default='1m')
+    parser.add_argument('--ws-url', default=BINANCE_WS)
+    parser.add_argument('--rest-url', default=BINANCE_URL)
+    parser.add_argument('--no-backfill', action='store_true')
+    parser.add_argument('--store-dir', default=STORE_DIR)
+    parser.add_argument('--record', default=None, help="Append raw messages to a JSONL file")
+    args = parser.parse_args()
+
+    print("Streaming klines... Press Ctrl+C to stop\n")
+    try:
+        asyncio.run(main(args))
+    except KeyboardInterrupt:
+        print("\n\nStopped")
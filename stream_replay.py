@@ -0,0 +1,151 @@
+"""
+STREAM REPLAY SERVER
+=====================
+Local stand-in for the Binance WebSocket stream.
+
+Replays kline messages from a recorded JSONL file (stream_collector.py
+--record) or a synthetic random walk, paced by the event times in the
+messages divided by --speed. Messages are broadcast to whoever is
+connected at that moment; anything sent while a client is disconnected
+is missed, just like the real stream.
+
+Usage:
+    python3 stream_replay.py --synthetic --speed 100
+    python3 stream_replay.py --file data/klines.jsonl --speed 10
+    python3 stream_replay.py --synthetic --speed 100 --drop-every 500
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from websockets.asyncio.server import serve
+
+MINUTE_MS = 60_000
+
+
+def synthetic_klines(symbol='BTCUSDT', start_ms=None, minutes=None, price=68000.0,
+                     updates_per_minute=30, seed=42):
+    """Random-walk kline messages: in-progress updates then a closed kline each minute"""
+    rng = random.Random(seed)
+    if start_ms is None:
+        start_ms = int(time.time() * 1000) // MINUTE_MS * MINUTE_MS
+    step = MINUTE_MS // updates_per_minute
+
+    minute = 0
+    while minutes is None or minute < minutes:
+        t = start_ms + minute * MINUTE_MS
+        o = h = l = c = price
+        volume = 0.0
+        trades = 0
+        for i in range(1, updates_per_minute + 1):
+            c = round(c * (1 + rng.gauss(0, 0.0002)), 2)
+            h, l = max(h, c), min(l, c)
+            volume += rng.uniform(0, 0.5)
+            trades += rng.randint(1, 100)
+            yield {
+                'e': 'kline', 'E': t + i * step, 's': symbol,
+                'k': {
+                    't': t, 'T': t + MINUTE_MS - 1, 's': symbol, 'i': '1m',
+                    'o': f"{o:.2f}", 'h': f"{h:.2f}", 'l': f"{l:.2f}", 'c': f"{c:.2f}",
+                    'v': f"{volume:.5f}", 'n': trades,
+                    'x': i == updates_per_minute,
+                },
+            }
+        price = c
+        minute += 1
+
+
+def recorded_klines(path):
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+class ReplayServer:
+    """Broadcast a message timeline to connected clients at `speed` x real time"""
+
+    def __init__(self, messages, speed=1.0, drop_every=None):
+        self.messages = messages
+        self.speed = speed
+        self.drop_every = drop_every
+        self.clients = {}
+        self.sent = 0
+        self.finished = asyncio.Event()
+
+    async def handler(self, ws):
+        self.clients[ws] = 0
+        try:
+            await ws.wait_closed()
+        finally:
+            self.clients.pop(ws, None)
+
+    async def broadcast(self):
+        started = time.monotonic()
+        first_event = None
+
+        for message in self.messages:
+            event = message.get('data', message)
+            if first_event is None:
+                first_event = event['E']
+            due = started + (event['E'] - first_event) / 1000 / self.speed
+            delay = due - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            payload = json.dumps(message)
+            for ws in list(self.clients):
+                try:
+                    await ws.send(payload)
+                except Exception:
+                    continue
+                self.sent += 1
+                self.clients[ws] += 1
+                # Simulate a dropped connection
+                if self.drop_every and self.clients[ws] >= self.drop_every:
+                    self.clients.pop(ws, None)
+                    await ws.close()
+
+        self.finished.set()
+
+    async def serve(self, host='127.0.0.1', port=8765):
+        """Start listening; returns the server (port 0 picks a free port)"""
+        server = await serve(self.handler, host, port)
+        asyncio.get_running_loop().create_task(self.broadcast())
+        return server
+
+
+async def main(args):
+    if args.file:
+        messages = recorded_klines(args.file)
+    else:
+        messages = synthetic_klines(args.symbol, minutes=args.minutes)
+
+    replay = ReplayServer(messages, args.speed, args.drop_every)
+    server = await replay.serve(args.host, args.port)
+    print(f"Replaying on ws://{args.host}:{args.port} at {args.speed:g}x")
+    await replay.finished.wait()
+    server.close()
+    print(f"Done: {replay.sent} messages sent")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the Binance kline stream")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--file', help="Recorded JSONL messages")
+    source.add_argument('--synthetic', action='store_true')
+    parser.add_argument('--symbol', default='BTCUSDT')
+    parser.add_argument('--minutes', type=int, default=None, help="Synthetic minutes (default: forever)")
+    parser.add_argument('--speed', type=float, default=1.0)
+    parser.add_argument('--drop-every', type=int, default=None)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(main(args))
+    except KeyboardInterrupt:
+        print("\n\nStopped")
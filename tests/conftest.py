@@ -0,0 +1,236 @@
+import json
+import os
+import shutil
+import ssl
+import subprocess
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# The scripts live at the repo root and import each other as top-level modules
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from candle_store import CandleStore  # noqa: E402
+
+MINUTE_NS = 60 * 10**9
+
+
+class Candles:
+    """
+    1-minute candle frames at minute offsets from `start` (a UTC midnight).
+    Prices are a seeded random walk; about 1 in 20 volumes is zero.
+    """
+    start = pd.Timestamp('2026-01-05')
+
+    def __call__(self, minutes, seed=0):
+        minutes = np.asarray(minutes, dtype=np.int64)
+        rng = np.random.default_rng(seed)
+        n = len(minutes)
+        close = 68000.0 * np.exp(np.cumsum(rng.normal(0, 0.001, n)))
+        open_ = np.r_[68000.0, close[:-1]][:n]
+        volume = rng.uniform(0, 20, n)
+        volume[rng.random(n) < 0.05] = 0.0
+        return pd.DataFrame({
+            'timestamp': (self.ns(minutes)).astype('datetime64[ns]'),
+            'open': open_, 'high': np.maximum(open_, close) + 5,
+            'low': np.minimum(open_, close) - 5, 'close': close,
+            'volume': volume, 'trades': rng.integers(1, 100, n),
+        })
+
+    def ns(self, minutes):
+        """Open times (int64 ns) of the given minute offsets"""
+        return self.start.value + np.asarray(minutes, dtype=np.int64) * MINUTE_NS
+
+    def minutes(self, ts_ns):
+        """Minute offsets of open times (int64 ns)"""
+        return ((np.asarray(ts_ns, dtype=np.int64) - self.start.value) // MINUTE_NS).tolist()
+
+
+@pytest.fixture
+def candles():
+    return Candles()
+
+
+@pytest.fixture(scope='session')
+def trained_model():
+    """
+    (model_data, X): a train_model.py-style dict (small gradient boosting
+    model, entry at minute 2) trained on 600 windows of the candles
+    fixture, and the raw feature rows it was trained on
+    """
+    from sklearn.ensemble import GradientBoostingClassifier
+    from sklearn.preprocessing import StandardScaler
+
+    from features import FEATURE_COLUMNS, build_window_features
+
+    table = build_window_features(Candles()(range(5 * 600)), entry_point=2)
+    X = table[FEATURE_COLUMNS]
+    scaler = StandardScaler().fit(X)
+    model = GradientBoostingClassifier(n_estimators=20, max_depth=3, random_state=0)
+    model.fit(scaler.transform(X), table['target'])
+    model_data = {'model': model, 'scaler': scaler, 'feature_columns': list(FEATURE_COLUMNS),
+                  'accuracy': 0.5, 'entry_point': 2, 'trained_through': table.index[-1]}
+    return model_data, X
+
+
+@pytest.fixture
+def model_data(trained_model):
+    return dict(trained_model[0])
+
+
+@pytest.fixture
+def model_features(trained_model):
+    return trained_model[1]
+
+
+@pytest.fixture
+def registry(tmp_path):
+    """Empty model registry under the test's tmp dir (models/registry)"""
+    from model_registry import ModelRegistry
+    return ModelRegistry(str(tmp_path / 'models' / 'registry'))
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Empty BTCUSDT-1m store under the test's tmp dir"""
+    return CandleStore(root=str(tmp_path / 'candles'))
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """200 with a small JSON body for any path; counts connections on the server"""
+    protocol_version = 'HTTP/1.1'
+    body = b'{"symbol":"BTCUSDT","price":"68123.45"}'
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(self.body)))
+        self.end_headers()
+
+    def do_GET(self):
+        self.do_HEAD()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope='session')
+def tls_cert(tmp_path_factory):
+    """(cert.pem, key.pem): a self-signed certificate for 127.0.0.1"""
+    if shutil.which('openssl') is None:
+        pytest.skip("openssl is needed to make a test certificate")
+    root = tmp_path_factory.mktemp('tls')
+    cert, key = str(root / 'cert.pem'), str(root / 'key.pem')
+    subprocess.run(['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+                    '-subj', '/CN=127.0.0.1', '-addext', 'subjectAltName=IP:127.0.0.1',
+                    '-keyout', key, '-out', cert], check=True, capture_output=True)
+    return cert, key
+
+
+@pytest.fixture
+def https_stub(tls_cert):
+    """
+    http.server behind TLS on a free local port. server.url is its base URL,
+    server.cafile the certificate to trust, server.connections the number of
+    connections accepted so far.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(*tls_cert)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    server.url = f"https://127.0.0.1:{server.server_address[1]}"
+    server.cafile = tls_cert[0]
+    server.connections = 0
+    server.lock = threading.Lock()
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+class KlineHandler(BaseHTTPRequestHandler):
+    """/api/v3/klines paged by startTime / endTime / limit, like Binance"""
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        server = self.server
+        parts = urlsplit(self.path)
+        query = dict(parse_qsl(parts.query))
+        with server.lock:
+            server.requests.append(query)
+            throttled = server.throttle > 0
+            server.throttle -= throttled
+
+        if parts.path != '/api/v3/klines':
+            return self.reply(404, {'msg': 'not found'})
+        if throttled:
+            return self.reply(429, {'msg': 'too many requests'}, {'Retry-After': '0'})
+        start = int(query.get('startTime', 0))
+        if start in server.fail:
+            return self.reply(400, {'msg': 'rejected'})
+
+        klines = server.klines.get(query.get('symbol'), {})
+        end = int(query.get('endTime', 2**62))
+        limit = int(query.get('limit', 500))
+        times = [t for t in sorted(klines) if start <= t <= end]
+        if 'startTime' not in query:
+            times = times[-limit:]
+        self.reply(200, [klines[t] for t in times[:limit]])
+
+    def reply(self, status, payload, headers=()):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in dict(headers).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def kline_stub():
+    """
+    Local Binance REST stand-in serving the frames passed to
+    server.load(frame, symbol='BTCUSDT').
+    server.requests holds each request's query; server.fail is a set of
+    startTime values answered with 400; server.throttle is how many requests
+    to answer with 429 before serving again.
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), KlineHandler)
+    server.url = f"http://127.0.0.1:{server.server_address[1]}"
+    server.klines = {}
+    server.requests = []
+    server.fail = set()
+    server.throttle = 0
+    server.lock = threading.Lock()
+
+    def load(frame, symbol='BTCUSDT'):
+        klines = server.klines.setdefault(symbol, {})
+        for row in frame.itertuples():
+            t = row.timestamp.value // 10**6
+            klines[t] = [t, str(row.open), str(row.high), str(row.low), str(row.close),
+                                str(row.volume), t + 59_999, '0', int(row.trades), '0', '0', '0']
+    server.load = load
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,92 @@
+import time
+
+import pandas as pd
+import pytest
+import requests
+
+from backfill import Backfill, Checkpoint, make_pages
+from binance import RateLimiter
+
+PAGE = 1000   # minutes per page
+
+
+def backfill(kline_stub, store, **kwargs):
+    kwargs.setdefault('limiter', RateLimiter())
+    return Backfill(workers=kwargs.pop('workers', 3), base_url=kline_stub.url, store=store, **kwargs)
+
+
+def ms(candles, minute):
+    return int(candles.ns(minute)) // 10**6
+
+
+def stored_minutes(store, candles):
+    return candles.minutes(store.read()['timestamp'])
+
+
+def test_pages_cover_the_range_on_page_boundaries(kline_stub, store, candles):
+    kline_stub.load(candles(range(2500)))
+    assert backfill(kline_stub, store).run(ms(candles, 0), ms(candles, 2500), verbose=False) == 2500
+
+    assert stored_minutes(store, candles) == list(range(2500))
+    pages = sorted((int(q['startTime']), int(q['endTime'])) for q in kline_stub.requests)
+    assert pages == [(ms(candles, 0), ms(candles, 1000) - 1),
+                     (ms(candles, 1000), ms(candles, 2000) - 1),
+                     (ms(candles, 2000), ms(candles, 2500) - 1)]
+    assert {q['limit'] for q in kline_stub.requests} == {str(PAGE)}
+    pd.testing.assert_frame_equal(store.load_frame()[['close', 'volume']].reset_index(drop=True),
+                                  candles(range(2500))[['close', 'volume']])
+
+
+def test_rate_limiter_paces_the_workers(kline_stub, store, candles):
+    kline_stub.load(candles(range(3000)))
+    limiter = RateLimiter(weight_per_minute=1500)   # 25 weight/s, 5 per page
+    limiter.tokens = 0
+
+    started = time.perf_counter()
+    backfill(kline_stub, store, limiter=limiter).run(ms(candles, 0), ms(candles, 3000), verbose=False)
+    assert time.perf_counter() - started >= 3 * 5 / 25 * 0.95
+    assert len(kline_stub.requests) == 3
+
+
+def test_throttled_requests_are_retried(kline_stub, store, candles):
+    kline_stub.load(candles(range(1500)))
+    kline_stub.throttle = 2
+    assert backfill(kline_stub, store).run(ms(candles, 0), ms(candles, 1500), verbose=False) == 1500
+    assert len(kline_stub.requests) == 4
+    assert stored_minutes(store, candles) == list(range(1500))
+
+
+def test_interrupted_run_resumes_from_the_checkpoint(kline_stub, store, candles):
+    kline_stub.load(candles(range(3000)))
+    start, end = ms(candles, 0), ms(candles, 3000)
+    kline_stub.fail = {ms(candles, 1000)}
+
+    with pytest.raises(requests.HTTPError):
+        backfill(kline_stub, store, workers=1).run(start, end, verbose=False)
+    job = backfill(kline_stub, store)
+    checkpoint = Checkpoint(job.checkpoint_path(start))
+    assert sorted(checkpoint.done) == [start]
+
+    kline_stub.fail = set()
+    kline_stub.requests.clear()
+    assert job.run(start, end, verbose=False) == 2000
+    assert sorted(int(q['startTime']) for q in kline_stub.requests) == [ms(candles, 1000), ms(candles, 2000)]
+    assert stored_minutes(store, candles) == list(range(3000))
+
+
+def test_pages_stored_but_not_checkpointed_are_refetched_without_duplicates(kline_stub, store, candles):
+    frame = candles(range(3000))
+    kline_stub.load(frame)
+    start, end = ms(candles, 0), ms(candles, 3000)
+    job = backfill(kline_stub, store)
+
+    # Crash after page 0 was marked and half of page 1 was written
+    pages = make_pages(start, end)
+    store.write(frame.iloc[:1500])
+    Checkpoint(job.checkpoint_path(start)).mark(pages[0])
+
+    assert job.run(start, end, verbose=False) == 1500
+    assert len(kline_stub.requests) == 2
+    assert stored_minutes(store, candles) == list(range(3000))
+    assert sorted(Checkpoint(job.checkpoint_path(start)).done) == [p[0] for p in pages]
+    pd.testing.assert_frame_equal(store.load_frame()[frame.columns], frame, check_dtype=False)
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from backtest_engine import confidence_of, max_drawdown, parameter_sweep, run_backtest
+
+
+def reference_loop(pred, conf, y, bankroll=20.0, position_size=0.10, min_confidence=0.60,
+                   price_base=0.50, price_slope=0.50, min_bankroll=0.5):
+    """The original backtest.py loop"""
+    trades = []
+    for i in range(len(pred)):
+        if conf[i] < min_confidence or bankroll < min_bankroll:
+            continue
+        bet = bankroll * position_size
+        market_price = price_base + (conf[i] - 0.5) * price_slope
+        profit = bet / market_price - bet if pred[i] == y[i] else -bet
+        bankroll += profit
+        trades.append((i, bet, profit, bankroll, pred[i] == y[i]))
+    return trades, bankroll
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_matches_reference_loop(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(0, 2000))
+    pred = rng.integers(0, 2, n)
+    conf = rng.uniform(0.5, 0.9, n)
+    y = np.where(rng.random(n) < rng.uniform(0.3, 0.7), pred, 1 - pred)
+    params = {'position_size': float(rng.choice([0.05, 0.1, 0.3, 0.6])),
+              'min_confidence': float(rng.choice([0.55, 0.6, 0.7]))}
+
+    trades, final = reference_loop(pred, conf, y, **params)
+    result = run_backtest(pred, conf, y, **params)
+
+    assert result['index'].tolist() == [t[0] for t in trades]
+    assert result['win'].tolist() == [t[4] for t in trades]
+    for key, column in (('bet', 1), ('profit', 2), ('bankroll', 3)):
+        np.testing.assert_allclose(result[key], [t[column] for t in trades], rtol=1e-9)
+    assert result['final'] == pytest.approx(final, rel=1e-9)
+
+
+def test_stops_once_bankroll_is_too_small():
+    n = 50
+    pred, y = np.zeros(n, int), np.ones(n, int)        # every trade loses
+    result = run_backtest(pred, np.full(n, 0.8), y, position_size=0.5)
+    trades, final = reference_loop(pred, np.full(n, 0.8), y, position_size=0.5)
+    assert len(result['index']) == len(trades) < n
+    assert result['final'] == pytest.approx(final)
+
+
+def test_no_trades():
+    result = run_backtest([1, 0], [0.5, 0.55], [1, 0])
+    assert len(result['index']) == 0 and result['final'] == 20.0
+
+
+def test_confidence_and_drawdown():
+    proba = np.array([[0.3, 0.7], [0.8, 0.2]])
+    assert confidence_of([1, 0], proba).tolist() == [0.7, 0.8]
+    assert max_drawdown(np.array([22.0, 11.0, 30.0]), bankroll=20.0) == pytest.approx(0.5)
+
+
+def test_sweep_ranks_within_each_pricing_model():
+    rng = np.random.default_rng(0)
+    pred = rng.integers(0, 2, 3000)
+    conf = rng.uniform(0.5, 0.9, 3000)
+    y = np.where(rng.random(3000) < 0.56, pred, 1 - pred)
+    grid = [(c, s, base, slope) for c in (0.55, 0.65) for s in (0.05, 0.1)
+            for base, slope in ((0.45, 0.0), (0.55, 0.5))]
+
+    results = parameter_sweep(pred, conf, y, grid=grid, workers=1, verbose=False)
+    assert len(results) == len(grid)
+    # Cheap prices beat every expensive-price combination, yet each model has its own best
+    assert results['final'].iloc[:4].min() > results['final'].iloc[4:].max()
+    for (base, slope), group in results.groupby(['price_base', 'price_slope']):
+        assert group['rank'].tolist() == [1, 2, 3, 4]
+        assert group['final'].is_monotonic_decreasing
+        expected = run_backtest(pred, conf, y, 20.0, *group.iloc[0][['position_size', 'min_confidence']],
+                                base, slope)['final']
+        assert group['final'].iloc[0] == expected
@@ -0,0 +1,53 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from candle_cache import CandleCache
+
+
+def test_columns_are_memory_mapped_and_match_the_store(store, candles):
+    store.write(candles(range(24 * 60 - 30, 24 * 60 + 30)))   # two partitions
+    cache = CandleCache(store).load()
+
+    assert cache.path == os.path.join(os.path.dirname(store.root), 'cache', 'BTCUSDT-1m')
+    assert len(cache) == 60
+    assert all(isinstance(values, np.memmap) for values in cache.columns.values())
+    pd.testing.assert_frame_equal(cache.frame(), store.load_frame()[cache.frame().columns])
+
+
+def test_slice_is_half_open_and_zero_copy(store, candles):
+    store.write(candles(range(100)))
+    cache = CandleCache(store).load()
+
+    window = cache.slice(pd.Timestamp(candles.ns(10)), pd.Timestamp(candles.ns(15)))
+    assert candles.minutes(window['timestamp']) == [10, 11, 12, 13, 14]
+    assert np.shares_memory(window['close'], cache.columns['close'])
+    assert candles.minutes(cache.slice(end=pd.Timestamp(candles.ns(3)))['timestamp']) == [0, 1, 2]
+    assert len(cache.slice(start=pd.Timestamp(candles.ns(500)))['close']) == 0
+
+
+def test_rebuilt_only_when_the_store_changes(store, candles, monkeypatch):
+    store.write(candles(range(50)))
+    CandleCache(store).load()
+
+    builds = []
+    build = CandleCache.build
+    monkeypatch.setattr(CandleCache, 'build', lambda self: builds.append(1) or build(self))
+    assert len(CandleCache(store).load()) == 50 and builds == []
+
+    store.write(candles(range(50, 60)))
+    cache = CandleCache(store)
+    assert not cache.is_fresh()
+    assert len(cache.load()) == 60 and builds == [1]
+
+
+def test_interrupted_build_is_redone(store, candles):
+    store.write(candles(range(20)))
+    cache = CandleCache(store).load()
+    os.remove(cache.manifest_path)   # crash before the manifest was written
+
+    reopened = CandleCache(store)
+    assert not reopened.is_fresh()
+    assert candles.minutes(reopened.load().columns['timestamp']) == list(range(20))
+    assert reopened.is_fresh()
@@ -0,0 +1,63 @@
+import os
+
+import pandas as pd
+
+from candle_store import CANDLE_DTYPE, to_records
+
+DAY = '2026-01-05'
+
+
+def stored_minutes(store, candles):
+    return candles.minutes(store.read()['timestamp'])
+
+
+def test_newer_candles_are_appended(store, candles, monkeypatch):
+    assert store.write(candles(range(10))) == 10
+
+    rewrites = []
+    monkeypatch.setattr(store, '_rewrite', lambda day, recs: rewrites.append(day))
+    assert store.write(candles(range(5, 15))) == 5     # 5-9 already stored
+    assert rewrites == []
+    assert stored_minutes(store, candles) == list(range(15))
+    assert os.path.getsize(store.partition_path(DAY)) == 15 * CANDLE_DTYPE.itemsize
+
+
+def test_filling_a_hole_rewrites_the_partition_atomically(store, candles):
+    store.write(candles([0, 1, 2, 6, 7]))
+    path = store.partition_path(DAY)
+    before = os.stat(path).st_ino
+
+    assert store.write(candles([3, 4, 5, 8])) == 4
+    assert stored_minutes(store, candles) == list(range(9))
+    assert os.stat(path).st_ino != before               # swapped in with os.replace
+    assert not os.path.exists(f"{path}.tmp")
+    assert store.write(candles(range(9))) == 0
+
+
+def test_torn_tail_is_ignored_then_truncated(store, candles):
+    store.write(candles(range(5)))
+    path = store.partition_path(DAY)
+    with open(path, 'ab') as f:
+        f.write(to_records(candles([5])).tobytes()[:20])   # crash mid-append
+
+    assert stored_minutes(store, candles) == list(range(5))
+    assert store.last_timestamp(DAY) == candles.ns(4)
+
+    assert store.write(candles([5, 6])) == 2
+    assert stored_minutes(store, candles) == list(range(7))
+    assert os.path.getsize(path) == 7 * CANDLE_DTYPE.itemsize
+
+
+def test_writes_split_by_day_and_reads_by_range(store, candles):
+    day = 24 * 60
+    assert store.write(candles(range(day - 3, day + 3))) == 6
+    assert store.partitions() == [DAY, '2026-01-06']
+
+    window = store.read(start=pd.Timestamp(candles.ns(day - 1)), end=pd.Timestamp(candles.ns(day + 2)))
+    assert candles.minutes(window['timestamp']) == [day - 1, day, day + 1]
+
+
+def test_dataframe_round_trip(store, candles):
+    df = candles(range(3))
+    store.write(df)
+    pd.testing.assert_frame_equal(store.load_frame()[df.columns], df, check_dtype=False)
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from chainlink_replay import ArbBot, Monitor, Predictor, replay, synthetic_session
+
+START = pd.Timestamp('2026-01-05').value // 10**9   # a UTC midnight, so windows start on it
+ORACLE = 68000.0
+
+
+def decisions(strategies, now, gap, delay):
+    """What each strategy does at one poll, Binance `gap` (fraction) above the oracle"""
+    return {s.name: s.decide(now, ORACLE * (1 + gap), ORACLE, delay) for s in strategies}
+
+
+def test_decision_rules_differ():
+    strategies = [ArbBot(), Predictor(), Monitor()]
+
+    # Gap too small at the first delayed poll: the predictor skips the
+    # window, the arb bot keeps polling and takes the gap when it opens
+    window = START
+    first = decisions(strategies, window + 240, 0.0005, 50)
+    assert all(d is None for d in first.values())
+    later = decisions(strategies, window + 250, 0.002, 60)
+    assert later['arb'][0] == 'UP'
+    assert later['predictor'] is None and later['monitor'] is None
+
+    # A >0.3% gap outside the entry window: only the monitor bets
+    window += 300
+    early = decisions(strategies, window + 100, -0.004, 10)
+    assert early['monitor'] == ('DOWN', None)
+    assert early['arb'] is None and early['predictor'] is None
+
+    # Oracle exactly MIN_ORACLE_DELAY old: the arb bot trades (>=), the predictor waits (>)
+    window += 300
+    at_delay = decisions(strategies, window + 240, 0.002, 45)
+    assert at_delay['arb'][0] == 'UP' and at_delay['predictor'] is None
+    assert decisions(strategies, window + 241, 0.002, 46)['predictor'] == ('UP', None)
+
+
+def test_synthetic_replay_exercises_every_strategy():
+    ticks, rounds = synthetic_session(days=2, start=START, seed=42)
+    trades = replay(ticks, rounds)
+
+    placed = {name: set(zip(group['window_start'], group['direction']))
+              for name, group in trades.groupby('strategy')}
+    assert set(placed) == {'arb', 'predictor', 'monitor'}
+    assert all(len(bets) > 0 for bets in placed.values())
+    assert placed['arb'] != placed['predictor']
+    assert placed['monitor'] != placed['arb']
+    assert placed['monitor'] != placed['predictor']
+
+
+def test_heartbeat_counts_from_the_last_update():
+    _, (round_times, _) = synthetic_session(days=1, start=START, clustering=0, heartbeat=60, latency=1.0)
+    # No deviation rounds at this volatility: rounds are heartbeat + latency apart,
+    # so they drift across the 5-minute windows instead of landing on the same second
+    gaps = set(np.diff(round_times).tolist())
+    assert gaps == {61.0}
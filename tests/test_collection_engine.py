@@ -0,0 +1,70 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from candle_store import CandleStore
+from collection_engine import CollectionEngine, parse_series, resample
+
+SERIES = [('BTCUSDT', '1m'), ('ETHUSDT', '1m'), ('ETHUSDT', '5m')]
+
+
+@pytest.fixture
+def engine(kline_stub, tmp_path, candles, monkeypatch):
+    """Engine on the kline stub; clock[0] is the current minute (offset from candles.start)"""
+    clock = [0]
+    monkeypatch.setattr(time, 'time', lambda: candles.ns(clock[0]) / 1e9)
+    engine = CollectionEngine(SERIES, base_url=kline_stub.url, workers=2, root=str(tmp_path / 'candles'))
+    return engine, clock
+
+
+def test_parse_series():
+    assert parse_series(['btcusdt', 'ETHUSDT:5m']) == [('BTCUSDT', '1m'), ('ETHUSDT', '5m')]
+    with pytest.raises(ValueError):
+        parse_series(['BTCUSDT:7m'])
+
+
+def test_resample_keeps_complete_buckets_only(candles, store):
+    store.write(candles([*range(0, 10), *range(11, 17)]))   # minute 10 missing, 15-16 partial
+    records = store.read()
+    out = resample(records, '5m')
+
+    assert candles.minutes(out['timestamp']) == [0, 5]
+    first = records[:5]
+    assert out['open'][0] == first['open'][0] and out['close'][0] == first['close'][-1]
+    assert out['high'][0] == first['high'].max() and out['low'][0] == first['low'].min()
+    assert out['volume'][0] == first['volume'].sum() and out['trades'][0] == first['trades'].sum()
+
+
+def test_symbols_are_collected_and_derived_series_follow(engine, kline_stub, candles, tmp_path):
+    engine, clock = engine
+    btc, eth = candles(range(1605), seed=1), candles(range(1605), seed=2)
+    kline_stub.load(btc.iloc[:1500], 'BTCUSDT')
+    kline_stub.load(eth.iloc[:1500], 'ETHUSDT')
+    clock[0] = 1500
+
+    # First pass: the latest 1000 candles of each symbol
+    assert engine.collect_once() == {('BTCUSDT', '1m'): 1000, ('ETHUSDT', '1m'): 1000,
+                                     ('ETHUSDT', '5m'): 200}
+    root = str(tmp_path / 'candles')
+    stored = CandleStore('ETHUSDT', '1m', root).load_frame()
+    pd.testing.assert_frame_equal(stored[eth.columns], eth.iloc[500:1500].reset_index(drop=True),
+                                  check_dtype=False)
+    assert candles.minutes(CandleStore('BTCUSDT', '1m', root).read()['timestamp']) == list(range(500, 1500))
+
+    # Later passes page forward from the last stored candle; 5m only once a bucket is complete
+    kline_stub.load(btc.iloc[1500:1603], 'BTCUSDT')
+    kline_stub.load(eth.iloc[1500:1603], 'ETHUSDT')
+    clock[0] = 1603
+    assert engine.collect_once() == {('BTCUSDT', '1m'): 103, ('ETHUSDT', '1m'): 103,
+                                     ('ETHUSDT', '5m'): 20}
+    kline_stub.load(btc.iloc[1603:], 'BTCUSDT')
+    kline_stub.load(eth.iloc[1603:], 'ETHUSDT')
+    clock[0] = 1605
+    assert engine.collect_once()[('ETHUSDT', '5m')] == 1
+
+    five = CandleStore('ETHUSDT', '5m', root).read()
+    assert candles.minutes(five['timestamp']) == list(range(500, 1605, 5))
+    np.testing.assert_array_equal(five, resample(CandleStore('ETHUSDT', '1m', root).read(), '5m'))
+    assert {q['symbol'] for q in kline_stub.requests} == {'BTCUSDT', 'ETHUSDT'}
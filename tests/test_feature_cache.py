@@ -0,0 +1,72 @@
+import os
+
+import numpy as np
+import pytest
+
+import feature_cache
+from candle_store import to_frame
+from feature_cache import FeatureCache
+from features import FEATURE_VERSION, build_feature_tensor
+
+
+def test_empty_store_is_a_clear_error(store, tmp_path):
+    with pytest.raises(FileNotFoundError, match=r"No candles in .*BTCUSDT-1m - run collect_data.py first"):
+        FeatureCache(store, root=str(tmp_path / 'features')).load()
+
+
+DAY = 24 * 60
+
+
+def cache_for(store, tmp_path):
+    return FeatureCache(store, root=str(tmp_path / 'features'))
+
+
+def assert_tensor_equal(got, expected):
+    for a, b in zip(got, expected):
+        np.testing.assert_array_equal(a, b)
+
+
+def test_matches_features_over_the_whole_store(store, candles, tmp_path):
+    minutes = [m for m in range(3 * DAY) if m != DAY + 7]   # one window missing a minute
+    store.write(candles(minutes))
+    cache = cache_for(store, tmp_path)
+
+    got = cache.load()
+    assert cache.rebuilt == 3
+    assert_tensor_equal(got, build_feature_tensor(to_frame(store.read())))
+    assert len(got[0]) == 3 * DAY // 5 - 1
+
+
+def test_only_changed_partitions_are_rebuilt(store, candles, tmp_path):
+    store.write(candles(range(2 * DAY + 100)))
+    cache_for(store, tmp_path).load()
+
+    cache = cache_for(store, tmp_path)
+    warm = cache.load()
+    assert cache.rebuilt == 0
+
+    # Same bytes, new mtime: rehashed, not rebuilt
+    os.utime(store.partition_path('2026-01-05'))
+    assert_tensor_equal(cache.load(), warm)
+    assert cache.rebuilt == 0
+
+    store.write(candles(range(2 * DAY + 100, 2 * DAY + 200)))
+    got = cache.load()
+    assert cache.rebuilt == 1
+    assert_tensor_equal(got, build_feature_tensor(to_frame(store.read())))
+    assert len(got[0]) == len(warm[0]) + 20
+    assert sorted(name for name in os.listdir(cache.path) if name.startswith('2026-01-07')) == \
+        [cache._load_index()['2026-01-07']['file']]
+
+
+def test_feature_version_gets_its_own_cache(store, candles, tmp_path, monkeypatch):
+    store.write(candles(range(DAY)))
+    v2 = cache_for(store, tmp_path)
+    v2.load()
+
+    monkeypatch.setattr(feature_cache, 'FEATURE_VERSION', FEATURE_VERSION + 1)
+    v3 = cache_for(store, tmp_path)
+    assert v3.path != v2.path and v3.path.endswith(f"v{FEATURE_VERSION + 1}")
+    v3.load()
+    assert v3.rebuilt == 1
+    assert os.path.exists(v2.index_path)
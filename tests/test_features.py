@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from features import FEATURE_COLUMNS, build_live_features, build_window_features
+
+
+def reference_features(df_1min, entry_point):
+    """The original per-window loop (windows by row count, 5 rows each)"""
+    df_1min = df_1min.reset_index(drop=True)
+    windows = []
+    for window_id in (df_1min.index // 5).unique():
+        window_data = df_1min.iloc[window_id * 5:window_id * 5 + 5]
+        if len(window_data) < 5:
+            continue
+        data_before = window_data.iloc[:entry_point]
+        features = {
+            'start_price': data_before.iloc[0]['open'],
+            'current_price': data_before.iloc[-1]['close'],
+            'high': data_before['high'].max(),
+            'low': data_before['low'].min(),
+            'volume': data_before['volume'].sum(),
+            'price_change': (data_before.iloc[-1]['close'] - data_before.iloc[0]['open']) / data_before.iloc[0]['open'],
+            'green_candles': (data_before['close'] > data_before['open']).sum(),
+            'volatility': data_before['close'].std(),
+            'volume_trend': (data_before['volume'].iloc[-1] / data_before['volume'].iloc[0]
+                             if data_before['volume'].iloc[0] > 0 else 1),
+            'return_min1': data_before.iloc[0]['close'] / data_before.iloc[0]['open'] - 1,
+            'return_min2': data_before.iloc[1]['close'] / data_before.iloc[1]['open'] - 1,
+        }
+        features['target'] = int(window_data.iloc[-1]['close'] > data_before.iloc[-1]['close'])
+        windows.append(features)
+    return pd.DataFrame(windows)
+
+
+@pytest.mark.parametrize('entry_point', [2, 3, 4])
+def test_features_match_reference_loop(candles, entry_point):
+    df = candles(range(5 * 200 + 3))   # trailing incomplete window is dropped by both
+    expected = reference_features(df, entry_point)
+    got = build_window_features(df, entry_point)
+
+    assert len(got) == len(expected) == 200
+    assert list(got.columns) == FEATURE_COLUMNS + ['target']
+    np.testing.assert_allclose(got[FEATURE_COLUMNS].to_numpy(),
+                               expected[FEATURE_COLUMNS].to_numpy(), rtol=1e-12)
+    assert np.array_equal(got['target'].to_numpy(), expected['target'].to_numpy())
+
+
+def test_missing_minute_drops_only_its_window(candles):
+    df = candles(range(5 * 20))
+    gapped = df.drop(index=7).reset_index(drop=True)   # minute 2 of window 1
+
+    full = build_window_features(df)
+    got = build_window_features(gapped)
+    assert len(got) == 19
+    assert candles.start + pd.Timedelta(minutes=5) not in got.index
+    # Windows after the gap are not shifted by it
+    pd.testing.assert_frame_equal(got.iloc[1:], full.iloc[2:])
+
+
+def test_live_features_match_training_features(candles):
+    df = candles(range(5 * 30))
+    table = build_window_features(df, entry_point=2)
+    for i in (0, 11, 29):
+        first = df.iloc[i * 5:i * 5 + 2]
+        live = build_live_features(first)
+        np.testing.assert_array_equal(live.to_numpy(), table[FEATURE_COLUMNS].iloc[[i]].to_numpy())
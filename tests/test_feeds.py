@@ -0,0 +1,59 @@
+import threading
+import time
+
+from feeds import PriceFeed, PriceSnapshot, format_latency, read_feeds
+
+
+class SlowFeed(PriceFeed):
+    """A feed whose every read takes `delay` seconds, like the REST ticker"""
+    blocking = True
+
+    def __init__(self, name, delay, price=68000.0):
+        super().__init__()
+        self.name = name
+        self.delay = delay
+        self.price = price
+        self.threads = []
+
+    def read(self):
+        self.threads.append(threading.current_thread().name)
+        time.sleep(self.delay)
+        return PriceSnapshot(self.name, self.price, time.time())
+
+
+class StreamFeed(PriceFeed):
+    """An in-memory feed, like the trade stream"""
+    name = 'stream'
+
+    def read(self):
+        return PriceSnapshot(self.name, 68001.0, time.time())
+
+
+def test_blocking_feeds_are_read_concurrently():
+    oracle, rest = SlowFeed('oracle', 0.3), SlowFeed('rest', 0.2, price=68010.0)
+    read_feeds(oracle, rest)   # start the pool threads
+
+    started = time.perf_counter()
+    oracle_snap, rest_snap = read_feeds(oracle, rest)
+    elapsed = time.perf_counter() - started
+
+    assert 0.3 <= elapsed < 0.45          # the slowest read, not 0.5s
+    assert (oracle_snap.price, rest_snap.price) == (68000.0, 68010.0)
+    assert oracle.threads[-1] != rest.threads[-1]
+
+    # Each snapshot still carries its own read's latency
+    assert 0.3 <= oracle_snap.latency < 0.4 and 0.2 <= rest_snap.latency < 0.3
+    assert format_latency(oracle_snap, rest_snap) == (
+        f"oracle {oracle_snap.latency*1000:.0f}ms, rest {rest_snap.latency*1000:.0f}ms")
+
+
+def test_stream_feeds_are_read_inline():
+    oracle, stream = SlowFeed('oracle', 0.2), StreamFeed()
+    oracle_snap, stream_snap = read_feeds(oracle, stream)
+    assert oracle.threads == [threading.current_thread().name]   # one blocking feed: no pool
+    assert stream_snap.received_at >= oracle_snap.received_at     # read after the oracle
+
+    started = time.perf_counter()
+    (snap,) = read_feeds(stream)
+    assert time.perf_counter() - started < 0.05
+    assert snap.latency < 0.01 and format_latency(snap) == "stream 0ms"
@@ -0,0 +1,69 @@
+import numpy as np
+
+from gaps import GapScanner, batch_ranges, find_gaps
+
+MINUTE_NS = 60 * 10**9
+
+
+class FakeBackfill:
+    """Serves only the minutes Binance 'has'; counts the pages requested"""
+
+    def __init__(self, candles, available):
+        self.candles = candles
+        self.available = sorted(available)
+        self.pages = []
+
+    def fetch_pages(self, pages):
+        for page in pages:
+            self.pages.append(page)
+            lo, hi = page[0] * 10**6, page[1] * 10**6
+            yield page, self.candles([m for m in self.available if lo <= self.candles.ns(m) <= hi])
+
+
+def scanner_for(store, candles, stored, available):
+    store.write(candles(stored))
+    scanner = GapScanner(store)
+    scanner.backfill = FakeBackfill(candles, available)
+    return scanner
+
+
+def test_find_gaps(candles):
+    starts, ends = find_gaps(candles.ns([0, 1, 2, 5, 6, 9]), MINUTE_NS)
+    assert candles.minutes(starts) == [3, 7]
+    assert candles.minutes(ends) == [4, 8]
+
+
+def test_batch_ranges_splits_long_gaps(candles):
+    starts, ends = candles.ns([0]), candles.ns([2499])
+    batches = batch_ranges(starts, ends, MINUTE_NS)
+    assert len(batches) == 3
+    assert batches[0] == (starts[0], candles.ns(999))
+    assert batches[-1][1] == ends[0]
+
+
+def test_repair_fills_available_minutes(store, candles):
+    stored = [m for m in range(100) if not 20 <= m < 30]
+    scanner = scanner_for(store, candles, stored, available=range(100))
+    _, starts, ends = scanner.scan()
+    added, unfillable = scanner.repair(starts, ends)
+    assert (added, unfillable) == (10, 0)
+    assert len(scanner.scan()[1]) == 0
+
+
+def test_repair_is_idempotent_after_partial_fill(store, candles):
+    # Binance has minutes 20-24 and 27 of the 20-29 hole: 25-26 and 28-29 stay missing
+    stored = [m for m in range(100) if not 20 <= m < 30]
+    available = [m for m in range(100) if m not in (25, 26, 28, 29)]
+    scanner = scanner_for(store, candles, stored, available)
+
+    _, starts, ends = scanner.scan()
+    added, unfillable = scanner.repair(starts, ends)
+    assert added == 6
+    assert unfillable == 2
+
+    # The leftover pieces are known now: a rescan finds nothing to fetch
+    _, starts, ends = scanner.scan()
+    assert len(starts) == 0
+    pages = len(scanner.backfill.pages)
+    assert scanner.repair(starts, ends) == (0, 0)
+    assert len(scanner.backfill.pages) == pages
@@ -0,0 +1,28 @@
+from features import FEATURE_COLUMNS, build_window_features
+from inference import Predictor
+
+
+def test_predictions_match_the_model_on_training_features(model_data, candles):
+    df = candles(range(5 * 600))
+    table = build_window_features(df, entry_point=2)
+    predictor = Predictor.from_model_data(model_data)
+
+    proba = model_data['model'].predict_proba(model_data['scaler'].transform(table[FEATURE_COLUMNS]))
+    for i in (0, 17, 321, 599):
+        result = predictor.predict(df.iloc[i * 5:i * 5 + 2])
+        assert result['prediction'] == ('UP' if proba[i, 1] > proba[i, 0] else 'DOWN')
+        assert result['confidence'] == proba[i].max()
+        assert result['btc_price'] == df['close'].iloc[i * 5 + 1]
+
+
+def test_only_the_last_entry_point_rows_are_used(model_data, candles):
+    df = candles(range(5 * 20))
+    predictor = Predictor.from_model_data(model_data)
+    for i in (3, 11):
+        entry = df.iloc[i * 5:i * 5 + 2]
+        with_history = df.iloc[i * 5 - 4:i * 5 + 2]    # 6 rows, ending at the entry minute
+        assert predictor.predict(with_history) == predictor.predict(entry)
+
+        o, h, l, c, v = (with_history[col].to_numpy() for col in ('open', 'high', 'low', 'close', 'volume'))
+        assert predictor.predict_arrays(o, h, l, c, v) == predictor.predict_arrays(
+            *(x[-2:] for x in (o, h, l, c, v)))
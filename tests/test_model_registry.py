@@ -0,0 +1,41 @@
+import os
+import pickle
+
+import numpy as np
+import pytest
+
+from model_registry import ChecksumError, open_predictor
+
+
+def test_open_predictor_loads_the_latest_version(registry, model_data, model_features):
+    assert registry.publish(model_data, model_features) == '0001'
+    assert registry.publish(model_data, model_features) == '0002'
+
+    predictor, name = open_predictor(registry=registry)
+    assert name == '0002 (GradientBoostingClassifier)'
+    scaled = (model_features.to_numpy() - predictor.mean) / predictor.scale
+    np.testing.assert_array_equal(predictor.proba(scaled),
+                                  model_data['model'].predict_proba(model_data['scaler'].transform(model_features)))
+    assert open_predictor('1', registry=registry)[1].startswith('0001')
+
+
+def test_unregistered_pickle_is_not_loaded(registry, model_data, tmp_path):
+    path = str(tmp_path / 'model.pkl')
+    with open(path, 'wb') as f:
+        pickle.dump(model_data, f)
+
+    with pytest.raises(FileNotFoundError, match=f"model_registry.py --import {path}"):
+        open_predictor(registry=registry, pickle_path=path)
+    with pytest.raises(FileNotFoundError, match="No model version 0007"):
+        open_predictor('7', registry=registry, pickle_path=path)
+
+
+def test_tampered_payload_is_refused(registry, model_data, model_features):
+    version = registry.publish(model_data, model_features)
+    trees = os.path.join(registry.root, version, 'trees')
+    name = sorted(os.listdir(trees))[0]
+    with open(os.path.join(trees, name), 'ab') as f:
+        f.write(b'\0')
+
+    with pytest.raises(ChecksumError, match=name):
+        open_predictor(registry=registry)
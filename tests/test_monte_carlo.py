@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from backtest_engine import confidence_of, run_backtest
+from features import build_window_features
+from monte_carlo import block_indices, bootstrap, summarize, trade_returns
+
+
+@pytest.fixture
+def trades(model_data, model_features, candles):
+    """run_backtest trades of the fixture model on its own windows (2% per trade)"""
+    outcomes = build_window_features(candles(range(5 * 600)), entry_point=2)['target'].to_numpy()
+    proba = model_data['model'].predict_proba(model_data['scaler'].transform(model_features))
+    predictions = proba.argmax(axis=1)
+    return run_backtest(predictions, confidence_of(predictions, proba), outcomes, position_size=0.02)
+
+
+def test_blocks_are_consecutive_trades():
+    idx = block_indices(np.random.default_rng(0), 200, 23, 5)
+    assert idx.shape == (200, 23)
+    for row in idx:
+        for block in np.split(row, range(5, 23, 5)):
+            assert ((np.diff(block) % 23) == 1).all()   # wrapping past the last trade
+
+
+def test_whole_sequence_blocks_reproduce_the_backtest(trades):
+    returns = trade_returns(trades)
+    assert len(returns) > 50
+
+    # One block of every trade is a rotation: same trades, same compounded bankroll
+    result = bootstrap(returns, 500, block=len(returns), position_size=0.02)
+    np.testing.assert_allclose(result['final'], trades['final'], rtol=1e-9)
+    assert not result['ruined'].any()
+
+    # Shorter blocks resample, and memory chunking does not change the draws
+    resampled = bootstrap(returns, 500, block=5, position_size=0.02)
+    assert np.ptp(resampled['final']) > 0
+    chunked = bootstrap(returns, 500, block=5, position_size=0.02, chunk_bytes=1)
+    np.testing.assert_array_equal(chunked['final'], resampled['final'])
+    np.testing.assert_array_equal(chunked['max_drawdown'], resampled['max_drawdown'])
+
+
+def test_ruined_paths_stop_trading():
+    # Lose 60% then win: 20 -> 8 -> 3.2 -> 1.28 -> 0.512 -> 0.2048, below 0.5 after five losses
+    returns = np.r_[np.full(5, -1.0), np.full(5, 10.0)]
+    result = bootstrap(returns, 50, block=10, position_size=0.6)
+    ruined = result['ruined']
+    assert ruined.any() and not ruined.all()
+
+    # Ruined paths keep the first bankroll below min_bankroll, whatever came after
+    assert (result['final'][ruined] < 0.5).all()
+    assert (result['max_drawdown'][ruined] > 0.97).all()
+
+    table, probabilities = summarize(result)
+    assert probabilities['ruin'] == ruined.mean()
+    assert probabilities['loss'] >= probabilities['ruin']
+    assert table['final_bankroll'].is_monotonic_increasing
+
+
+def test_no_trades():
+    with pytest.raises(ValueError):
+        bootstrap([], 10)
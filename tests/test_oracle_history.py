@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from chainlink_replay import synthetic_session
+from oracle_history import PHASE_SHIFT, RoundTable, decode_rounds, sync
+from rpc_replay import PHASE, RoundFeed, encode_round, serve
+
+START = 1_767_571_200
+
+
+@pytest.fixture
+def rpc():
+    """rpc(feed, max_batch=None) -> URL of rpc_replay serving the feed"""
+    servers = []
+
+    def start(feed, max_batch=None):
+        servers.append(serve(feed, port=0, max_batch=max_batch))
+        return f"http://127.0.0.1:{servers[-1].server_address[1]}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def rounds(n):
+    _, (times, prices) = synthetic_session(days=1, start=START, deviation=0.002, seed=42)
+    assert len(times) >= n
+    return times[:n], prices[:n]
+
+
+def test_sync_then_resync(rpc, tmp_path):
+    times, prices = rounds(1400)
+    feed = RoundFeed(times[:1200], prices[:1200])
+    url = rpc(feed)
+
+    table = RoundTable('0xfeed', root=str(tmp_path))
+    assert sync(table, 1000, url, batch_size=300, verbose=False) == 1000
+    assert feed.calls == 1 + 1000
+    table.save()
+
+    # Newest 1000 rounds, decoded as served
+    table = RoundTable('0xfeed', root=str(tmp_path))
+    assert len(table) == 1000
+    assert table.columns['phase'].tolist() == [PHASE] * 1000
+    assert table.columns['round'].tolist() == list(range(201, 1201))
+    np.testing.assert_array_equal(table.columns['answer'], np.round(prices[200:1200], 8))
+    np.testing.assert_array_equal(table.columns['updated_at'], times[200:1200].astype(np.int64))
+
+    feed.calls = 0
+    assert sync(table, 1000, url, verbose=False) == 0
+    assert feed.calls == 1                     # latestRoundData only
+
+    # 200 new rounds on chain: only those are fetched
+    feed.updated_at, feed.prices = times, prices
+    assert sync(table, 1000, url, verbose=False) == 200
+    assert feed.calls == 1 + 1 + 200
+    assert table.columns['round'][-1] == 1400 and len(table) == 1200
+
+
+def test_batch_over_the_provider_limit_is_an_error(rpc, tmp_path):
+    url = rpc(RoundFeed(*rounds(600)), max_batch=100)
+    table = RoundTable('0xfeed', root=str(tmp_path))
+    with pytest.raises(RuntimeError, match="batch limit"):
+        sync(table, 500, url, batch_size=200, verbose=False)
+    assert sync(table, 500, url, batch_size=100, verbose=False) == 500
+
+
+def test_decode_rounds():
+    round_id = (PHASE << PHASE_SHIFT) | 7
+    raw = [encode_round(round_id, 68123.45678901, 1767571200, 1767571201),
+           encode_round(round_id + 1, -1.5, 1767571260, 1767571262)]
+    rows = decode_rounds(raw)
+    assert rows['phase'].tolist() == [PHASE, PHASE]
+    assert rows['round'].tolist() == [7, 8]
+    assert rows['answer'].tolist() == [68123.45678901, -1.5]
+    assert rows['started_at'].tolist() == [1767571200, 1767571260]
+    assert rows['updated_at'].tolist() == [1767571201, 1767571262]
+
+    # An answer that doesn't fit in int64 is dropped
+    too_big = raw[0][:2 + 64] + f"{1 << 70:064x}" + raw[0][2 + 128:]
+    assert decode_rounds([too_big, raw[1]])['round'].tolist() == [8]
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from chainlink_replay import synthetic_session
+from oracle_tracker import OracleTracker
+from rpc_replay import RoundFeed, serve
+
+START = 1_767_571_200   # 2026-01-05
+DEVIATION = 0.002       # the feed's threshold; the tracker starts out assuming 0.1%
+
+
+@pytest.fixture
+def replay():
+    """
+    replay(volatility) -> (now, feed, rounds, tracker): a synthetic feed served
+    by rpc_replay and a tracker reading it, both on the simulated clock now[0]
+    """
+    servers = []
+
+    def start(volatility):
+        ticks, rounds = synthetic_session(days=1, start=START, volatility=volatility,
+                                          deviation=DEVIATION, seed=42)
+        now = [float(rounds[0][0])]
+        feed = RoundFeed(*rounds, speed=1, clock=lambda: now[0])
+        servers.append(serve(feed, port=0))
+        tracker = OracleTracker(f"http://127.0.0.1:{servers[-1].server_address[1]}", '0x0',
+                                reference=lambda: float(ticks[1][int(now[0]) - START]),
+                                clock=lambda: now[0])
+        return now, feed, rounds, tracker
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_far_fewer_polls_and_no_added_detection_lag(replay):
+    now, feed, (round_times, _), tracker = replay(volatility=0.0001)
+    seconds = range(int(round_times[0]), START + 2 * 3600)
+
+    lags, every_second_lags = [], []
+    seen = None
+    for t in seconds:
+        now[0] = float(t)
+        data = tracker.get()
+        if seen is not None and data['round_id'] != seen:
+            lags.append(data['delay'])
+        seen = data['round_id']
+
+        # Polling latestRoundData every second sees each round the second it posts
+        if t in round_times[1:]:
+            every_second_lags.append(0.0)
+
+    assert tracker.stats['polls'] == feed.calls
+    assert tracker.stats['polls'] < len(seconds) / 6     # vs one poll a second
+    assert tracker.stats['errors'] == 0
+    assert len(lags) == len(every_second_lags) == tracker.stats['updates'] > 100
+    assert lags == every_second_lags
+
+
+def test_learned_heartbeat_and_deviation_converge(replay):
+    now, _, (round_times, round_prices), tracker = replay(volatility=0.0002)
+    assert (tracker.heartbeat, tracker.deviation) == (60.0, 0.001)   # defaults until rounds are seen
+
+    for t in range(int(round_times[0]), START + 3600):
+        now[0] = float(t)
+        tracker.get()
+
+    # Rounds post 1s after the price tick that is 60s past the last round
+    assert tracker.heartbeat == 61
+    moves = np.abs(round_prices[1:] / round_prices[:-1] - 1)[np.diff(round_times) < 54]
+    assert DEVIATION <= moves.min() <= tracker.deviation < DEVIATION * 1.1
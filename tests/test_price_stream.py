@@ -0,0 +1,86 @@
+import asyncio
+import json
+import time
+from http import HTTPStatus
+
+from websockets.asyncio.server import serve
+
+from price_stream import PriceStream, parse_price
+from stream_replay import ReplayServer, synthetic_klines
+
+SPEED = 60        # a minute of klines per second
+DROP_EVERY = 25   # messages per connection
+
+
+def test_parse_price():
+    assert parse_price('{"e":"trade","E":1,"T":2,"p":"68000.10"}') == (68000.10, 2)
+    assert parse_price({'e': 'aggTrade', 'E': 5, 'p': '68000.5'}) == (68000.5, 5)
+    assert parse_price({'u': 1, 's': 'BTCUSDT', 'b': '68000.00', 'a': '68001.00'}) == (68000.5, None)
+    assert parse_price(json.dumps({'stream': 'btcusdt@trade',
+                                   'data': {'e': 'trade', 'T': 7, 'p': '1.5'}})) == (1.5, 7)
+    kline = next(synthetic_klines(start_ms=0, minutes=1))
+    assert parse_price(kline) == (float(kline['k']['c']), kline['E'])
+    assert parse_price({'result': None, 'id': 1}) is None
+
+
+async def play(messages, stream):
+    replay = ReplayServer(messages, speed=SPEED, drop_every=DROP_EVERY)
+    server = await replay.serve(port=0)
+    stream.ws_url = f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}"
+    run = asyncio.create_task(stream.run())
+    await asyncio.wait_for(replay.finished.wait(), timeout=30)
+    await asyncio.sleep(0.2)
+    run.cancel()
+    await asyncio.gather(run, return_exceptions=True)
+    server.close()
+    await server.wait_closed()
+
+
+def test_keeps_the_latest_price_across_drops_and_bad_messages():
+    messages = list(synthetic_klines(start_ms=0, minutes=3, updates_per_minute=20))
+    # A trade with no usable price, between two klines
+    messages.insert(10, {'e': 'trade', 'E': messages[9]['E'], 'T': messages[9]['E'], 'p': 'n/a'})
+    stream = PriceStream(stream='kline_1m')
+    asyncio.run(play(messages, stream))
+
+    # The first connection is dropped after DROP_EVERY messages, 1s of backoff
+    # is missed and the second connection sees the end
+    assert stream.stats['reconnects'] >= 1
+    assert stream.stats['bad_messages'] == 1
+    assert DROP_EVERY < stream.stats['messages'] < len(messages)
+    tick = stream.latest()
+    assert (tick.price, tick.exchange_ms) == (float(messages[-1]['k']['c']), messages[-1]['E'])
+
+    # Readers see the last tick until it is too old
+    assert stream.price(max_age=5) == tick.price
+    time.sleep(0.1)
+    assert stream.price(max_age=0.05) is None and stream.price() == tick.price
+
+
+def test_retries_a_rejected_handshake():
+    attempts = []
+
+    def process_request(connection, request):
+        attempts.append(request.path)
+        if len(attempts) == 1:
+            return connection.respond(HTTPStatus.SERVICE_UNAVAILABLE, "busy\n")
+
+    async def handler(ws):
+        await ws.send(json.dumps({'e': 'trade', 'E': 1, 'T': 1, 'p': '68123.45'}))
+        await ws.wait_closed()
+
+    async def main():
+        async with serve(handler, '127.0.0.1', 0, process_request=process_request) as server:
+            port = server.sockets[0].getsockname()[1]
+            stream = PriceStream(ws_url=f"ws://127.0.0.1:{port}").start()
+            try:
+                assert await asyncio.to_thread(stream.wait, 10)
+            finally:
+                await asyncio.to_thread(stream.stop)   # the close handshake needs this loop
+            return stream
+
+    stream = asyncio.run(main())
+    assert attempts == ['/ws/btcusdt@trade'] * 2
+    assert stream.stats['reconnects'] == 1
+    assert stream.price() == 68123.45
+    assert stream._thread is None
@@ -0,0 +1,79 @@
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from retrain_service import RetrainService, update_model
+
+
+@pytest.fixture
+def service(store, registry, tmp_path):
+    return RetrainService(store, models_dir=str(tmp_path / 'models'), min_windows=20, holdout=30,
+                          new_trees=5)
+
+
+def first_minute_after(model_data):
+    """Minute offset (from candles.start) of the first window the model has not seen"""
+    return int((model_data['trained_through'] - pd.Timestamp('2026-01-05')) / pd.Timedelta(minutes=1)) + 5
+
+
+def test_waits_for_a_model_and_for_enough_windows(service, registry, store, candles,
+                                                  model_data, model_features):
+    status, details = service.check()
+    assert status == 'waiting' and 'no model in' in details['reason']
+
+    registry.publish(model_data, model_features)
+    start = first_minute_after(model_data)
+    store.write(candles(range(start - 50, start + 5 * 49)))     # 49 new windows < 20 + 30
+    assert service.check() == ('waiting', {'new_windows': 49})
+
+
+def test_publishes_an_update_fit_on_the_new_windows(service, registry, store, candles,
+                                                    model_data, model_features):
+    registry.publish(model_data, model_features)
+    start = first_minute_after(model_data)
+    store.write(candles(range(start, start + 5 * 80), seed=3))
+    service.tolerance = 10.0   # accept whatever the holdout says
+
+    status, details = service.check()
+    assert status == 'published'
+    assert details['mode'] == 'update' and details['new_windows'] == 50
+    assert details['version'] == '0002' == registry.latest()
+    assert details['trained_through'] == candles.start + pd.Timedelta(minutes=start + 5 * 49)
+
+    published = registry.open().model_data()
+    assert registry.open().manifest['parent'] == '0001'
+    assert published['model'].n_estimators_ == model_data['model'].n_estimators_ + 5
+    assert model_data['model'].n_estimators_ == 20             # the current model is left alone
+    with open(service.models_dir + '/model.pkl', 'rb') as f:
+        assert pickle.load(f)['trained_through'] == details['trained_through']
+
+    # Only the 30 holdout windows are new now
+    assert service.check() == ('waiting', {'new_windows': 30})
+
+
+def test_a_worse_update_is_rejected_and_not_retried(service, registry, store, candles,
+                                                    model_data, model_features):
+    registry.publish(model_data, model_features)
+    start = first_minute_after(model_data)
+    store.write(candles(range(start, start + 5 * 80), seed=3))
+    service.tolerance = -10.0  # nothing is good enough
+
+    status, details = service.check()
+    assert status == 'rejected' and registry.latest() == '0001'
+    assert service.rejected_through == candles.start + pd.Timedelta(minutes=start + 5 * 49)
+    assert service.check() == ('waiting', {'new_windows': 30})
+
+
+def test_forest_update_adds_trees_and_caps_the_size():
+    rng = np.random.default_rng(0)
+    X, y = rng.normal(size=(300, 4)), rng.integers(0, 2, 300)
+    forest = RandomForestClassifier(n_estimators=10, random_state=0).fit(X[:200], y[:200])
+
+    updated = update_model(forest, X[200:], y[200:], new_trees=6, max_trees=12)
+    assert len(updated.estimators_) == 12 and len(forest.estimators_) == 10
+    # The 4 oldest trees are dropped, the rest kept in order
+    assert [t.random_state for t in updated.estimators_[:6]] == \
+        [t.random_state for t in forest.estimators_[4:]]
@@ -0,0 +1,72 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+
+from gaps import GapScanner
+from stream_collector import StreamCollector, parse_kline
+from stream_replay import ReplayServer, synthetic_klines
+
+MINUTES = 30
+UPDATES = 10      # kline messages per minute
+SPEED = 300       # 0.2s per minute; the 1s reconnect backoff misses ~5 minutes
+DROP_EVERY = 60   # messages per connection
+
+
+def replayed_minutes(candles):
+    """The synthetic stream, and its closed candles as the REST API would serve them"""
+    messages = list(synthetic_klines(start_ms=int(candles.ns(0)) // 10**6, minutes=MINUTES,
+                                     updates_per_minute=UPDATES))
+    records = [parse_kline(m)[2] for m in messages if m['k']['x']]
+    frame = pd.DataFrame.from_records(records, columns=['timestamp', 'open', 'high', 'low',
+                                                        'close', 'volume', 'trades'])
+    frame['timestamp'] = pd.to_datetime(frame['timestamp'])
+    return messages, frame
+
+
+async def collect(messages, store, rest_url):
+    replay = ReplayServer(messages, speed=SPEED, drop_every=DROP_EVERY)
+    server = await replay.serve(port=0)
+    port = server.sockets[0].getsockname()[1]
+    collector = StreamCollector(ws_url=f"ws://127.0.0.1:{port}", rest_url=rest_url, store=store)
+
+    run = asyncio.create_task(collector.run())
+    await asyncio.wait_for(replay.finished.wait(), timeout=60)
+    await asyncio.sleep(0.2)
+    run.cancel()
+    await asyncio.gather(run, return_exceptions=True)
+    server.close()
+    await server.wait_closed()
+    return collector
+
+
+def test_reconnects_and_backfills_the_missed_minutes(kline_stub, store, candles):
+    messages, frame = replayed_minutes(candles)
+    kline_stub.load(frame)
+    collector = asyncio.run(collect(messages, store, kline_stub.url))
+
+    assert collector.stats['reconnects'] >= 1
+    assert collector.stats['backfilled'] >= 3
+    assert len(kline_stub.requests) >= 1   # one backfill per reconnect that saw the stream again
+
+    stored = store.load_frame()
+    minutes = candles.minutes(stored['timestamp'])
+    # Every outage followed by more stream is backfilled; one at the very end can't be yet
+    assert minutes == list(range(minutes[0], minutes[-1] + 1))
+    assert minutes[0] <= 1 and minutes[-1] >= MINUTES - 8
+    expected = frame.set_index('timestamp').loc[stored['timestamp']].reset_index()
+    pd.testing.assert_frame_equal(stored[expected.columns], expected, check_dtype=False)
+
+    _, starts, _ = GapScanner(store).scan()
+    assert len(starts) == 0
+
+
+def test_without_backfill_the_gap_shows_up_in_the_scan(store, candles):
+    messages, _ = replayed_minutes(candles)
+    collector = asyncio.run(collect(messages, store, rest_url=None))
+
+    assert collector.stats['reconnects'] >= 1 and collector.stats['backfilled'] == 0
+    ts, starts, ends = GapScanner(store).scan()
+    assert len(starts) >= 1
+    missing = np.sum((ends - starts) // 60_000_000_000 + 1)
+    assert len(ts) + missing == candles.minutes(ts[-1:])[0] - candles.minutes(ts[:1])[0] + 1
@@ -0,0 +1,52 @@
+import pytest
+import requests
+
+from transport import Transport, probe
+
+
+@pytest.fixture
+def transport(https_stub):
+    transport = Transport(verify=https_stub.cafile)
+    yield transport
+    transport.close()
+
+
+def test_repeated_calls_reuse_one_connection(https_stub, transport):
+    url = f"{https_stub.url}/api/v3/ticker/price"
+    for _ in range(20):
+        response = transport.get(url, timeout=2)
+        assert response.json()['price'] == '68123.45'
+    assert https_stub.connections == 1
+    assert list(transport.sessions) == [https_stub.url]
+
+
+def test_prewarm_opens_the_connection_requests_reuse(https_stub, transport):
+    url = f"{https_stub.url}/api/v3/ticker/price"
+    warmed = transport.prewarm(url)
+    assert warmed[url] is not None and https_stub.connections == 1
+
+    for _ in range(5):
+        transport.get(url).close()
+    assert https_stub.connections == 1
+
+
+def test_prewarm_reports_unreachable_hosts(https_stub, transport):
+    https_stub.shutdown()
+    https_stub.server_close()
+    url = f"{https_stub.url}/"
+    assert transport.prewarm(url, timeout=0.5) == {url: None}
+
+
+def test_certificate_is_checked(https_stub):
+    with pytest.raises(requests.exceptions.SSLError):
+        Transport(verify=True).get(https_stub.url, timeout=2)
+
+
+def test_probe_times_each_phase_on_a_new_connection(https_stub):
+    timings = [probe(f"{https_stub.url}/api/v3/ping", cafile=https_stub.cafile) for _ in range(3)]
+    assert https_stub.connections == 3
+    for t in timings:
+        assert t['status'] == 200
+        assert min(t['dns'], t['connect'], t['tls'], t['ttfb']) >= 0
+        assert t['tls'] > 0
+        assert t['total'] >= t['dns'] + t['connect'] + t['tls'] + t['ttfb']
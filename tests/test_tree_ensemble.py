@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+
+from tree_ensemble import TreeEnsemble, supports
+
+MODELS = {
+    'rf': lambda: RandomForestClassifier(n_estimators=30, max_depth=8, random_state=0, n_jobs=1),
+    'rf_full_depth': lambda: RandomForestClassifier(n_estimators=10, random_state=0, n_jobs=1),
+    'gb': lambda: GradientBoostingClassifier(n_estimators=40, random_state=0),
+    'gb_subsample': lambda: GradientBoostingClassifier(n_estimators=30, subsample=0.7,
+                                                       max_depth=4, random_state=0),
+}
+
+
+def dataset(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    # Mixed scales, like unscaled prices next to returns
+    X = rng.normal(size=(n, 6)) * [1e4, 1, 1e-3, 1, 10, 1]
+    y = (X[:, 1] + X[:, 2] * 1e3 + rng.normal(size=n) > 0).astype(int)
+    return X, y
+
+
+@pytest.mark.parametrize('name', MODELS)
+def test_predictions_match_sklearn_exactly(name):
+    X, y = dataset()
+    model = MODELS[name]().fit(X[:2000], y[:2000])
+    ensemble = TreeEnsemble.from_model(model)
+
+    X_test = X[2000:]
+    assert np.array_equal(ensemble.predict_proba(X_test), model.predict_proba(X_test))
+    assert np.array_equal(ensemble.predict_proba(X_test[:1]), model.predict_proba(X_test[:1]))
+
+
+@pytest.mark.parametrize('mmap', [True, False])
+def test_save_and_load(tmp_path, mmap):
+    X, y = dataset()
+    model = MODELS['gb']().fit(X, y)
+    TreeEnsemble.from_model(model).save(str(tmp_path / 'trees'))
+
+    loaded = TreeEnsemble.load(str(tmp_path / 'trees'), mmap=mmap)
+    assert np.array_equal(loaded.predict_proba(X), model.predict_proba(X))
+    assert loaded.classes.tolist() == [0, 1]
+
+
+def test_unsupported_models():
+    X, y = dataset(200)
+    model = LogisticRegression(max_iter=1000).fit(X[:, 1:], y)
+    assert not supports(model)
+    with pytest.raises(TypeError):
+        TreeEnsemble.from_model(model)
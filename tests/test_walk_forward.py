@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+from sklearn.metrics import log_loss
+from sklearn.preprocessing import StandardScaler
+
+from features import FEATURE_COLUMNS, build_window_features
+from walk_forward import build_model, make_folds, simulated_pnl, walk_forward_search
+
+GRID = [('logreg', {'C': 1.0}), ('logreg', {'C': 1e-6}),
+        ('gb', {'n_estimators': 10, 'max_depth': 2, 'learning_rate': 0.1})]
+
+
+@pytest.mark.parametrize('mode', ['expanding', 'rolling'])
+def test_folds_train_only_on_the_past(mode):
+    folds = make_folds(700, n_folds=6, mode=mode, window=2)
+    assert len(folds) == 6
+    tests = [np.arange(700)[test] for _, test in folds]
+    assert np.array_equal(np.concatenate(tests), np.arange(100, 700))
+    for i, (train, test) in enumerate(folds, 1):
+        assert train.stop == test.start
+        assert train.start == (0 if mode == 'expanding' else max(0, i - 2) * 100)
+
+
+def test_simulated_pnl():
+    proba = np.array([[0.3, 0.7], [0.8, 0.2], [0.45, 0.55]])
+    pnl, trades = simulated_pnl(proba, np.array([1, 1, 0]))
+    assert trades == 2                                   # 55% is under MIN_CONFIDENCE
+    assert pnl == pytest.approx(1 / 0.6 - 1 - 1)
+
+
+def test_parallel_search_matches_serial_evaluation(candles):
+    table = build_window_features(candles(range(5 * 600)), entry_point=2)
+    X, y = table[FEATURE_COLUMNS].to_numpy(), table['target'].to_numpy()
+
+    results = walk_forward_search(X, y, GRID, n_folds=3, workers=2, verbose=False)
+    assert sorted(results.index) == [0, 1, 2]
+    assert results['log_loss'].is_monotonic_increasing
+
+    for config_id, (family, params) in enumerate(GRID):
+        losses, pnl = [], 0.0
+        for train, test in make_folds(len(X), 3):
+            scaler = StandardScaler().fit(X[train])
+            model = build_model(family, params).fit(scaler.transform(X[train]), y[train])
+            proba = model.predict_proba(scaler.transform(X[test]))
+            losses.append(log_loss(y[test], proba, labels=[0, 1]))
+            pnl += simulated_pnl(proba, y[test])[0]
+        row = results.loc[config_id]
+        assert row['log_loss'] == pytest.approx(np.mean(losses), rel=1e-12)
+        assert row['pnl'] == pytest.approx(pnl, rel=1e-12)
+        assert row['family'] == family and row['params'] == params
+
+
+def test_search_ranks_the_informative_model_first():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(1200, 3))
+    y = (X[:, 0] + 0.5 * rng.normal(size=1200) > 0).astype(int)
+
+    results = walk_forward_search(X, y, GRID[:2], n_folds=3, mode='rolling', workers=2, verbose=False)
+    assert results['config'].tolist() == ['logreg(C=1.0)', 'logreg(C=1e-06)']
+    assert results['accuracy'].iloc[0] > 0.8
+    assert results['log_loss'].iloc[1] == pytest.approx(np.log(2), abs=0.01)   # near-constant 50/50
@@ -0,0 +1,21 @@
+import pandas as pd
+
+from windowing import WindowIndex, timestamps_ns
+
+
+def test_windows_follow_wall_clock(candles):
+    df = candles(range(3, 53))              # starts at :03
+    index = WindowIndex(timestamps_ns(df))
+    assert len(index) == 11
+    assert index.complete.sum() == 9        # the first and last windows are partial
+    assert index.locate(candles.start + pd.Timedelta(minutes=7, seconds=30)) == 1
+    assert index.locate(candles.start - pd.Timedelta(minutes=5)) is None
+
+
+def test_duplicate_minute_keeps_the_later_row(candles):
+    df = candles([0, 1, 2, 2, 3, 4])
+    index = WindowIndex.from_frame(df)
+    assert index.complete.tolist() == [True]
+    assert index.grid[0].tolist() == [0, 1, 3, 4, 5]
+    close = df['close'].to_numpy()
+    assert index.window_arrays(df, columns=('close',))['close'][0].tolist() == close[[0, 1, 3, 4, 5]].tolist()
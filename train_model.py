@@ -1,109 +1,142 @@
-import pandas as pd
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import accuracy_score
 import pickle
 import os
+import sys
 import warnings
+from features import parse_entry_points
+from feature_cache import load_feature_tensor, entry_table
+from walk_forward import build_model, config_name, walk_forward_search
+from model_registry import ModelRegistry
 warnings.filterwarnings('ignore')
 
-print("="*60)
-print("TRAINING BTC 2-MINUTE ENTRY MODEL")
-print("="*60)
-
-# Load data
-df_1min = pd.read_csv('data/btc_1min.csv')
-df_1min['window'] = (df_1min.index // 5)
-
-print(f"Loaded {len(df_1min)} 1-minute candles")
-
-# Create 2-minute entry features
-ENTRY_POINT = 2
-windows = []
-
-for window_id in df_1min['window'].unique():
-    window_data = df_1min[df_1min['window'] == window_id].copy()
-    
-    if len(window_data) < 5:
-        continue
-    
-    data_before = window_data.iloc[:ENTRY_POINT]
-    
-    features = {
-        'start_price': data_before.iloc[0]['open'],
-        'current_price': data_before.iloc[-1]['close'],
-        'high': data_before['high'].max(),
-        'low': data_before['low'].min(),
-        'volume': data_before['volume'].sum(),
-        'price_change': (data_before.iloc[-1]['close'] - data_before.iloc[0]['open']) / data_before.iloc[0]['open'],
-        'green_candles': (data_before['close'] > data_before['open']).sum(),
-        'volatility': data_before['close'].std(),
-        'volume_trend': data_before['volume'].iloc[-1] / data_before['volume'].iloc[0] if data_before['volume'].iloc[0] > 0 else 1,
-        'return_min1': data_before.iloc[0]['close'] / data_before.iloc[0]['open'] - 1,
-        'return_min2': data_before.iloc[1]['close'] / data_before.iloc[1]['open'] - 1,
+
+def default_models():
+    return {
+        'Random Forest': RandomForestClassifier(n_estimators=200, max_depth=10, random_state=42, n_jobs=-1),
+        'Gradient Boosting': GradientBoostingClassifier(n_estimators=150, learning_rate=0.1, random_state=42)
+    }
+
+
+def search_models(df):
+    """Walk-forward search on the training 80% only, returns the winning config"""
+    split = int(len(df) * 0.8)
+    X = df.drop(columns='target').to_numpy(dtype=np.float64)[:split]
+    y = df['target'].to_numpy()[:split]
+
+    results = walk_forward_search(X, y)
+    print(results.head(5)[['config', 'log_loss', 'accuracy', 'pnl', 'trades']].to_string(index=False))
+    top = results.iloc[0]
+    return {config_name(top['family'], top['params']): build_model(top['family'], top['params'])}
+
+
+def train(df, entry_point, models=None):
+    feature_cols = [col for col in df.columns if col != 'target']
+    X = df[feature_cols]
+    y = df['target']
+
+    split = int(len(df) * 0.8)
+    X_train, X_test = X.iloc[:split], X.iloc[split:]
+    y_train, y_test = y.iloc[:split], y.iloc[split:]
+
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train)
+    X_test_scaled = scaler.transform(X_test)
+
+    # Try both models (or the walk-forward winner)
+    models = models or default_models()
+
+    best_acc = 0
+    best_model = None
+
+    for name, model in models.items():
+        model.fit(X_train_scaled, y_train)
+        acc = accuracy_score(y_test, model.predict(X_test_scaled))
+        print(f"{name}: {acc*100:.2f}%")
+        
+        if acc > best_acc:
+            best_acc = acc
+            best_model = model
+
+    return {
+        'model': best_model,
+        'scaler': scaler,
+        'feature_columns': feature_cols,
+        'accuracy': best_acc,
+        'entry_point': entry_point,
+        # Last window the model has seen, retrain_service.py continues from here
+        'trained_through': df.index[split - 1]
     }
-    
-    final_price = window_data.iloc[-1]['close']
-    current_price = data_before.iloc[-1]['close']
-    features['target'] = 1 if final_price > current_price else 0
-    
-    windows.append(features)
-
-df = pd.DataFrame(windows)
-print(f"Created {len(df)} windows")
-
-# Train
-feature_cols = [col for col in df.columns if col != 'target']
-X = df[feature_cols]
-y = df['target']
-
-split = int(len(df) * 0.8)
-X_train, X_test = X[:split], X[split:]
-y_train, y_test = y[:split], y[split:]
-
-scaler = StandardScaler()
-X_train_scaled = scaler.fit_transform(X_train)
-X_test_scaled = scaler.transform(X_test)
-
-# Try both models
-models = {
-    'Random Forest': RandomForestClassifier(n_estimators=200, max_depth=10, random_state=42, n_jobs=-1),
-    'Gradient Boosting': GradientBoostingClassifier(n_estimators=150, learning_rate=0.1, random_state=42)
-}
-
-best_acc = 0
-best_model = None
-
-for name, model in models.items():
-    model.fit(X_train_scaled, y_train)
-    acc = accuracy_score(y_test, model.predict(X_test_scaled))
-    print(f"{name}: {acc*100:.2f}%")
-    
-    if acc > best_acc:
-        best_acc = acc
-        best_model = model
-
-print(f"\n✅ Best: {best_acc*100:.2f}% accuracy")
-
-# Save
-os.makedirs('models', exist_ok=True)
-model_data = {
-    'model': best_model,
-    'scaler': scaler,
-    'feature_columns': feature_cols,
-    'accuracy': best_acc
-}
-
-with open('models/model.pkl', 'wb') as f:
-    pickle.dump(model_data, f)
-
-print("✅ Saved to models/model.pkl")
-
-if best_acc > 0.55:
-    print("\n✅ GOOD! Accuracy >55% - Should be profitable")
-    print("Next: python3 backtest.py")
-elif best_acc > 0.52:
-    print("\n⚠️ MARGINAL - May barely beat fees")
-else:
-    print("\n❌ TOO LOW - Need more data")
+
+
+def main(argv):
+    # Entry point(s) in minutes: python3 train_model.py 3   or   python3 train_model.py 1,2,3,4
+    # --search picks the model by parallel walk-forward search instead
+    search = '--search' in argv
+    argv = [a for a in argv if a != '--search']
+    entry_points = parse_entry_points(argv[0] if argv else '2')
+
+    print("="*60)
+    print(f"TRAINING BTC {','.join(map(str, entry_points))}-MINUTE ENTRY MODEL")
+    print("="*60)
+
+    # Features for every entry point (cached per day of candles)
+    tensor = load_feature_tensor()
+    print(f"Created {len(tensor[0])} windows")
+
+    results = {}
+    for entry_point in entry_points:
+        if len(entry_points) > 1:
+            print(f"\nEntry at minute {entry_point}:")
+        df = entry_table(tensor, entry_point)
+        results[entry_point] = train(df, entry_point, search_models(df) if search else None)
+
+    best = max(results.values(), key=lambda r: r['accuracy'])
+    best_acc = best['accuracy']
+
+    if len(entry_points) > 1:
+        print("\nEntry point comparison:")
+        for entry_point, result in results.items():
+            print(f"  Minute {entry_point}: {result['accuracy']*100:.2f}%")
+
+    print(f"\n✅ Best: {best_acc*100:.2f}% accuracy (entry at minute {best['entry_point']})")
+
+    # Save
+    os.makedirs('models', exist_ok=True)
+
+    if len(entry_points) > 1:
+        for entry_point, result in results.items():
+            with open(f'models/model_ep{entry_point}.pkl', 'wb') as f:
+                pickle.dump(result, f)
+        print(f"✅ Saved models/model_ep{{{','.join(map(str, entry_points))}}}.pkl")
+
+    with open('models/model.pkl', 'wb') as f:
+        pickle.dump(best, f)
+
+    print("✅ Saved to models/model.pkl")
+
+    # Registry copy for the live scripts, trees checked against sklearn on the test split
+    df = entry_table(tensor, best['entry_point'])
+    split = int(len(df) * 0.8)
+    version = ModelRegistry().publish(
+        best, df[best['feature_columns']].iloc[split:],
+        metrics={'accuracy': best_acc, 'test_windows': len(df) - split},
+        data_range={'symbol': 'BTCUSDT', 'interval': '1m', 'first_window': df.index[0],
+                    'trained_through': best['trained_through'], 'train_windows': split},
+    )
+    print(f"✅ Registered as model {version} (models/registry)")
+
+    if best_acc > 0.55:
+        print("\n✅ GOOD! Accuracy >55% - Should be profitable")
+        print("Next: python3 backtest.py")
+    elif best_acc > 0.52:
+        print("\n⚠️ MARGINAL - May barely beat fees")
+    else:
+        print("\n❌ TOO LOW - Need more data")
+
+
+# Guarded so walk-forward worker processes can import this module
+if __name__ == "__main__":
+    main(sys.argv[1:])
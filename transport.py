@@ -0,0 +1,191 @@
+"""
+TRANSPORT
+==========
+Shared keep-alive HTTP client for the bots, feeds and collectors.
+
+- One requests.Session per host (scheme://host:port), each with its own
+  connection pool, so repeat calls reuse an open TCP+TLS connection
+  instead of paying a new handshake every time
+- Short connect timeout; callers keep their own read timeouts
+- prewarm() opens connections ahead of time (the arb bot does it just
+  before the entry window)
+- probe() times one request on a fresh connection, split into
+  DNS / TCP connect / TLS / time to first byte
+
+`client` is the process-wide instance. It has the get/post interface
+of requests, so it can also be passed as fetch_klines(session=...).
+
+Usage:
+    python3 transport.py https://api.binance.com/api/v3/ping
+    python3 transport.py https://localhost:8443/ --cafile cert.pem --repeat 50
+"""
+
+import argparse
+import socket
+import ssl
+import threading
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+
+CONNECT_TIMEOUT = 1.0
+READ_TIMEOUT = 5.0
+POOL_SIZE = 10
+
+
+def host_key(url):
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class Transport:
+    """Per-host pooled sessions"""
+
+    def __init__(self, pool_size=POOL_SIZE, connect_timeout=CONNECT_TIMEOUT, verify=True):
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.verify = verify
+        self.sessions = {}
+        self.lock = threading.Lock()
+
+    def session(self, url):
+        """Session pooling connections to the host of `url`"""
+        key = host_key(url)
+        with self.lock:
+            session = self.sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                session.mount(key, HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size))
+                self.sessions[key] = session
+        return session
+
+    def timeout(self, timeout=None):
+        """(connect, read) timeouts; a single number is the read timeout"""
+        if isinstance(timeout, tuple):
+            return timeout
+        read = READ_TIMEOUT if timeout is None else timeout
+        return min(self.connect_timeout, read), read
+
+    def request(self, method, url, timeout=None, **kwargs):
+        # Per request: requests lets REQUESTS_CA_BUNDLE override session.verify
+        kwargs.setdefault('verify', self.verify)
+        return self.session(url).request(method, url, timeout=self.timeout(timeout), **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def prewarm(self, *urls, timeout=2.0):
+        """Open a pooled connection to each URL's host; returns {url: seconds or None}"""
+        result = {}
+        for url in urls:
+            started = time.perf_counter()
+            try:
+                self.request('HEAD', url, timeout=timeout).close()
+                result[url] = time.perf_counter() - started
+            except requests.RequestException:
+                result[url] = None
+        return result
+
+    def close(self):
+        with self.lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions.clear()
+
+
+client = Transport()
+
+
+def probe(url, method='GET', body=b'', timeout=5.0, cafile=None, verify=True):
+    """
+    One request on a new connection, timed by phase (seconds):
+    dns, connect, tls (0 for http), ttfb (request sent -> first byte), total
+    """
+    parts = urlsplit(url)
+    https = parts.scheme == 'https'
+    port = parts.port or (443 if https else 80)
+    path = (parts.path or '/') + (f"?{parts.query}" if parts.query else '')
+
+    started = time.perf_counter()
+    family, kind, proto, _, address = socket.getaddrinfo(parts.hostname, port, type=socket.SOCK_STREAM)[0]
+    resolved = time.perf_counter()
+
+    sock = socket.socket(family, kind, proto)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(address)
+        connected = time.perf_counter()
+
+        if https:
+            context = ssl.create_default_context(cafile=cafile)
+            if not verify:
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+            sock = context.wrap_socket(sock, server_hostname=parts.hostname)
+        secured = time.perf_counter()
+
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {parts.netloc}\r\n"
+                f"Accept: */*\r\nConnection: close\r\n")
+        if body:
+            head += f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+        sock.sendall(head.encode() + b"\r\n" + body)
+
+        response = sock.recv(65536)
+        first_byte = time.perf_counter()
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            response += chunk
+        finished = time.perf_counter()
+    finally:
+        sock.close()
+
+    return {
+        'status': int(response.split(b' ', 2)[1]) if response else None,
+        'dns': resolved - started,
+        'connect': connected - resolved,
+        'tls': secured - connected,
+        'ttfb': first_byte - secured,
+        'total': finished - started,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time requests on new vs pooled connections")
+    parser.add_argument('url')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--cafile', default=None, help="CA bundle, e.g. a local stub's certificate")
+    parser.add_argument('--insecure', action='store_true', help="Skip certificate checks")
+    args = parser.parse_args()
+    verify = False if args.insecure else (args.cafile or True)
+
+    print("="*60)
+    print(f"TRANSPORT PROBE - {args.url}")
+    print("="*60)
+
+    probes = [probe(args.url, cafile=args.cafile, verify=not args.insecure) for _ in range(args.repeat)]
+    print(f"New connection (median of {args.repeat}, status {probes[-1]['status']}):")
+    for phase in ['dns', 'connect', 'tls', 'ttfb', 'total']:
+        print(f"  {phase:<8} {np.median([p[phase] for p in probes])*1000:8.2f} ms")
+
+    def timings(get):
+        out = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            get(args.url, timeout=READ_TIMEOUT, verify=verify).close()
+            out.append(time.perf_counter() - started)
+        return np.percentile(out, [50, 99]) * 1000
+
+    pooled = Transport(verify=verify)
+    pooled.prewarm(args.url)
+    fresh = timings(requests.get)
+    reused = timings(lambda url, **kwargs: pooled.get(url, **kwargs))
+    print(f"\nrequests.get (new connection): p50 {fresh[0]:8.2f} ms   p99 {fresh[1]:8.2f} ms")
+    print(f"Transport (kept alive):        p50 {reused[0]:8.2f} ms   p99 {reused[1]:8.2f} ms")
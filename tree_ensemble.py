@@ -0,0 +1,200 @@
+"""
+TREE ENSEMBLE
+==============
+Array-backed evaluator for the trained RandomForest / GradientBoosting
+classifiers.
+
+Every tree is flattened into one set of contiguous arrays (feature,
+threshold, left, right, value) with global node ids. Leaves point to
+themselves, so all trees for a batch of rows are walked together in
+max_depth vectorized steps instead of one sklearn call per tree.
+
+Probabilities match sklearn exactly:
+- rows are cast to float32 before comparing with thresholds, as sklearn
+  does
+- RF: per-tree normalized leaf values summed in tree order, / n_trees
+- GB: init raw score + learning_rate * leaf value per stage, summed in
+  stage order, then the logistic sigmoid
+
+The arrays are saved as .npy files and loaded memory-mapped, without
+importing sklearn (model_registry.py stores them as the model payload).
+"""
+
+import json
+import os
+
+import numpy as np
+from scipy.special import expit, logit
+
+FOREST = 'forest'
+BOOSTING = 'boosting'
+ARRAYS = ['feature', 'threshold', 'left', 'right', 'value', 'roots']
+
+
+def supports(model):
+    from sklearn.dummy import DummyClassifier
+    from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+
+    if isinstance(model, RandomForestClassifier):
+        return model.n_outputs_ == 1
+    if isinstance(model, GradientBoostingClassifier):
+        return model.n_classes_ == 2 and (model.init_ == 'zero' or isinstance(model.init_, DummyClassifier))
+    return False
+
+
+def _flatten(trees, leaf_values):
+    """Concatenate sklearn Tree objects into global-id node arrays; returns (arrays, depth)"""
+    sizes = [tree.node_count for tree in trees]
+    offsets = np.r_[0, np.cumsum(sizes)[:-1]].astype(np.int64)
+
+    feature, threshold, left, right = [], [], [], []
+    for tree, offset in zip(trees, offsets):
+        ids = np.arange(tree.node_count, dtype=np.int64) + offset
+        leaf = tree.children_left == -1
+        feature.append(np.where(leaf, 0, tree.feature).astype(np.int64))
+        threshold.append(np.where(leaf, np.inf, tree.threshold))
+        left.append(np.where(leaf, ids, tree.children_left + offset))
+        right.append(np.where(leaf, ids, tree.children_right + offset))
+
+    return {
+        'feature': np.concatenate(feature),
+        'threshold': np.concatenate(threshold),
+        'left': np.concatenate(left),
+        'right': np.concatenate(right),
+        'value': np.concatenate([leaf_values(tree) for tree in trees]),
+        'roots': offsets,
+    }, max(tree.max_depth for tree in trees)
+
+
+class TreeEnsemble:
+    """Flat arrays of a fitted ensemble with a vectorized predict_proba"""
+
+    def __init__(self, kind, arrays, depth, classes, base=0.0):
+        self.kind = kind
+        self.arrays = arrays
+        self.depth = int(depth)
+        self.classes = np.asarray(classes)
+        self.base = float(base)
+        for name, array in arrays.items():
+            setattr(self, name, array)
+
+    @classmethod
+    def from_model(cls, model):
+        from sklearn.ensemble import RandomForestClassifier
+
+        if not supports(model):
+            raise TypeError(f"Unsupported model: {type(model).__name__}")
+
+        if isinstance(model, RandomForestClassifier):
+            def leaf_values(tree):
+                # Class fractions, normalized like DecisionTreeClassifier.predict_proba
+                value = tree.value[:, 0, :]
+                total = value.sum(axis=1, keepdims=True)
+                total[total == 0] = 1
+                return value / total
+
+            trees = [estimator.tree_ for estimator in model.estimators_]
+            return cls(FOREST, *_flatten(trees, leaf_values), model.classes_)
+
+        lr = model.learning_rate
+        trees = [estimator.tree_ for estimator in model.estimators_[:, 0]]
+        if model.init_ == 'zero':
+            base = 0.0
+        else:
+            prior = model.init_.predict_proba(np.zeros((1, model.n_features_in_)))[0, 1]
+            eps = np.finfo(np.float64).eps
+            base = logit(np.clip(prior, eps, 1 - eps))
+        return cls(BOOSTING, *_flatten(trees, lambda tree: lr * tree.value[:, 0, 0]), model.classes_, base)
+
+    def apply(self, X):
+        """(n_rows, n_trees) global leaf ids"""
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(len(X))[:, None]
+        nodes = np.broadcast_to(self.roots, (len(X), len(self.roots))).copy()
+        for _ in range(self.depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def predict_proba(self, X):
+        leaves = self.apply(X).T
+
+        if self.kind == FOREST:
+            # Reducing the leading axis adds tree by tree, in sklearn's order
+            proba = np.add.reduce(self.value[leaves], axis=0)
+            proba /= len(self.roots)
+            return proba
+
+        raw = np.empty((len(self.roots) + 1, leaves.shape[1]))
+        raw[0] = self.base
+        raw[1:] = self.value[leaves]
+        # cumsum adds stage by stage; add.reduce would switch to pairwise
+        # summation when the stage axis is contiguous (a single row)
+        raw = np.cumsum(raw, axis=0)[-1]
+
+        proba = np.empty((len(raw), 2))
+        proba[:, 1] = expit(raw)
+        proba[:, 0] = 1 - proba[:, 1]
+        return proba
+
+    def save(self, path):
+        """Write the arrays + trees.json into directory `path`; returns the file names"""
+        os.makedirs(path, exist_ok=True)
+        files = []
+        for name in ARRAYS:
+            np.save(os.path.join(path, f"{name}.npy"), np.ascontiguousarray(self.arrays[name]))
+            files.append(f"{name}.npy")
+
+        with open(os.path.join(path, 'trees.json'), 'w') as f:
+            json.dump({'kind': self.kind, 'depth': self.depth,
+                       'classes': self.classes.tolist(), 'base': self.base}, f)
+        return files + ['trees.json']
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        with open(os.path.join(path, 'trees.json')) as f:
+            meta = json.load(f)
+        arrays = {
+            # Plain ndarray views of the maps: indexing a np.memmap is slower
+            name: np.load(os.path.join(path, f"{name}.npy"),
+                          mmap_mode='r' if mmap else None).view(np.ndarray)
+            for name in ARRAYS
+        }
+        return cls(meta['kind'], arrays, meta['depth'], meta['classes'], meta['base'])
+
+
+def scaler_arrays(scaler, n):
+    """(mean, scale) such that StandardScaler.transform(x) == (x - mean) / scale"""
+    mean = scaler.mean_ if scaler.with_mean else np.zeros(n)
+    scale = scaler.scale_ if scaler.with_std else np.ones(n)
+    return np.asarray(mean, dtype=np.float64), np.asarray(scale, dtype=np.float64)
+
+
+def compile_model(model_data, X_check):
+    """
+    TreeEnsemble of a train_model.py model dict, after checking on X_check
+    (raw feature rows) that both the folded scaler and predict_proba agree
+    exactly with sklearn. Raises ValueError otherwise.
+    """
+    model = model_data['model']
+    ensemble = TreeEnsemble.from_model(model)
+    scaler = model_data['scaler']
+    mean, scale = scaler_arrays(scaler, len(model_data['feature_columns']))
+    X_scaled = scaler.transform(X_check)
+    if not np.array_equal(X_scaled, (np.asarray(X_check, dtype=np.float64) - mean) / scale):
+        raise ValueError("Scaler arrays disagree with scaler.transform")
+
+    # Threaded sklearn sums trees in completion order; compare to the serial order
+    n_jobs = getattr(model, 'n_jobs', None)
+    if n_jobs is not None:
+        model.set_params(n_jobs=1)
+    try:
+        expected = model.predict_proba(X_scaled)
+    finally:
+        if n_jobs is not None:
+            model.set_params(n_jobs=n_jobs)
+    got = ensemble.predict_proba(X_scaled)
+    if not np.array_equal(expected, got):
+        raise ValueError(f"Compiled model disagrees with sklearn "
+                         f"(max diff {np.abs(expected - got).max():.3g})")
+    return ensemble
@@ -0,0 +1,208 @@
+"""
+WALK-FORWARD SEARCH
+====================
+Out-of-sample evaluation of a grid of models over time-ordered folds.
+
+- Folds are expanding (train on everything before the test block) or
+  rolling (train on a fixed number of blocks before it)
+- Every (fold, config) pair is one job on a process pool
+- The feature matrix is written once to .npy and memory-mapped read-only
+  by each worker, instead of being pickled into every job
+- Configs are ranked by mean out-of-sample log-loss, then simulated PnL
+
+Usage:
+    python3 train_model.py 2 --search
+    python3 walk_forward.py 2 --folds 6 --mode rolling --workers 16
+"""
+
+import argparse
+import itertools
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.metrics import accuracy_score, log_loss
+from sklearn.preprocessing import StandardScaler
+
+MIN_CONFIDENCE = 0.60
+
+MODELS = {
+    'rf': RandomForestClassifier,
+    'gb': GradientBoostingClassifier,
+    'logreg': LogisticRegression,
+    'sgd': SGDClassifier,
+}
+
+# Fixed settings per model family; the grid varies the rest
+BASE_PARAMS = {
+    'rf': {'random_state': 42, 'n_jobs': 1},
+    'gb': {'random_state': 42},
+    'logreg': {'max_iter': 1000},
+    'sgd': {'loss': 'log_loss', 'random_state': 42},
+}
+
+
+def default_grid():
+    """Model/hyperparameter grid: list of (family, params)"""
+    grid = []
+    for n, depth, leaf in itertools.product([100, 200, 400], [4, 6, 10, None], [1, 5, 20]):
+        grid.append(('rf', {'n_estimators': n, 'max_depth': depth, 'min_samples_leaf': leaf}))
+    for n, lr, depth in itertools.product([100, 150, 300], [0.03, 0.1], [2, 3]):
+        grid.append(('gb', {'n_estimators': n, 'learning_rate': lr, 'max_depth': depth}))
+    for c in [0.01, 0.1, 1.0, 10.0]:
+        grid.append(('logreg', {'C': c}))
+    for alpha in [1e-4, 1e-3, 1e-2]:
+        grid.append(('sgd', {'alpha': alpha}))
+    return grid
+
+
+def config_name(family, params):
+    return family + '(' + ', '.join(f"{k}={v}" for k, v in params.items()) + ')'
+
+
+def make_folds(n, n_folds=5, mode='expanding', window=2):
+    """
+    (train_slice, test_slice) pairs over n time-ordered rows.
+
+    Rows are cut into n_folds + 1 blocks; fold i tests on block i + 1 and
+    trains on blocks 0..i (expanding) or the last `window` blocks (rolling).
+    """
+    edges = np.linspace(0, n, n_folds + 2).astype(int)
+    folds = []
+    for i in range(1, n_folds + 1):
+        start = 0 if mode == 'expanding' else edges[max(0, i - window)]
+        folds.append((slice(start, edges[i]), slice(edges[i], edges[i + 1])))
+    return folds
+
+
+def simulated_pnl(proba, y, min_confidence=MIN_CONFIDENCE):
+    """
+    Flat $1 bets with backtest.py's pricing model:
+    market_price = 0.50 + (confidence - 0.5) * 0.5
+    """
+    pred = proba.argmax(axis=1)
+    confidence = proba[np.arange(len(proba)), pred]
+    trade = confidence >= min_confidence
+    market_price = 0.50 + (confidence - 0.5) * 0.5
+    pnl = np.where(pred == y, 1.0 / market_price - 1.0, -1.0)
+    return float(pnl[trade].sum()), int(trade.sum())
+
+
+# ==========================================
+# WORKERS
+# ==========================================
+
+_shared = {}
+
+
+def _init_worker(x_path, y_path):
+    # Opened once per process, pages are shared through the OS cache
+    _shared['X'] = np.load(x_path, mmap_mode='r')
+    _shared['y'] = np.load(y_path, mmap_mode='r')
+
+
+def _run_job(job):
+    fold_id, (train, test), config_id, (family, params) = job
+    X, y = _shared['X'], _shared['y']
+
+    scaler = StandardScaler()
+    X_train = scaler.fit_transform(X[train])
+    X_test = scaler.transform(X[test])
+    y_train, y_test = np.asarray(y[train]), np.asarray(y[test])
+
+    model = MODELS[family](**BASE_PARAMS[family], **params)
+    started = time.perf_counter()
+    model.fit(X_train, y_train)
+    proba = model.predict_proba(X_test)
+    pnl, trades = simulated_pnl(proba, y_test)
+
+    return {
+        'config_id': config_id,
+        'fold': fold_id,
+        'log_loss': log_loss(y_test, proba, labels=[0, 1]),
+        'accuracy': accuracy_score(y_test, proba.argmax(axis=1)),
+        'pnl': pnl,
+        'trades': trades,
+        'fit_seconds': time.perf_counter() - started,
+    }
+
+
+# ==========================================
+# SEARCH
+# ==========================================
+
+def walk_forward_search(X, y, grid=None, n_folds=5, mode='expanding', window=2,
+                        workers=None, verbose=True):
+    """Evaluate every config on every fold in parallel; returns a ranked DataFrame"""
+    grid = grid or default_grid()
+    folds = make_folds(len(X), n_folds, mode, window)
+    jobs = [(f, fold, c, config) for f, fold in enumerate(folds) for c, config in enumerate(grid)]
+    workers = workers or os.cpu_count()
+
+    if verbose:
+        print(f"Walk-forward: {len(grid)} configs x {len(folds)} {mode} folds = "
+              f"{len(jobs)} jobs on {workers} processes")
+
+    started = time.time()
+    with tempfile.TemporaryDirectory() as tmp:
+        x_path, y_path = os.path.join(tmp, 'X.npy'), os.path.join(tmp, 'y.npy')
+        np.save(x_path, np.ascontiguousarray(X, dtype=np.float64))
+        np.save(y_path, np.ascontiguousarray(y, dtype=np.int64))
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(x_path, y_path)) as pool:
+            rows = []
+            for i, row in enumerate(pool.map(_run_job, jobs, chunksize=1), 1):
+                rows.append(row)
+                if verbose and (i % 50 == 0 or i == len(jobs)):
+                    print(f"  {i}/{len(jobs)} jobs | {time.time() - started:.0f}s")
+
+    per_fold = pd.DataFrame(rows)
+    results = per_fold.groupby('config_id').agg(
+        log_loss=('log_loss', 'mean'),
+        log_loss_std=('log_loss', 'std'),
+        accuracy=('accuracy', 'mean'),
+        pnl=('pnl', 'sum'),
+        trades=('trades', 'sum'),
+        fit_seconds=('fit_seconds', 'sum'),
+    )
+    results.insert(0, 'config', [config_name(*grid[i]) for i in results.index])
+    results['family'] = [grid[i][0] for i in results.index]
+    results['params'] = [grid[i][1] for i in results.index]
+    return results.sort_values(['log_loss', 'pnl'], ascending=[True, False])
+
+
+def build_model(family, params):
+    """Estimator for a search result row"""
+    return MODELS[family](**BASE_PARAMS[family], **params)
+
+
+if __name__ == "__main__":
+    from feature_cache import load_feature_tensor
+    from features import parse_entry_points
+
+    parser = argparse.ArgumentParser(description="Parallel walk-forward model search")
+    parser.add_argument('entry_point', nargs='?', default='2')
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--mode', choices=['expanding', 'rolling'], default='expanding')
+    parser.add_argument('--window', type=int, default=2, help="Training blocks for rolling folds")
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    X_all, y_all, _ = load_feature_tensor()
+    entry_point = parse_entry_points(args.entry_point)[0]
+    X, y = X_all[:, entry_point - 1], y_all[:, entry_point - 1]
+
+    results = walk_forward_search(X, y, n_folds=args.folds, mode=args.mode,
+                                  window=args.window, workers=args.workers)
+    print("\nTOP 10 (out-of-sample log-loss, then PnL)")
+    print(results.head(10)[['config', 'log_loss', 'accuracy', 'pnl', 'trades']].to_string(index=False))
+
+    os.makedirs('data', exist_ok=True)
+    results.drop(columns=['params']).to_csv('data/walk_forward.csv', index=False)
+    print("\n✅ Saved to data/walk_forward.csv")
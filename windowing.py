@@ -0,0 +1,98 @@
+"""
+WINDOWING
+==========
+Wall-clock aligned 5-minute windows keyed on candle timestamps.
+
+Polymarket markets run :00-:05, :05-:10, ... so windows are found by
+flooring each candle's timestamp to 5 minutes with integer arithmetic,
+not by counting rows. Missing or duplicated minutes only affect the
+window they fall in.
+"""
+
+import numpy as np
+import pandas as pd
+
+MINUTE_NS = 60 * 10**9
+WINDOW_MINUTES = 5
+WINDOW_NS = WINDOW_MINUTES * MINUTE_NS
+
+
+def timestamps_ns(df):
+    """Candle timestamps as int64 nanoseconds since epoch"""
+    ts = pd.to_datetime(df['timestamp'])
+    return ts.to_numpy(dtype='datetime64[ns]').view(np.int64)
+
+
+class WindowIndex:
+    """
+    Index of 5-minute buckets over a candle table, built in one pass.
+
+    grid[i, k] is the row of minute k of window i (-1 if missing).
+    complete[i] is True when all 5 minutes are present.
+    locate(ts) finds the window containing any timestamp in O(1).
+    """
+
+    def __init__(self, ts_ns):
+        ts_ns = np.asarray(ts_ns, dtype=np.int64)
+        minute = ts_ns // MINUTE_NS
+        bucket = minute // WINDOW_MINUTES
+        slot = minute - bucket * WINDOW_MINUTES
+
+        self.buckets, inverse = np.unique(bucket, return_inverse=True)
+
+        # Later rows win if a minute appears twice (overlapping pulls)
+        self.grid = np.full((len(self.buckets), WINDOW_MINUTES), -1, dtype=np.int64)
+        np.maximum.at(self.grid, (inverse, slot), np.arange(len(ts_ns)))
+        self.complete = (self.grid >= 0).all(axis=1)
+
+        # Dense bucket -> window position table for O(1) lookup
+        if len(self.buckets):
+            self.first_bucket = int(self.buckets[0])
+            span = int(self.buckets[-1]) - self.first_bucket + 1
+        else:
+            self.first_bucket = 0
+            span = 0
+        self.positions = np.full(span, -1, dtype=np.int64)
+        self.positions[self.buckets - self.first_bucket] = np.arange(len(self.buckets))
+
+    @classmethod
+    def from_frame(cls, df):
+        return cls(timestamps_ns(df))
+
+    def __len__(self):
+        return len(self.buckets)
+
+    @property
+    def starts(self):
+        """Window open times as datetime64[ns]"""
+        return (self.buckets * WINDOW_NS).astype('datetime64[ns]')
+
+    def locate(self, timestamp):
+        """Position of the window containing timestamp, or None if not indexed"""
+        ts = pd.Timestamp(timestamp)
+        if ts.tzinfo is not None:
+            ts = ts.tz_convert('UTC').tz_localize(None)
+        offset = ts.value // WINDOW_NS - self.first_bucket
+        if offset < 0 or offset >= len(self.positions):
+            return None
+        pos = self.positions[offset]
+        return int(pos) if pos >= 0 else None
+
+    def window_arrays(self, df, columns=('open', 'high', 'low', 'close', 'volume'),
+                      complete_only=True):
+        """
+        Gather candle columns into (n_windows, 5) arrays.
+
+        With complete_only=False, missing minutes are NaN and the caller
+        should check self.complete.
+        """
+        grid = self.grid[self.complete] if complete_only else self.grid
+        missing = grid < 0
+
+        arrays = {}
+        for col in columns:
+            values = df[col].to_numpy(dtype=np.float64)
+            gathered = values[np.where(missing, 0, grid)]
+            gathered[missing] = np.nan
+            arrays[col] = gathered
+        return arrays